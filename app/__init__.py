@@ -1,14 +1,29 @@
 from flask import Flask
+from jinja2 import FileSystemBytecodeCache
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
-from flask_migrate import Migrate
 import os
 
 from config import settings   # 👈 importa tu Settings
+from app.utils.cache import PageCache
+from app.utils.compression import Compress
+from app.utils.events import EventBroker
+from app.utils.passwords import PasswordHasher, PasswordHasherBusy
+from app.utils.ratelimit import RateLimiter
+from app.utils.sqlstats import SQLStats
+from app.utils.metrics import Metrics
+from app.utils.profiler import RequestProfiler
 
 db = SQLAlchemy()
 login_manager = LoginManager()
-migrate = Migrate()
+page_cache = PageCache()
+compress = Compress()
+events = EventBroker()
+password_hasher = PasswordHasher()
+rate_limiter = RateLimiter()
+sql_stats = SQLStats()
+metrics = Metrics()
+profiler = RequestProfiler()
 
 def create_app():
     app = Flask(__name__)
@@ -21,18 +36,155 @@ def create_app():
     app.config['UPLOAD_FOLDER'] = os.path.join(app.root_path, 'static', 'uploads')
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
+    # Procesos web que atienden peticiones (gunicorn.conf.py lo ajusta al arrancar)
+    app.config['WEB_WORKERS'] = settings.WEB_WORKERS or 1
+
+    # Caché de páginas públicas
+    app.config['PAGE_CACHE_ENABLED'] = settings.PAGE_CACHE_ENABLED
+    app.config['PAGE_CACHE_BACKEND'] = settings.PAGE_CACHE_BACKEND
+    app.config['PAGE_CACHE_PATH'] = settings.PAGE_CACHE_PATH or os.path.join(app.instance_path, 'page_cache.sqlite3')
+    app.config['PAGE_CACHE_TTL'] = settings.PAGE_CACHE_TTL
+    app.config['PAGE_CACHE_MAX_ENTRIES'] = settings.PAGE_CACHE_MAX_ENTRIES
+    app.config['PAGE_CACHE_MAX_VALUES'] = settings.PAGE_CACHE_MAX_VALUES
+    app.config['PAGE_CACHE_STALE_TTL'] = settings.PAGE_CACHE_STALE_TTL
+    app.config['PAGE_CACHE_SHARED_MAX_ENTRIES'] = settings.PAGE_CACHE_SHARED_MAX_ENTRIES
+
+    # Plantillas compiladas en disco: los workers nuevos no recompilan todo
+    if settings.TEMPLATE_BYTECODE_CACHE:
+        app.config['TEMPLATE_CACHE_DIR'] = settings.TEMPLATE_CACHE_DIR or os.path.join(app.instance_path, 'jinja_cache')
+        os.makedirs(app.config['TEMPLATE_CACHE_DIR'], exist_ok=True)
+        app.jinja_options = {
+            **app.jinja_options,
+            'bytecode_cache': FileSystemBytecodeCache(app.config['TEMPLATE_CACHE_DIR']),
+        }
+
+    # Compresión de respuestas
+    app.config['COMPRESS_ENABLED'] = settings.COMPRESS_ENABLED
+    app.config['COMPRESS_MIN_SIZE'] = settings.COMPRESS_MIN_SIZE
+    app.config['COMPRESS_LEVEL'] = settings.COMPRESS_LEVEL
+    app.config['COMPRESS_MIMETYPES'] = settings.COMPRESS_MIMETYPES
+
+    # Eventos en vivo (SSE) para recepción
+    app.config['EVENTS_BACKEND'] = settings.EVENTS_BACKEND
+    app.config['EVENTS_PATH'] = settings.EVENTS_PATH or os.path.join(app.instance_path, 'events.sqlite3')
+    app.config['EVENTS_POLL_INTERVAL'] = settings.EVENTS_POLL_INTERVAL
+    app.config['EVENTS_MAX_QUEUE'] = settings.EVENTS_MAX_QUEUE
+    app.config['EVENTS_HEARTBEAT'] = settings.EVENTS_HEARTBEAT
+    app.config['EVENTS_STREAM_TIMEOUT'] = settings.EVENTS_STREAM_TIMEOUT
+
+    # Hash de contraseñas
+    app.config['PASSWORD_HASH_METHOD'] = settings.PASSWORD_HASH_METHOD
+    app.config['PASSWORD_HASH_WORKERS'] = settings.PASSWORD_HASH_WORKERS
+    app.config['PASSWORD_HASH_QUEUE'] = settings.PASSWORD_HASH_QUEUE
+    app.config['PASSWORD_HASH_TIMEOUT'] = settings.PASSWORD_HASH_TIMEOUT
+
+    # Límite de peticiones
+    app.config['RATE_LIMIT_ENABLED'] = settings.RATE_LIMIT_ENABLED
+    app.config['RATE_LIMIT_BACKEND'] = settings.RATE_LIMIT_BACKEND
+    app.config['RATE_LIMIT_PATH'] = settings.RATE_LIMIT_PATH or os.path.join(app.instance_path, 'ratelimit.sqlite3')
+    app.config['RATE_LIMIT_METHODS'] = settings.RATE_LIMIT_METHODS
+    app.config['TRUSTED_PROXY_HOPS'] = settings.TRUSTED_PROXY_HOPS
+    app.config['RATE_LIMITS'] = settings.RATE_LIMITS
+
+    # Instrumentación SQL
+    app.config['SQL_STATS_ENABLED'] = settings.SQL_STATS_ENABLED
+    app.config['SQL_STATS_HEADERS'] = settings.SQL_STATS_HEADERS
+    app.config['SQL_STATS_QUERY_THRESHOLD'] = settings.SQL_STATS_QUERY_THRESHOLD
+    app.config['SQL_NPLUSONE_THRESHOLD'] = settings.SQL_NPLUSONE_THRESHOLD
+    app.config['SQL_STATS_LOG_ALL'] = settings.SQL_STATS_LOG_ALL
+    app.config['SLOW_QUERY_ENABLED'] = settings.SLOW_QUERY_ENABLED
+    app.config['SLOW_QUERY_THRESHOLD_MS'] = settings.SLOW_QUERY_THRESHOLD_MS
+    app.config['SLOW_QUERY_EXPLAIN'] = settings.SLOW_QUERY_EXPLAIN
+    app.config['SLOW_QUERY_PATH'] = settings.SLOW_QUERY_PATH or os.path.join(app.instance_path, 'slow_queries.sqlite3')
+    app.config['SLOW_QUERY_MAX_ROWS'] = settings.SLOW_QUERY_MAX_ROWS
+
+    # Métricas Prometheus
+    app.config['METRICS_ENABLED'] = settings.METRICS_ENABLED
+    app.config['METRICS_TOKEN'] = settings.METRICS_TOKEN
+    app.config['METRICS_PUBLIC'] = settings.METRICS_PUBLIC
+    app.config['METRICS_BUSINESS_TTL'] = settings.METRICS_BUSINESS_TTL
+
+    # Perfilado de peticiones
+    app.config['PROFILER_ENABLED'] = settings.PROFILER_ENABLED
+    app.config['PROFILER_MODE'] = settings.PROFILER_MODE
+    app.config['PROFILER_SAMPLE_RATE'] = settings.PROFILER_SAMPLE_RATE
+    app.config['PROFILER_ENDPOINTS'] = settings.PROFILER_ENDPOINTS
+    app.config['PROFILER_INTERVAL_MS'] = settings.PROFILER_INTERVAL_MS
+    app.config['PROFILER_DIR'] = settings.PROFILER_DIR or os.path.join(app.instance_path, 'profiles')
+    app.config['PROFILER_MAX_FILES'] = settings.PROFILER_MAX_FILES
+
+    # Tarifas dinámicas
+    app.config['PRICING_ENABLED'] = settings.PRICING_ENABLED
+    app.config['PRICING_WEEKDAY_FACTORS'] = settings.PRICING_WEEKDAY_FACTORS
+    app.config['PRICING_SEASONS'] = settings.PRICING_SEASONS
+    app.config['PRICING_LOS_DISCOUNTS'] = settings.PRICING_LOS_DISCOUNTS
+    app.config['PRICING_DEMAND_FACTORS'] = settings.PRICING_DEMAND_FACTORS
+
+    # Pronóstico de ocupación
+    app.config['FORECAST_HORIZON'] = settings.FORECAST_HORIZON
+    app.config['FORECAST_ALPHA'] = settings.FORECAST_ALPHA
+    app.config['FORECAST_HISTORY_DAYS'] = settings.FORECAST_HISTORY_DAYS
+
+    # Auditoría nocturna
+    app.config['NIGHT_AUDIT_PENDING_DAYS'] = settings.NIGHT_AUDIT_PENDING_DAYS
+
+    # Lista de espera
+    app.config['WAITLIST_HOLD_HOURS'] = settings.WAITLIST_HOLD_HOURS
+    app.config['WAITLIST_MAX_ENTRIES'] = settings.WAITLIST_MAX_ENTRIES
+
     # Inicializar extensiones
     db.init_app(app)
-    migrate.init_app(app, db)
+    # Flask-Migrate arrastra alembic y mako (~90 ms al importar) y solo lo usa
+    # `flask db`: no se carga en los workers ni en los scripts que no migran
+    if os.environ.get('FLASK_RUN_FROM_CLI'):
+        from flask_migrate import Migrate
+        Migrate(app, db)
     login_manager.init_app(app)
     login_manager.login_view = 'auth.login'
     login_manager.login_message = 'Por favor inicia sesión para acceder a esta página.'
     login_manager.login_message_category = 'info'
+    if app.config['TRUSTED_PROXY_HOPS']:
+        # remote_addr pasa a ser la IP que vio el proxy, no la que escribió el
+        # cliente al principio de X-Forwarded-For (el límite de peticiones la usa)
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXY_HOPS'])
+    page_cache.init_app(app)
+    compress.init_app(app)
+    events.init_app(app)
+    password_hasher.init_app(app)
+    rate_limiter.init_app(app)
+    sql_stats.init_app(app)
+    metrics.init_app(app)
+    profiler.init_app(app)
+
+    @app.errorhandler(PasswordHasherBusy)
+    def password_hasher_busy(error):
+        return 'Servicio ocupado, intenta de nuevo en unos segundos.', 503, {'Retry-After': '5'}
 
     # Importar modelos para que Alembic los detecte
     from app.models.user import User
     from app.models.room import Room
     from app.models.reservation import Reservation
+    from app.models.forecast import OccupancyForecast, PickupCurve
+    from app.models.night_audit import NightAudit
+    from app.models.housekeeping import HousekeepingTask
+    from app.models.group import ReservationGroup
+    from app.models.waitlist import WaitlistEntry
+
+    # Cualquier cambio en habitaciones invalida las páginas del catálogo;
+    # las reservas y el usuario se versionan por huésped (ETag de sus páginas)
+    page_cache.watch(Room, 'catalog')
+    page_cache.watch(Reservation, 'reservations', key=lambda r: r.guest_id)
+    page_cache.watch(User, 'user', key=lambda u: u.id)
+    page_cache.watch(Reservation, 'availability')
+
+    # Cambios de habitaciones y reservas -> pantallas de recepción abiertas
+    from app.services.frontdesk import track_frontdesk_events
+    track_frontdesk_events(events)
+
+    # Reglas de tarifas (el calendario se calcula en la primera cotización)
+    from app.services.pricing import init_pricing
+    init_pricing(app)
     
     @login_manager.user_loader
     def load_user(user_id):
@@ -44,11 +196,21 @@ def create_app():
     from app.routes.admin import admin_bp
     from app.routes.receptionist import receptionist_bp
     from app.routes.guest import guest_bp
+    from app.routes.api import api_bp
+    from app.routes.housekeeping import housekeeping_bp
+    from app.routes.groups import groups_bp
     
     app.register_blueprint(auth_bp, url_prefix="/auth")
     app.register_blueprint(main_bp, url_prefix="/")
     app.register_blueprint(admin_bp, url_prefix="/admin")
     app.register_blueprint(receptionist_bp, url_prefix="/receptionist")
     app.register_blueprint(guest_bp, url_prefix="/guest")
+    app.register_blueprint(api_bp, url_prefix="/api")
+    app.register_blueprint(housekeeping_bp, url_prefix="/housekeeping")
+    app.register_blueprint(groups_bp, url_prefix="/receptionist/groups")
+
+    # Comandos de consola (flask <comando>)
+    from app.cli import register_commands
+    register_commands(app)
     
     return app
@@ -0,0 +1,169 @@
+"""
+Comandos de consola de la aplicación (`flask <comando>`).
+"""
+
+import os
+import statistics
+import time
+
+import click
+
+
+def _require_shared_backends(app):
+    """
+    Los comandos que cambian reservas invalidan la caché de páginas y
+    avisan a recepción desde su propio proceso. Con backends "memory" eso queda
+    en el proceso del comando y los workers web siguen mostrando lo anterior.
+    """
+    memory = [name for name in ('PAGE_CACHE_BACKEND', 'EVENTS_BACKEND') if app.config.get(name) == 'memory']
+    if memory:
+        raise click.ClickException(
+            f"{', '.join(memory)}=memory: los workers web no verían los cambios de este comando. "
+            "Usar los backends sqlite (los de por defecto); la simulación (--dry-run) sí se puede correr."
+        )
+
+
+def register_commands(app):
+
+    @app.cli.command("precompile-templates")
+    def precompile_templates():
+        """Compila todas las plantillas y llena la caché de bytecode de Jinja."""
+        env = app.jinja_env
+        if env.bytecode_cache is None:
+            click.echo("⚠️ La caché de bytecode está desactivada (TEMPLATE_BYTECODE_CACHE=false)")
+            return
+
+        start = time.perf_counter()
+        names = [name for name in env.list_templates() if name.endswith('.html')]
+        for name in names:
+            env.get_template(name)
+        elapsed = (time.perf_counter() - start) * 1000
+        click.echo(f"✅ {len(names)} plantillas compiladas en {elapsed:.0f} ms → {app.config['TEMPLATE_CACHE_DIR']}")
+
+    @app.cli.command("startup-profile")
+    @click.option("--top", default=15, show_default=True, help="Filas por tabla")
+    @click.option("--repeat", default=3, show_default=True, help="Arranques medidos (se reporta la mediana)")
+    def startup_profile(top, repeat):
+        """Mide el arranque en frío de create_app() y desglosa el tiempo de importación."""
+        from app.utils.startup import LAZY_MODULES, by_package, measure_cold_start
+
+        root = os.path.dirname(app.root_path)
+        timings = [measure_cold_start(root)['ms'] for _ in range(repeat)]
+        profile = measure_cold_start(root, importtime=True)
+
+        click.echo(f"⏱️ Arranque en frío: mediana {statistics.median(timings):.0f} ms "
+                   f"({', '.join(f'{t:.0f}' for t in timings)})")
+
+        click.echo(f"\nPaquetes por tiempo propio de importación (top {top}):")
+        for package, self_us in by_package(profile['imports'])[:top]:
+            click.echo(f"  {self_us / 1000:8.1f} ms  {package}")
+
+        click.echo(f"\nMódulos de primer nivel por tiempo acumulado (top {top}):")
+        roots = sorted((row for row in profile['imports'] if row[3] == 0), key=lambda row: row[2], reverse=True)
+        for name, _, cumulative_us, _ in roots[:top]:
+            click.echo(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+        if profile['loaded']:
+            click.echo(f"\n⚠️ Se cargan al arrancar y deberían ser perezosas: {', '.join(profile['loaded'])}")
+        else:
+            click.echo(f"\n✅ {', '.join(LAZY_MODULES)} no se cargan al arrancar")
+
+    @app.cli.command("forecast")
+    @click.option("--today", type=click.DateTime(formats=["%Y-%m-%d"]), help="Fecha de referencia (por defecto hoy)")
+    @click.option("--rebuild", is_flag=True, help="Descarta las curvas guardadas y recorre toda la historia")
+    def forecast(today, rebuild):
+        """Actualiza las curvas de reserva y el pronóstico de ocupación (correr cada noche)."""
+        from app import db
+        from app.models.forecast import PickupCurve
+        from app.services.forecast import update_forecast
+
+        start = time.perf_counter()
+        if rebuild:
+            db.session.query(PickupCurve).delete()
+        update_forecast(today.date() if today else None, echo=click.echo)
+        click.echo(f"✅ Pronóstico actualizado en {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    @app.cli.command("night-audit")
+    @click.option("--date", "day", type=click.DateTime(formats=["%Y-%m-%d"]),
+                  help="Día hotelero a cerrar (por defecto los días abiertos hasta ayer)")
+    @click.option("--force", is_flag=True, help="Repite el cierre de un día ya cerrado")
+    @click.option("--dry-run", is_flag=True, help="Muestra el resumen sin guardar cambios")
+    @click.option("--skip-forecast", is_flag=True, help="No actualiza el pronóstico después del cierre")
+    def night_audit(day, force, dry_run, skip_forecast):
+        """Cierra el día hotelero: no presentados, check-outs vencidos y pendientes expiradas."""
+        from datetime import date, timedelta
+        from app.services.forecast import update_forecast
+        from app.services.night_audit import business_date, run
+
+        if not dry_run:
+            _require_shared_backends(app)
+        if day:
+            days = [day.date()]
+        else:
+            # Si alguna noche no corrió, se cierran en orden los días que quedaron abiertos
+            first = business_date()
+            if first >= date.today():
+                raise click.ClickException(f"No hay días pendientes de cierre (día abierto: {first.isoformat()})")
+            days = [first + timedelta(days=offset) for offset in range((date.today() - first).days)]
+            if dry_run:
+                days = days[:1]
+
+        for business_day in days:
+            try:
+                report = run(business_day, force=force, dry_run=dry_run)
+            except ValueError as exc:
+                raise click.ClickException(str(exc))
+            click.echo(f"Día hotelero {report['business_date']}{' (simulación, sin guardar)' if dry_run else ''}")
+            click.echo(f"  Check-outs automáticos:  {report['completed']}")
+            click.echo(f"  No presentados:          {report['no_shows']}")
+            click.echo(f"  Pendientes expiradas:    {report['expired']}")
+            click.echo(f"  Habitaciones a limpieza: {report['rooms_released']} "
+                       f"({report['housekeeping_tasks']} tareas nuevas)")
+            click.echo(f"  Ocupación de la noche:   {report['occupancy'] * 100:.1f}% ({report['room_nights']} noches, "
+                       f"ingreso {report['revenue']:,.0f}, ADR {report['adr']:,.0f})")
+            click.echo(f"  Alojados: {report['in_house']} · llegadas mañana: {report['arrivals_tomorrow']} "
+                       f"· salidas mañana: {report['departures_tomorrow']}")
+            if not dry_run:
+                click.echo(f"✅ Día {report['business_date']} cerrado en {report['duration_ms']} ms")
+
+        if not (dry_run or skip_forecast):
+            update_forecast(echo=click.echo)
+
+    @app.cli.command("import-reservations")
+    @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+    @click.option("--dry-run", is_flag=True, help="Valida y reporta sin guardar")
+    @click.option("--report", "report_path", type=click.Path(dir_okay=False),
+                  help="Escribe el informe por fila (CSV) en esta ruta")
+    def import_reservations(path, dry_run, report_path):
+        """Importa reservas de canales o grupos desde un CSV, XLSX o JSON."""
+        from app.services.reservation_import import ReservationImportError, import_reservations, read_rows, report_csv
+
+        if not dry_run:
+            _require_shared_backends(app)
+        try:
+            with open(path, 'rb') as stream:
+                rows = read_rows(path, stream)
+        except ReservationImportError as exc:
+            raise click.ClickException(str(exc))
+        result = import_reservations(rows, dry_run=dry_run)
+
+        click.echo(f"{len(rows)} filas{' (simulación, sin guardar)' if dry_run else ''}")
+        click.echo(f"  Importadas:       {result['imported']} ({result['new_guests']} huéspedes nuevos)")
+        click.echo(f"  Conflictos:       {result['conflicts']}")
+        click.echo(f"  Duplicadas:       {result['duplicates']}")
+        click.echo(f"  Con errores:      {result['errors']}")
+        if report_path:
+            with open(report_path, 'w', encoding='utf-8-sig', newline='') as output:
+                output.write(report_csv(result))
+            click.echo(f"  Informe por fila: {report_path}")
+        if not dry_run:
+            click.echo(f"✅ Importación terminada en {result['duration_ms']} ms")
+
+    @app.cli.command("waitlist-expire")
+    def waitlist_expire():
+        """Vence las ofertas de la lista de espera sin respuesta y ofrece esas habitaciones al siguiente."""
+        from app.services.waitlist import expire_offers
+
+        _require_shared_backends(app)
+        expired = expire_offers()
+        click.echo(f"✅ {expired} ofertas vencidas" if expired else "Sin ofertas vencidas")
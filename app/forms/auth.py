@@ -42,7 +42,7 @@ class RegisterForm(FlaskForm):
 
 
 from flask_wtf import FlaskForm
-from wtforms import StringField, PasswordField, SubmitField, HiddenField
+from wtforms import StringField, PasswordField, SubmitField, HiddenField, SelectField
 from wtforms.validators import DataRequired, Email, EqualTo, Length, ValidationError
 from app.models.user import User
 
@@ -53,8 +53,8 @@ class CreateStaffForm(FlaskForm):
     last_name = StringField('Apellido', validators=[DataRequired(), Length(max=50)])
     phone = StringField('Teléfono', validators=[Length(max=20)])
     
-    # Rol fijo como recepcionista, no editable
-    role = HiddenField(default='recepcionista')
+    role = SelectField('Rol', choices=[('recepcionista', 'Recepcionista'), ('limpieza', 'Limpieza')],
+                       default='recepcionista')
     
     password = PasswordField('Contraseña', validators=[DataRequired(), Length(min=6)])
     password2 = PasswordField('Confirmar Contraseña',
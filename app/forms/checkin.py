@@ -1,8 +1,12 @@
 from flask_wtf import FlaskForm
 from wtforms import StringField, SubmitField, DateField
 from wtforms.validators import DataRequired, Email
+from app.forms.reservation import validate_horizon
 
 class CheckinForm(FlaskForm):
     guest_email = StringField("Correo del huésped", validators=[DataRequired(), Email()])
     check_out_date = DateField("Fecha de salida", validators=[DataRequired()])
     submit = SubmitField("Buscar Huésped")
+
+    def validate_check_out_date(self, check_out_date):
+        validate_horizon(check_out_date.data)
@@ -1,8 +1,19 @@
 from flask_wtf import FlaskForm
-from wtforms import StringField, SelectField, DateField, IntegerField, TextAreaField, SubmitField, FloatField, HiddenField, RadioField
-from wtforms.validators import DataRequired, NumberRange, ValidationError
+from flask_wtf.file import FileAllowed, FileRequired
+from wtforms import StringField, SelectField, DateField, IntegerField, TextAreaField, SubmitField, FloatField, HiddenField, RadioField, FileField, BooleanField, SelectMultipleField
+from wtforms.validators import DataRequired, Length, NumberRange, ValidationError
+from wtforms.widgets import CheckboxInput, ListWidget
 from datetime import date, datetime
 from app.models.room import Room
+from app.services.pricing import booking_horizon
+
+
+def validate_horizon(check_out):
+    """Las fechas más allá del calendario de tarifas no se aceptan."""
+    horizon = booking_horizon()
+    if check_out > horizon:
+        raise ValidationError(f'Solo se aceptan reservas con salida hasta el {horizon.strftime("%d/%m/%Y")}.')
+
 
 class ReservationForm(FlaskForm):
     guest_id = SelectField("Huésped", coerce=int, validators=[DataRequired()])
@@ -25,6 +36,7 @@ class ReservationForm(FlaskForm):
         if hasattr(self, 'check_in_date') and self.check_in_date.data:
             if check_out_date.data <= self.check_in_date.data:
                 raise ValidationError('La fecha de check-out debe ser posterior a la de check-in.')
+        validate_horizon(check_out_date.data)
 
 class PublicReservationForm(FlaskForm):
     check_in_date = DateField("Fecha de llegada", validators=[DataRequired()])
@@ -40,8 +52,55 @@ class PublicReservationForm(FlaskForm):
         if hasattr(self, 'check_in_date') and self.check_in_date.data:
             if check_out_date.data <= self.check_in_date.data:
                 raise ValidationError('La fecha de salida debe ser posterior a la de llegada.')
+        validate_horizon(check_out_date.data)
 
 class ReservationStatusForm(FlaskForm):
     reservation_id = HiddenField()
     action = HiddenField()
     submit = SubmitField('Confirmar')
+
+class ReservationImportForm(FlaskForm):
+    file = FileField('Archivo CSV, Excel o JSON', validators=[
+        FileRequired('Seleccione un archivo.'),
+        FileAllowed(['csv', 'xlsx', 'xlsm', 'json'], 'Use un archivo .csv, .xlsx o .json')
+    ])
+    dry_run = BooleanField('Solo validar (no guardar)', default=True)
+    download_report = BooleanField('Descargar el informe por fila (CSV)')
+    submit = SubmitField('Importar')
+
+class GroupReservationForm(FlaskForm):
+    name = StringField("Nombre del grupo", validators=[DataRequired(), Length(max=120)])
+    organizer_id = SelectField("Huésped de contacto", coerce=int, validators=[DataRequired()])
+    check_in_date = DateField("Check-in", validators=[DataRequired()])
+    check_out_date = DateField("Check-out", validators=[DataRequired()])
+    guests_per_room = IntegerField("Huéspedes por habitación", default=2, validators=[DataRequired(), NumberRange(min=1, max=10)])
+    room_ids = SelectMultipleField("Habitaciones", coerce=int, widget=ListWidget(prefix_label=False), option_widget=CheckboxInput(),
+                                   validators=[DataRequired(message="Seleccione al menos una habitación")])
+    confirm = BooleanField("Confirmar de inmediato")
+    special_requests = TextAreaField("Notas del grupo")
+    submit = SubmitField("Reservar grupo")
+
+    def validate_check_in_date(self, check_in_date):
+        if check_in_date.data < date.today():
+            raise ValidationError('La fecha de check-in no puede ser anterior a hoy.')
+
+    def validate_check_out_date(self, check_out_date):
+        if self.check_in_date.data and check_out_date.data <= self.check_in_date.data:
+            raise ValidationError('La fecha de check-out debe ser posterior a la de check-in.')
+        validate_horizon(check_out_date.data)
+
+class WaitlistForm(FlaskForm):
+    room_type = SelectField("Tipo de habitación", choices=list(Room.TYPE_LABELS.items()), validators=[DataRequired()])
+    check_in_date = DateField("Fecha de llegada", validators=[DataRequired()])
+    check_out_date = DateField("Fecha de salida", validators=[DataRequired()])
+    guests_count = IntegerField("Número de huéspedes", default=1, validators=[DataRequired(), NumberRange(min=1, max=10)])
+    submit = SubmitField("Anotarme en la lista de espera")
+
+    def validate_check_in_date(self, check_in_date):
+        if check_in_date.data < date.today():
+            raise ValidationError('La fecha de llegada no puede ser anterior a hoy.')
+
+    def validate_check_out_date(self, check_out_date):
+        if self.check_in_date.data and check_out_date.data <= self.check_in_date.data:
+            raise ValidationError('La fecha de salida debe ser posterior a la de llegada.')
+        validate_horizon(check_out_date.data)
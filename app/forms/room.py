@@ -1,5 +1,6 @@
 from flask_wtf import FlaskForm
-from wtforms import StringField, IntegerField, FloatField, TextAreaField, SelectField, FileField, SubmitField
+from flask_wtf.file import FileAllowed, FileRequired
+from wtforms import StringField, IntegerField, FloatField, TextAreaField, SelectField, FileField, SubmitField, BooleanField
 from wtforms.validators import DataRequired, Length, NumberRange, ValidationError
 from app.models.room import Room
 
@@ -25,4 +26,14 @@ class RoomForm(FlaskForm):
                 raise ValidationError('Este número de habitación ya existe.')
         else:
             if Room.query.filter_by(number=number.data).first():
-                raise ValidationError('Este número de habitación ya existe.')
\ No newline at end of file
+                raise ValidationError('Este número de habitación ya existe.')
+
+
+class RoomImportForm(FlaskForm):
+    file = FileField('Archivo CSV o Excel', validators=[
+        FileRequired('Seleccione un archivo.'),
+        FileAllowed(['csv', 'xlsx', 'xlsm'], 'Use un archivo .csv o .xlsx')
+    ])
+    update_existing = BooleanField('Actualizar las habitaciones que ya existen')
+    dry_run = BooleanField('Solo validar (no guardar)', default=True)
+    submit = SubmitField('Importar')
@@ -0,0 +1,26 @@
+from app import db
+from datetime import datetime
+
+class OccupancyForecast(db.Model):
+    """Ocupación esperada por día (ver app/services/forecast.py)."""
+    stay_date = db.Column(db.Date, primary_key=True)
+    rooms = db.Column(db.Integer, nullable=False)
+    on_the_books = db.Column(db.Integer, nullable=False)          # noches reservadas al calcular
+    expected_room_nights = db.Column(db.Float, nullable=False)
+    expected_occupancy = db.Column(db.Float, nullable=False)      # 0..1
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<OccupancyForecast {self.stay_date} {self.expected_occupancy:.2f}>'
+
+
+class PickupCurve(db.Model):
+    """Curva de reservas por día de la semana y antelación (suavizado exponencial)."""
+    weekday = db.Column(db.Integer, primary_key=True)     # 0 = lunes
+    lead_days = db.Column(db.Integer, primary_key=True)
+    pickup = db.Column(db.Float, nullable=False)          # fracción del inventario que aún se reserva
+    cancellation = db.Column(db.Float, nullable=False)    # fracción de lo ya reservado que se cancela
+    updated_through = db.Column(db.Date, nullable=False)  # última fecha de estadía incorporada
+
+    def __repr__(self):
+        return f'<PickupCurve {self.weekday}:{self.lead_days}>'
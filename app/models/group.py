@@ -0,0 +1,54 @@
+from app import db
+from datetime import datetime
+from app.models.reservation import Reservation
+
+class ReservationGroup(db.Model):
+    """Varias habitaciones reservadas juntas (familia, evento); ver app/services/groups.py."""
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(120), nullable=False)
+    organizer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)   # huésped de contacto
+    check_in_date = db.Column(db.Date, nullable=False)
+    check_out_date = db.Column(db.Date, nullable=False)
+    notes = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_by_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='SET NULL'))
+
+    organizer = db.relationship('User', foreign_keys=[organizer_id])
+    created_by = db.relationship('User', foreign_keys=[created_by_id])
+    reservations = db.relationship('Reservation', backref='group', lazy=True, order_by='Reservation.room_id')
+
+    def active_reservations(self):
+        """Reservas que siguen ocupando habitación (sin canceladas, no-shows ni vencidas)."""
+        return [r for r in self.reservations if r.status not in Reservation.RELEASED_STATUSES]
+
+    def total_price(self):
+        return sum(r.total_price for r in self.active_reservations())
+
+    def get_nights_count(self):
+        return (self.check_out_date - self.check_in_date).days
+
+    def get_status(self):
+        """Estado del grupo según sus reservas."""
+        active = self.active_reservations()
+        if not active:
+            return 'cancelada'
+        if all(r.checked_out_at for r in active):
+            return 'completada'
+        if any(r.checked_in_at for r in active):
+            return 'en curso'
+        if all(r.status in ('confirmada', 'confirmed') for r in active):
+            return 'confirmada'
+        return 'pendiente'
+
+    def get_status_display(self):
+        statuses = {
+            'pendiente': 'Pendiente',
+            'confirmada': 'Confirmada',
+            'en curso': 'En curso',
+            'completada': 'Completada',
+            'cancelada': 'Cancelada'
+        }
+        return statuses[self.get_status()]
+
+    def __repr__(self):
+        return f'<ReservationGroup {self.id} {self.name}>'
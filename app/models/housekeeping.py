@@ -0,0 +1,40 @@
+from app import db
+from datetime import datetime
+
+class HousekeepingTask(db.Model):
+    """Limpieza de una habitación, creada con cada check-out (ver app/services/housekeeping.py)."""
+    PENDING = 'pendiente'
+    IN_PROGRESS = 'en proceso'
+    DONE = 'completada'
+    CANCELLED = 'cancelada'      # la habitación salió de limpieza sin que se terminara la tarea
+    OPEN_STATUSES = (PENDING, IN_PROGRESS)
+
+    __table_args__ = (
+        db.Index('ix_housekeeping_task_status_created', 'status', 'created_at'),
+        db.Index('ix_housekeeping_task_room_status', 'room_id', 'status'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    room_id = db.Column(db.Integer, db.ForeignKey('room.id'), nullable=False)
+    reservation_id = db.Column(db.Integer, db.ForeignKey('reservation.id'))   # check-out que la originó
+    status = db.Column(db.String(20), nullable=False, default=PENDING)        # pendiente, en proceso, completada, cancelada
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    claimed_by_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='SET NULL'))
+    claimed_at = db.Column(db.DateTime)
+    completed_at = db.Column(db.DateTime)
+
+    room = db.relationship('Room', backref=db.backref('housekeeping_tasks', lazy=True, cascade='all, delete-orphan'))
+    reservation = db.relationship('Reservation')
+    claimed_by = db.relationship('User')
+
+    def get_status_display(self):
+        statuses = {
+            'pendiente': 'Pendiente',
+            'en proceso': 'En proceso',
+            'completada': 'Completada',
+            'cancelada': 'Cancelada'
+        }
+        return statuses.get(self.status, self.status.title())
+
+    def __repr__(self):
+        return f'<HousekeepingTask {self.id} room={self.room_id} {self.status}>'
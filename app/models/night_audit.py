@@ -0,0 +1,16 @@
+from app import db
+from datetime import datetime
+
+class NightAudit(db.Model):
+    """Cierre de un día hotelero (flask night-audit). El día abierto es el último cerrado + 1."""
+    business_date = db.Column(db.Date, primary_key=True)   # día que se cerró
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    duration_ms = db.Column(db.Integer)
+    no_shows = db.Column(db.Integer, default=0)
+    completed = db.Column(db.Integer, default=0)
+    expired = db.Column(db.Integer, default=0)
+    rooms_released = db.Column(db.Integer, default=0)
+    report = db.Column(db.Text)                             # resumen en JSON
+
+    def __repr__(self):
+        return f'<NightAudit {self.business_date}>'
@@ -1,7 +1,23 @@
 from app import db
 from datetime import datetime
+from sqlalchemy import event
 
 class Reservation(db.Model):
+    # Estados que ocupan la habitación en sus fechas (incluye los valores en inglés
+    # que todavía escribe el panel de administración)
+    ACTIVE_STATUSES = ('pendiente', 'pending', 'confirmada', 'confirmed', 'en curso')
+    CANCELLED_STATUSES = ('cancelada', 'cancelled')
+    # Cerradas por la auditoría nocturna sin que el huésped llegara
+    NO_SHOW_STATUS = 'no presentada'
+    EXPIRED_STATUS = 'expirada'
+    # Estados que no generan noches vendidas
+    RELEASED_STATUSES = CANCELLED_STATUSES + (NO_SHOW_STATUS, EXPIRED_STATUS)
+
+    __table_args__ = (
+        db.Index('ix_reservation_room_dates', 'room_id', 'check_in_date', 'check_out_date'),
+        db.Index('ix_reservation_status_check_in', 'status', 'check_in_date'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     guest_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     room_id = db.Column(db.Integer, db.ForeignKey('room.id'), nullable=False)
@@ -15,10 +31,12 @@ class Reservation(db.Model):
     confirmed_at = db.Column(db.DateTime)
     checked_in_at = db.Column(db.DateTime)
     checked_out_at = db.Column(db.DateTime)
-    confirmed_by_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    cancelled_at = db.Column(db.DateTime)        # cuándo pasó a cancelada, no presentada o expirada
+    confirmed_by_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='SET NULL'))
     
     payment_type = db.Column(db.String(50))      # NUEVO
     payment_detail = db.Column(db.String(200)) 
+    group_id = db.Column(db.Integer, db.ForeignKey('reservation_group.id'), index=True)   # reserva de grupo
     def get_status_display(self):
         status_map = {
         'pending': 'Pendiente',
@@ -28,7 +46,9 @@ class Reservation(db.Model):
         'cancelled': 'Cancelada',
         'cancelada': 'Cancelada',
         'completed': 'Completada',
-        'completada': 'Completada'
+        'completada': 'Completada',
+        'no presentada': 'No se presentó',
+        'expirada': 'Expirada'
         }
         return status_map.get(self.status, self.status)
 
@@ -43,3 +63,13 @@ class Reservation(db.Model):
     
     def __repr__(self):
         return f'<Reservation {self.id}>'
+
+
+@event.listens_for(Reservation.status, 'set')
+def _stamp_cancelled_at(reservation, value, previous, initiator):
+    # Las analíticas con antelación (STLY) necesitan saber hasta cuándo estuvo en libros
+    if value in Reservation.RELEASED_STATUSES:
+        if previous not in Reservation.RELEASED_STATUSES or reservation.cancelled_at is None:
+            reservation.cancelled_at = datetime.utcnow()
+    else:
+        reservation.cancelled_at = None
@@ -2,6 +2,14 @@ from app import db
 from datetime import datetime
 
 class Room(db.Model):
+    # Tipos conocidos y su nombre para mostrar
+    TYPE_LABELS = {
+        'individual': 'Individual',
+        'doble': 'Doble',
+        'suite': 'Suite',
+        'familiar': 'Familiar'
+    }
+
     id = db.Column(db.Integer, primary_key=True)
     number = db.Column(db.String(10), unique=True, nullable=False)
     type = db.Column(db.String(20), nullable=False)  # individual, doble, suite, familiar
@@ -19,14 +27,12 @@ class Room(db.Model):
     def is_available(self):
         return self.status == 'disponible'
     
+    @classmethod
+    def type_label(cls, room_type):
+        return cls.TYPE_LABELS.get(room_type, room_type.title())
+
     def get_type_display(self):
-        types = {
-            'individual': 'Individual',
-            'doble': 'Doble',
-            'suite': 'Suite',
-            'familiar': 'Familiar'
-        }
-        return types.get(self.type, self.type.title())
+        return self.type_label(self.type)
     
     def get_status_display(self):
         statuses = {
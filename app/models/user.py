@@ -1,14 +1,16 @@
-from app import db
+from app import db, password_hasher
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 
 class User(UserMixin, db.Model):
+    # Roles que se administran en la sección de personal
+    STAFF_ROLES = ('recepcionista', 'limpieza')
+
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
-    role = db.Column(db.String(20), nullable=False, default='huesped')  # huesped, recepcionista, administrador
+    role = db.Column(db.String(20), nullable=False, default='huesped')  # huesped, recepcionista, limpieza, administrador
     first_name = db.Column(db.String(50))
     last_name = db.Column(db.String(50))
     phone = db.Column(db.String(20))
@@ -31,10 +33,13 @@ class User(UserMixin, db.Model):
     )
       
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        return password_hasher.needs_rehash(self.password_hash)
     
     def is_admin(self):
         return self.role == 'administrador'
@@ -42,6 +47,9 @@ class User(UserMixin, db.Model):
     def is_receptionist(self):
         return self.role == 'recepcionista'
     
+    def is_housekeeping(self):
+        return self.role == 'limpieza'
+    
     def is_guest(self):
         return self.role == 'huesped'
     
@@ -54,6 +62,7 @@ class User(UserMixin, db.Model):
         roles = {
             'huesped': 'Huésped',
             'recepcionista': 'Recepcionista',
+            'limpieza': 'Limpieza',
             'administrador': 'Administrador'
         }
         return roles.get(self.role, self.role.title())
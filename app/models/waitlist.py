@@ -0,0 +1,50 @@
+from app import db
+from datetime import datetime
+
+class WaitlistEntry(db.Model):
+    """Huésped esperando un tipo de habitación en unas fechas (ver app/services/waitlist.py)."""
+    WAITING = 'esperando'
+    OFFERED = 'ofrecida'        # hay una reserva retenida hasta hold_expires_at
+    ACCEPTED = 'aceptada'
+    DECLINED = 'rechazada'
+    EXPIRED = 'vencida'         # no respondió a tiempo
+    WITHDRAWN = 'retirada'
+    OPEN_STATUSES = (WAITING, OFFERED)
+
+    __table_args__ = (
+        # Índice de intervalos: por tipo y estado, rango de llegada y luego de salida
+        db.Index('ix_waitlist_match', 'room_type', 'status', 'check_in_date', 'check_out_date'),
+        db.Index('ix_waitlist_status_hold', 'status', 'hold_expires_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    guest_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    room_type = db.Column(db.String(20), nullable=False)
+    check_in_date = db.Column(db.Date, nullable=False)
+    check_out_date = db.Column(db.Date, nullable=False)
+    guests_count = db.Column(db.Integer, default=1)
+    status = db.Column(db.String(20), nullable=False, default=WAITING)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    offered_at = db.Column(db.DateTime)
+    hold_expires_at = db.Column(db.DateTime)
+    reservation_id = db.Column(db.Integer, db.ForeignKey('reservation.id'))   # reserva retenida de la oferta
+
+    guest = db.relationship('User', backref=db.backref('waitlist_entries', lazy=True))
+    reservation = db.relationship('Reservation')
+
+    def get_status_display(self):
+        statuses = {
+            'esperando': 'En espera',
+            'ofrecida': 'Habitación ofrecida',
+            'aceptada': 'Aceptada',
+            'rechazada': 'Rechazada',
+            'vencida': 'Oferta vencida',
+            'retirada': 'Retirada'
+        }
+        return statuses.get(self.status, self.status.title())
+
+    def get_nights_count(self):
+        return (self.check_out_date - self.check_in_date).days
+
+    def __repr__(self):
+        return f'<WaitlistEntry {self.id} {self.room_type} {self.check_in_date}->{self.check_out_date} {self.status}>'
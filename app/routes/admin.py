@@ -1,22 +1,22 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app, send_file
+from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app, send_file, send_from_directory, abort
 from flask_login import login_required, current_user
 from werkzeug.utils import secure_filename
 from io import BytesIO
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
 import os
+import time
+from datetime import date, timedelta
 from functools import wraps
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
 
-from app import db
+from app import db, sql_stats, profiler
 from app.models.user import User
 from app.models.room import Room
 from app.models.reservation import Reservation
 from app.forms.auth import CreateStaffForm, EditProfileForm, ChangePasswordForm
-from app.forms.room import RoomForm
+from app.forms.room import RoomForm, RoomImportForm
+from app.services import analytics, forecast
+from app.services.housekeeping import close_stale_tasks, open_task
+from app.services.waitlist import offer_released
+from app.services.rooms import RoomImportError, bulk_update, import_rooms, read_rows, template_csv
 
 admin_bp = Blueprint('admin', __name__, template_folder='templates/admin')
 
@@ -36,6 +36,12 @@ def admin_required(f):
 # Función genérica para crear PDF con estilo rosado
 # -------------------------
 def create_pdf(title, headers, data_rows):
+    # reportlab se importa en la primera exportación, no al arrancar cada worker
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet
+
     buffer = BytesIO()
     doc = SimpleDocTemplate(
         buffer,
@@ -71,6 +77,9 @@ def create_pdf(title, headers, data_rows):
 # Función genérica para crear Excel con estilo rosado
 # -------------------------
 def create_excel(title, headers, data_rows):
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill, Alignment
+
     wb = Workbook()
     ws = wb.active
     ws.title = title
@@ -184,6 +193,10 @@ def edit_room(room_id):
         room.status = form.status.data
         room.description = form.description.data
         room.max_occupancy = form.max_occupancy.data
+        if room.status == 'limpieza':
+            open_task(room)
+        else:
+            close_stale_tasks([room.id])
 
         if form.image.data:
             if room.image:
@@ -220,11 +233,78 @@ def update_room_status(room_id, status):
     if status not in ['disponible', 'ocupada', 'mantenimiento', 'limpieza']:
         flash('Estado no válido.', 'danger')
         return redirect(url_for('admin.rooms'))
-    room.status = status
+    if status == 'limpieza':
+        open_task(room)
+    else:
+        room.status = status
+        close_stale_tasks([room.id])
     db.session.commit()
     flash(f'Estado de la habitación {room.number} actualizado a "{status}".', 'success')
     return redirect(url_for('admin.rooms'))
 
+@admin_bp.route('/rooms/bulk', methods=['POST'])
+@login_required
+@admin_required
+def bulk_update_rooms():
+    room_ids = request.form.getlist('room_ids', type=int)
+    if not room_ids:
+        flash('Seleccione al menos una habitación.', 'warning')
+        return redirect(url_for('admin.rooms'))
+    action = request.form.get('action')
+    try:
+        if action == 'status':
+            changed = bulk_update(room_ids, status=request.form.get('status'))
+        elif action == 'price':
+            value = request.form.get('price_value', type=float)
+            if value is None:
+                raise ValueError('Indique el valor del precio.')
+            if request.form.get('price_mode') == 'percent':
+                changed = bulk_update(room_ids, price_percent=value)
+            else:
+                changed = bulk_update(room_ids, price=value)
+        else:
+            raise ValueError('Acción no válida.')
+    except ValueError as e:
+        flash(str(e), 'danger')
+        return redirect(url_for('admin.rooms'))
+    flash(f'{changed} habitaciones actualizadas.', 'success')
+    return redirect(url_for('admin.rooms'))
+
+@admin_bp.route('/rooms/import', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def import_rooms_page():
+    form = RoomImportForm()
+    result = None
+    if form.validate_on_submit():
+        upload = form.file.data
+        try:
+            rows = read_rows(upload.filename, upload.stream)
+        except RoomImportError as e:
+            flash(str(e), 'danger')
+            return render_template('admin/import_rooms.html', form=form, result=None, room_types=Room.TYPE_LABELS)
+        result = import_rooms(rows, update_existing=form.update_existing.data, dry_run=form.dry_run.data)
+        summary = f"{result['created']} nuevas y {result['updated']} actualizadas"
+        if result['errors']:
+            flash(f"{len(result['errors'])} filas con errores: no se guardó ningún cambio.", 'danger')
+        elif form.dry_run.data:
+            flash(f'Archivo válido: {summary}. Desmarque "Solo validar" para guardar.', 'info')
+        else:
+            flash(f'Importación terminada: {summary}.', 'success')
+            return redirect(url_for('admin.rooms'))
+    elif request.method == 'POST':
+        for field, errors in form.errors.items():
+            for error in errors:
+                flash(f"Error en {getattr(form, field).label.text}: {error}", 'danger')
+    return render_template('admin/import_rooms.html', form=form, result=result, room_types=Room.TYPE_LABELS)
+
+@admin_bp.route('/rooms/import/template')
+@login_required
+@admin_required
+def room_import_template():
+    buffer = BytesIO(template_csv().encode('utf-8-sig'))
+    return send_file(buffer, as_attachment=True, download_name="Plantilla_Habitaciones.csv", mimetype='text/csv')
+
 # -------------------------
 # Reservations
 # -------------------------
@@ -267,8 +347,11 @@ def confirm_reservation(reservation_id):
 @admin_required
 def cancel_reservation(reservation_id):
     reservation = Reservation.query.get_or_404(reservation_id)
+    was_active = reservation.status in Reservation.ACTIVE_STATUSES
     reservation.status = 'cancelled'
     db.session.commit()
+    if was_active:
+        offer_released(reservation)
     flash(f'Reservación #{reservation.id} cancelada correctamente.', 'success')
     return redirect(url_for('admin.reservations'))
 
@@ -503,7 +586,7 @@ def change_password():
 @login_required
 @admin_required
 def staff():
-    staff_members = User.query.filter_by(role='recepcionista').all()
+    staff_members = User.query.filter(User.role.in_(User.STAFF_ROLES)).all()
     return render_template('admin/staff.html', staff_members=staff_members)
 
 @admin_bp.route('/staff/create', methods=['GET', 'POST'])
@@ -519,12 +602,12 @@ def create_staff():
                 first_name=form.first_name.data,
                 last_name=form.last_name.data,
                 phone=form.phone.data,
-                role='recepcionista'
+                role=form.role.data
             )
             user.set_password(form.password.data)
             db.session.add(user)
             db.session.commit()
-            flash(f'Recepcionista {user.get_full_name()} creado exitosamente.', 'success')
+            flash(f'{user.get_full_name()} ({user.get_role_display()}) creado exitosamente.', 'success')
             return redirect(url_for('admin.staff'))
         except Exception as e:
             db.session.rollback()
@@ -570,7 +653,7 @@ def delete_staff(user_id):
     try:
         db.session.delete(user)
         db.session.commit()
-        flash(f'Recepcionista {user.get_full_name()} eliminado exitosamente.', 'danger')
+        flash(f'{user.get_role_display()} {user.get_full_name()} eliminado exitosamente.', 'danger')
     except Exception as e:
         db.session.rollback()
         flash(f'Error al eliminar el usuario: {str(e)}', 'danger')
@@ -580,7 +663,7 @@ def delete_staff(user_id):
 @login_required
 @admin_required
 def download_all_staff_pdf():
-    staff_members = User.query.filter_by(role='recepcionista').all()
+    staff_members = User.query.filter(User.role.in_(User.STAFF_ROLES)).all()
     if not staff_members:
         flash("No hay personal registrado para generar el PDF.", "warning")
         return redirect(url_for('admin.staff'))
@@ -605,7 +688,7 @@ def download_all_staff_pdf():
 @login_required
 @admin_required
 def download_all_staff_excel():
-    staff_members = User.query.filter_by(role='recepcionista').all()
+    staff_members = User.query.filter(User.role.in_(User.STAFF_ROLES)).all()
     if not staff_members:
         flash("No hay personal registrado para generar el Excel.", "warning")
         return redirect(url_for('admin.staff'))
@@ -626,4 +709,96 @@ def download_all_staff_excel():
     buffer = BytesIO()
     wb.save(buffer)
     buffer.seek(0)
-    return send_file(buffer, as_attachment=True, download_name="Personal_Recepcionistas.xlsx", mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
\ No newline at end of file
+    return send_file(buffer, as_attachment=True, download_name="Personal_Recepcionistas.xlsx", mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+
+# -------------------------
+# Analítica de ocupación e ingresos
+# -------------------------
+@admin_bp.route('/analytics')
+@login_required
+@admin_required
+def analytics_page():
+    today = date.today()
+    default_start = (today.replace(day=1) - timedelta(days=334)).replace(day=1)
+    default_end = (today.replace(day=1) + timedelta(days=95)).replace(day=1)
+    try:
+        start = date.fromisoformat(request.args.get('start') or default_start.isoformat())
+        end = date.fromisoformat(request.args.get('end') or default_end.isoformat())
+        granularity = request.args.get('granularity', 'month')
+        data = analytics.report(start, end, granularity)
+    except ValueError as error:
+        flash(f'Parámetros inválidos: {error}', 'warning')
+        return redirect(url_for('admin.analytics_page'))
+    upcoming = forecast.upcoming()
+    return render_template('admin/analytics.html', data=data, granularities=analytics.GRANULARITIES,
+                           forecast=upcoming, forecast_weeks=forecast.by_week(upcoming),
+                           forecast_computed=forecast.last_computed())
+
+# -------------------------
+# Consultas lentas
+# -------------------------
+@admin_bp.route('/slow-queries')
+@login_required
+@admin_required
+def slow_queries():
+    enabled = sql_stats.slow_log is not None
+    queries = sql_stats.slow_log.top(limit=50) if enabled else []
+    return render_template('admin/slow_queries.html', queries=queries, enabled=enabled,
+                           threshold_ms=current_app.config.get('SLOW_QUERY_THRESHOLD_MS'))
+
+@admin_bp.route('/slow-queries/clear', methods=['POST'])
+@login_required
+@admin_required
+def clear_slow_queries():
+    if sql_stats.slow_log is not None:
+        sql_stats.slow_log.clear()
+    flash('Registro de consultas lentas vaciado.', 'success')
+    return redirect(url_for('admin.slow_queries'))
+
+# -------------------------
+# Perfilado de peticiones
+# -------------------------
+@admin_bp.route('/profiler')
+@login_required
+@admin_required
+def profiler_panel():
+    if profiler.directory is None:
+        flash('El perfilado está desactivado (PROFILER_ENABLED).', 'warning')
+        return redirect(url_for('admin.dashboard'))
+    endpoints = sorted(rule.endpoint for rule in current_app.url_map.iter_rules() if rule.endpoint != 'static')
+    plan = profiler.plan()
+    remaining = int((plan['expires'] - time.time()) // 60) + 1 if plan else 0
+    return render_template('admin/profiler.html', plan=plan, remaining=remaining,
+                           profiles=profiler.profiles(), endpoints=endpoints)
+
+@admin_bp.route('/profiler/arm', methods=['POST'])
+@login_required
+@admin_required
+def arm_profiler():
+    try:
+        rate = min(max(float(request.form.get('rate', 1)), 0.0), 1.0)
+        minutes = min(max(int(request.form.get('minutes', 10)), 1), 120)
+    except ValueError:
+        flash('Fracción o duración no válidas.', 'danger')
+        return redirect(url_for('admin.profiler_panel'))
+    mode = request.form.get('mode') if request.form.get('mode') in ('sample', 'cprofile', 'both') else None
+    endpoints = [e for e in request.form.getlist('endpoints') if e]
+    profiler.arm(endpoints=endpoints, rate=rate, minutes=minutes, mode=mode)
+    flash(f'Perfilado activo por {minutes} minutos en todos los workers.', 'success')
+    return redirect(url_for('admin.profiler_panel'))
+
+@admin_bp.route('/profiler/disarm', methods=['POST'])
+@login_required
+@admin_required
+def disarm_profiler():
+    profiler.disarm()
+    flash('Perfilado desactivado.', 'info')
+    return redirect(url_for('admin.profiler_panel'))
+
+@admin_bp.route('/profiler/files/<path:filename>')
+@login_required
+@admin_required
+def download_profile(filename):
+    if profiler.directory is None or not filename.endswith(('.collapsed', '.pstats')):
+        abort(404)
+    return send_from_directory(profiler.directory, filename, as_attachment=True)
@@ -0,0 +1,81 @@
+from datetime import date, datetime
+
+from flask import Blueprint, jsonify, request
+
+from app.models.room import Room
+from app.services import availability
+from app.services.pricing import booking_horizon
+
+api_bp = Blueprint('api', __name__)
+
+MAX_NIGHTS = 60
+MAX_GUESTS = 10
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+@api_bp.errorhandler(ApiError)
+def handle_api_error(error):
+    return jsonify({'error': error.message}), error.status
+
+
+def _parse_stay():
+    """Lee y valida check_in, check_out y guests de la query string."""
+    try:
+        check_in = datetime.strptime(request.args['check_in'], '%Y-%m-%d').date()
+        check_out = datetime.strptime(request.args['check_out'], '%Y-%m-%d').date()
+    except KeyError:
+        raise ApiError('Los parámetros check_in y check_out son obligatorios.')
+    except ValueError:
+        raise ApiError('Las fechas deben tener el formato AAAA-MM-DD.')
+
+    guests = request.args.get('guests', 1, type=int)
+    if check_in < date.today():
+        raise ApiError('La fecha de llegada no puede ser anterior a hoy.')
+    if check_out <= check_in:
+        raise ApiError('La fecha de salida debe ser posterior a la de llegada.')
+    if (check_out - check_in).days > MAX_NIGHTS:
+        raise ApiError(f'La estadía no puede superar {MAX_NIGHTS} noches.')
+    if check_out > booking_horizon():
+        raise ApiError(f'Solo se aceptan estadías con salida hasta el {booking_horizon().isoformat()}.')
+    if not guests or not 1 <= guests <= MAX_GUESTS:
+        raise ApiError(f'El número de huéspedes debe estar entre 1 y {MAX_GUESTS}.')
+    return check_in, check_out, guests
+
+
+# -------------------------
+# Disponibilidad
+# -------------------------
+@api_bp.route('/availability')
+def search_availability():
+    """
+    GET /api/availability?check_in=2026-12-20&check_out=2026-12-23&guests=2
+    """
+    check_in, check_out, guests = _parse_stay()
+    response = jsonify(availability.search(check_in, check_out, guests))
+    response.headers['Cache-Control'] = 'public, max-age=30'
+    return response
+
+
+# -------------------------
+# Cotización de una habitación
+# -------------------------
+@api_bp.route('/quote/<int:room_id>')
+def quote(room_id):
+    """
+    GET /api/quote/12?check_in=2026-12-20&check_out=2026-12-23&guests=2
+    """
+    check_in, check_out, guests = _parse_stay()
+    room = Room.query.get(room_id)
+    if room is None:
+        raise ApiError('La habitación no existe.', 404)
+
+    free = availability.available_rooms_query(check_in, check_out, guests).filter(Room.id == room.id).first()
+    data = availability.quote_room(room, check_in, check_out)
+    data['available'] = free is not None
+    return jsonify(data)
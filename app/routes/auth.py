@@ -1,6 +1,6 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_user, logout_user, current_user
-from app import db
+from app import db, PasswordHasherBusy
 from app.models.user import User
 from app.forms.auth import LoginForm, RegisterForm
 
@@ -14,7 +14,16 @@ def login():
     form = LoginForm()
     if form.validate_on_submit():
         user = User.query.filter_by(email=form.email.data).first()
-        if user and user.check_password(form.password.data) and user.is_active:
+        try:
+            valid = user is not None and user.check_password(form.password.data)
+            # Hashes con parámetros viejos se actualizan aprovechando la contraseña en claro
+            if valid and user.password_needs_rehash():
+                user.set_password(form.password.data)
+                db.session.commit()
+        except PasswordHasherBusy:
+            flash('Hay demasiados inicios de sesión en este momento. Intenta de nuevo en unos segundos.', 'warning')
+            return render_template('auth/login.html', form=form), 503, {'Retry-After': '5'}
+        if valid and user.is_active:
             login_user(user)
             next_page = request.args.get('next')
             flash(f'Welcome, {user.username}!', 'success')
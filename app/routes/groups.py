@@ -0,0 +1,157 @@
+from flask import Blueprint, render_template, redirect, url_for, flash, request, send_file
+from flask_login import login_required, current_user
+from io import BytesIO
+from app.forms.reservation import GroupReservationForm
+from app.models.group import ReservationGroup
+from app.models.room import Room
+from app.models.user import User
+from app.routes.receptionist import receptionist_required
+from app.services.groups import (GroupBookingError, book_group, cancel_group, check_in_group, check_out_group,
+                                 confirm_group, invoice)
+
+# --- BLUEPRINT ---
+groups_bp = Blueprint(
+    "groups",
+    __name__,
+    url_prefix="/receptionist/groups",
+    template_folder="templates/groups"
+)
+
+
+# --- LISTA DE GRUPOS ---
+@groups_bp.route("/")
+@login_required
+@receptionist_required
+def groups():
+    groups = ReservationGroup.query.order_by(ReservationGroup.check_in_date.desc(), ReservationGroup.id.desc()).all()
+    return render_template("groups/list.html", groups=groups)
+
+
+@groups_bp.route("/new", methods=["GET", "POST"])
+@login_required
+@receptionist_required
+def new_group():
+    form = GroupReservationForm()
+    form.organizer_id.choices = [(u.id, f"{u.get_full_name()} ({u.email})")
+                                 for u in User.query.filter_by(role="huesped").order_by(User.first_name, User.last_name)]
+    rooms = Room.query.filter(Room.status != "mantenimiento").order_by(Room.number).all()
+    form.room_ids.choices = [(r.id, f"Habitación {r.number} - {r.get_type_display()} ({r.max_occupancy or 2} pers.)")
+                             for r in rooms]
+
+    if form.validate_on_submit():
+        try:
+            group = book_group(
+                name=form.name.data,
+                organizer_id=form.organizer_id.data,
+                room_ids=form.room_ids.data,
+                check_in=form.check_in_date.data,
+                check_out=form.check_out_date.data,
+                guests_per_room=form.guests_per_room.data,
+                special_requests=form.special_requests.data or None,
+                confirm=form.confirm.data,
+                user=current_user
+            )
+        except GroupBookingError as e:
+            flash(f"⚠️ No se reservó ninguna habitación. {e}", "danger")
+        else:
+            flash(f"✅ Grupo reservado: {len(group.reservations)} habitaciones.", "success")
+            return redirect(url_for("groups.group_detail", group_id=group.id))
+    elif request.method == "POST":
+        for field, errors in form.errors.items():
+            for error in errors:
+                flash(f"Error en {getattr(form, field).label.text}: {error}", "danger")
+    return render_template("groups/new.html", form=form)
+
+
+@groups_bp.route("/<int:group_id>")
+@login_required
+@receptionist_required
+def group_detail(group_id):
+    group = ReservationGroup.query.get_or_404(group_id)
+    return render_template("groups/detail.html", group=group, invoice=invoice(group))
+
+
+# --- OPERACIONES DEL GRUPO ---
+GROUP_ACTIONS = {
+    "confirm": (lambda group_id: confirm_group(group_id, current_user), "{} reservas confirmadas."),
+    "checkin": (check_in_group, "Check-in de {} habitaciones."),
+    "checkout": (check_out_group, "Check-out de {} habitaciones."),
+    "cancel": (cancel_group, "{} reservas canceladas."),
+}
+
+
+@groups_bp.route("/<int:group_id>/<string:action>", methods=["POST"])
+@login_required
+@receptionist_required
+def group_action(group_id, action):
+    if action not in GROUP_ACTIONS:
+        flash("Acción no válida.", "danger")
+        return redirect(url_for("groups.group_detail", group_id=group_id))
+    operation, message = GROUP_ACTIONS[action]
+    try:
+        count = operation(group_id)
+    except GroupBookingError as e:
+        flash(str(e), "warning")
+    else:
+        flash(f"✅ {message.format(count)}", "success")
+    return redirect(url_for("groups.group_detail", group_id=group_id))
+
+
+# --- FACTURA DEL GRUPO ---
+@groups_bp.route("/<int:group_id>/invoice")
+@login_required
+@receptionist_required
+def group_invoice(group_id):
+    # reportlab se importa en la primera factura, no al arrancar cada worker
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib import colors
+
+    group = ReservationGroup.query.get_or_404(group_id)
+    data = invoice(group)
+
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    styles = getSampleStyleSheet()
+    pink_style = ParagraphStyle(
+        "PinkTitle",
+        parent=styles["Heading1"],
+        textColor=colors.HexColor("#e91e63"),
+        fontSize=18,
+        spaceAfter=12
+    )
+
+    story = [
+        Paragraph(f"Factura de grupo #{group.id}: {group.name}", pink_style),
+        Paragraph(f"Contacto: {group.organizer.get_full_name()} ({group.organizer.email})", styles["Normal"]),
+        Paragraph(f"Estadía: {group.check_in_date.strftime('%d/%m/%Y')} - {group.check_out_date.strftime('%d/%m/%Y')} "
+                  f"({group.get_nights_count()} noches)", styles["Normal"]),
+        Spacer(1, 12),
+    ]
+
+    rows = [["Reserva", "Habitación", "Tipo", "Huéspedes", "Noches", "Total", "Pago"]]
+    for line in data["lines"]:
+        rows.append([f"#{line['reservation_id']}", line["room"], line["type"], line["guests"], line["nights"],
+                     f"COP {line['total']:,.2f}", line["payment"] or "Pendiente"])
+    rows.append(["", "", "", "", "Total", f"COP {data['total']:,.2f}", ""])
+    rows.append(["", "", "", "", "Pagado", f"COP {data['paid']:,.2f}", ""])
+    rows.append(["", "", "", "", "Saldo", f"COP {data['balance']:,.2f}", ""])
+
+    table = Table(rows)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#f8bbd0")),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (4, -3), (5, -1), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+        ('BACKGROUND', (0, 1), (-1, -4), colors.whitesmoke),
+        ('GRID', (0, 0), (-1, -4), 0.5, colors.grey),
+    ]))
+    story.append(table)
+    doc.build(story)
+
+    buffer.seek(0)
+    return send_file(buffer, as_attachment=True, download_name=f"Factura_Grupo_{group.id}.pdf",
+                     mimetype="application/pdf")
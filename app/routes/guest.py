@@ -3,7 +3,11 @@ from flask_login import login_required, current_user
 from app import db
 from app.models.room import Room
 from app.models.reservation import Reservation
-from app.forms.reservation import ReservationForm
+from app.forms.reservation import ReservationForm, WaitlistForm
+from app.models.waitlist import WaitlistEntry
+from app.utils.http_cache import conditional
+from app.services.pricing import booking_horizon, stay_total
+from app.services.waitlist import WaitlistError, accept, decline, join, offer_released, withdraw
 from datetime import datetime
 
 # Definimos un solo blueprint
@@ -21,11 +25,16 @@ def dashboard():
         Reservation.checked_in_at.isnot(None),
         Reservation.checked_out_at.is_(None)
     ).first()
+    offers = WaitlistEntry.query.filter_by(
+        guest_id=current_user.id,
+        status=WaitlistEntry.OFFERED
+    ).order_by(WaitlistEntry.hold_expires_at).all()
     
     return render_template(
         'guest/dashboard.html', 
         reservations=reservations,
-        current_reservation=current_reservation
+        current_reservation=current_reservation,
+        offers=offers
     )
 
 # ----------------- PERFIL -----------------
@@ -92,7 +101,7 @@ def reserve():
             flash('La fecha de check-out debe ser posterior a la de check-in.', 'danger')
             return redirect(url_for('guest.reserve'))
 
-        total_price = room.price * nights
+        total_price = stay_total(room, form.check_in_date.data, form.check_out_date.data)
 
         reservation = Reservation(
             guest_id=current_user.id,  # Use logged-in user, not form data
@@ -115,6 +124,7 @@ def reserve():
 
 @guest_bp.route('/reservations')
 @login_required
+@conditional('catalog', lambda: f"reservations:{current_user.id}")
 def reservations():
     reservations = Reservation.query.filter_by(guest_id=current_user.id).order_by(Reservation.created_at.desc()).all()
     total_reservations = len(reservations)
@@ -143,6 +153,7 @@ def view_reservation(id):
 # ----------------- HABITACIONES -----------------
 @guest_bp.route("/rooms")
 @login_required
+@conditional('catalog')
 def rooms():
     rooms = Room.query.all()
     return render_template("guest/rooms.html", rooms=rooms)
@@ -159,12 +170,21 @@ def book_room(room_id):
             flash("Debe seleccionar fechas válidas.", "danger")
             return redirect(url_for('guest.book_room', room_id=room.id))
 
+        check_in_date = datetime.strptime(check_in, "%Y-%m-%d").date()
+        check_out_date = datetime.strptime(check_out, "%Y-%m-%d").date()
+        if check_out_date <= check_in_date:
+            flash("La fecha de salida debe ser posterior a la de llegada.", "danger")
+            return redirect(url_for('guest.book_room', room_id=room.id))
+        if check_out_date > booking_horizon():
+            flash(f"Solo se aceptan reservas con salida hasta el {booking_horizon().strftime('%d/%m/%Y')}.", "danger")
+            return redirect(url_for('guest.book_room', room_id=room.id))
+
         reservation = Reservation(
             guest_id=current_user.id,
             room_id=room.id,
-            check_in_date=datetime.strptime(check_in, "%Y-%m-%d"),
-            check_out_date=datetime.strptime(check_out, "%Y-%m-%d"),
-            total_price=room.price
+            check_in_date=check_in_date,
+            check_out_date=check_out_date,
+            total_price=stay_total(room, check_in_date, check_out_date)
         )
         db.session.add(reservation)
         db.session.commit()
@@ -182,7 +202,59 @@ def cancel_reservation(id):
         flash("No tienes permiso para cancelar esta reservación.", "danger")
         return redirect(url_for('guest.reservations'))
 
+    was_active = reservation.status in Reservation.ACTIVE_STATUSES
     reservation.status = 'cancelada'
     db.session.commit()
+    if was_active:
+        offer_released(reservation)
     flash("Reservación cancelada exitosamente.", "success")
     return redirect(url_for('guest.reservations'))
+
+
+# ----------------- LISTA DE ESPERA -----------------
+@guest_bp.route('/waitlist', methods=['GET', 'POST'])
+@login_required
+def waitlist():
+    form = WaitlistForm()
+    if form.validate_on_submit():
+        try:
+            entry = join(current_user, form.room_type.data, form.check_in_date.data,
+                         form.check_out_date.data, form.guests_count.data)
+        except WaitlistError as e:
+            flash(str(e), "warning")
+        else:
+            if entry.status == WaitlistEntry.OFFERED:
+                flash("¡Hay una habitación libre! Te la reservamos: acéptala antes de que venza la oferta.", "success")
+            else:
+                flash("Te anotamos en la lista de espera. Te ofreceremos una habitación apenas se libere.", "success")
+            return redirect(url_for('guest.waitlist'))
+    elif request.method == 'POST':
+        for field, errors in form.errors.items():
+            for error in errors:
+                flash(f"Error en {getattr(form, field).label.text}: {error}", "danger")
+
+    entries = WaitlistEntry.query.filter_by(guest_id=current_user.id).order_by(WaitlistEntry.created_at.desc()).all()
+    return render_template('guest/waitlist.html', form=form, entries=entries)
+
+
+WAITLIST_ACTIONS = {
+    'accept': (accept, "Oferta aceptada: la reserva quedó a tu nombre, pendiente de confirmación."),
+    'decline': (decline, "Oferta rechazada."),
+    'withdraw': (withdraw, "Saliste de la lista de espera."),
+}
+
+
+@guest_bp.route('/waitlist/<int:entry_id>/<string:action>', methods=['POST'])
+@login_required
+def waitlist_action(entry_id, action):
+    if action not in WAITLIST_ACTIONS:
+        flash("Acción no válida.", "danger")
+        return redirect(url_for('guest.waitlist'))
+    operation, message = WAITLIST_ACTIONS[action]
+    try:
+        operation(entry_id, current_user)
+    except WaitlistError as e:
+        flash(str(e), "warning")
+    else:
+        flash(message, "success")
+    return redirect(url_for('guest.waitlist'))
@@ -0,0 +1,90 @@
+from flask import Blueprint, render_template, redirect, url_for, flash
+from flask_login import login_required, current_user
+from functools import wraps
+from app.services.housekeeping import claim, claim_next, complete, completed_today, queue, release
+
+# --- BLUEPRINT ---
+housekeeping_bp = Blueprint(
+    "housekeeping",
+    __name__,
+    url_prefix="/housekeeping",
+    template_folder="templates/housekeeping"
+)
+
+# --- Decorador para personal de limpieza (recepción y administración también pueden ver la cola) ---
+def housekeeping_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not current_user.is_authenticated or not (
+            current_user.is_housekeeping() or current_user.is_receptionist() or current_user.is_admin()
+        ):
+            flash('Acceso denegado. Se requieren permisos de limpieza.', 'danger')
+            return redirect(url_for('main.index'))
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+# --- COLA DE LIMPIEZA ---
+@housekeeping_bp.route('/')
+@login_required
+@housekeeping_required
+def dashboard():
+    items = queue()
+    mine = [item for item in items if item['task'].claimed_by_id == current_user.id]
+    pending = [item for item in items if item['task'].claimed_by_id is None]
+    others = [item for item in items if item['task'].claimed_by_id not in (None, current_user.id)]
+    return render_template(
+        'housekeeping/dashboard.html',
+        mine=mine,
+        pending=pending,
+        others=others,
+        completed_today=completed_today()
+    )
+
+
+@housekeeping_bp.route('/claim-next', methods=['POST'])
+@login_required
+@housekeeping_required
+def claim_next_task():
+    task = claim_next(current_user)
+    if task:
+        flash(f'Habitación {task.room.number} asignada.', 'success')
+    else:
+        flash('No hay habitaciones pendientes de limpieza.', 'info')
+    return redirect(url_for('housekeeping.dashboard'))
+
+
+@housekeeping_bp.route('/<int:task_id>/claim', methods=['POST'])
+@login_required
+@housekeeping_required
+def claim_task(task_id):
+    if claim(task_id, current_user):
+        flash('Tarea asignada.', 'success')
+    else:
+        flash('Otra persona ya tomó esta tarea.', 'warning')
+    return redirect(url_for('housekeeping.dashboard'))
+
+
+@housekeeping_bp.route('/<int:task_id>/release', methods=['POST'])
+@login_required
+@housekeeping_required
+def release_task(task_id):
+    if release(task_id, current_user):
+        flash('La tarea volvió a la cola.', 'info')
+    else:
+        flash('No se pudo liberar la tarea.', 'warning')
+    return redirect(url_for('housekeeping.dashboard'))
+
+
+@housekeeping_bp.route('/<int:task_id>/complete', methods=['POST'])
+@login_required
+@housekeeping_required
+def complete_task(task_id):
+    room = complete(task_id, current_user)
+    if room is None:
+        flash('La tarea no está en proceso a tu nombre.', 'warning')
+    elif room.status == 'disponible':
+        flash(f'Habitación {room.number} lista y disponible.', 'success')
+    else:
+        flash(f'Tarea cerrada. La habitación {room.number} sigue en estado "{room.get_status_display()}".', 'info')
+    return redirect(url_for('housekeeping.dashboard'))
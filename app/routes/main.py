@@ -1,5 +1,7 @@
-from flask import Blueprint, render_template, redirect, url_for, flash
+from flask import Blueprint, render_template, redirect, url_for, flash, g, current_app
 from flask_login import login_required, current_user
+from app import page_cache
+from app.utils.http_cache import conditional
 from app.models.room import Room
 from app.models.reservation import Reservation
 
@@ -7,16 +9,21 @@ main_bp = Blueprint('main', __name__)
 
 # Página principal (Index) con habitaciones dinámicas
 @main_bp.route("/")
+@page_cache.cached('catalog')
 def index():
     """
     Renderiza la página principal mostrando habitaciones disponibles.
     """
     try:
         rooms = Room.query.filter_by(status="disponible").all()
-        print(f"Found {len(rooms)} available rooms")  # Debug logging
         return render_template("main/index.html", rooms=rooms)
-    except Exception as e:
-        print(f"Database error: {e}")  # Debug logging
+    except Exception:
+        current_app.logger.exception("Error al cargar las habitaciones de la página principal")
+        # Si la BD falla, mejor la última versión conocida que una página vacía
+        stale = page_cache.stale()
+        if stale is not None:
+            return stale
+        g.page_cache_skip = True
         return render_template("main/index.html", rooms=[])
 
 # Página "Sobre nosotros"
@@ -46,10 +53,14 @@ def dashboard():
         return redirect(url_for('admin.dashboard'))
     elif current_user.is_receptionist():
         return redirect(url_for('receptionist.dashboard'))
+    elif current_user.is_housekeeping():
+        return redirect(url_for('housekeeping.dashboard'))
     else:
         return redirect(url_for('guest.dashboard'))
 
 @main_bp.route("/rooms")
+@conditional('catalog')
+@page_cache.cached('catalog')
 def rooms():
     """
     Renderiza la página de habitaciones mostrando todas las habitaciones.
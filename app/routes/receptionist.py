@@ -1,21 +1,23 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request, send_file
+from flask import Blueprint, render_template, redirect, url_for, flash, request, send_file, Response, current_app
 from flask_login import login_required, current_user
-from app import db
+from app import db, events
 from app.models.room import Room
 from app.models.reservation import Reservation
 from app.forms.checkin import CheckinForm
-from app.forms.reservation import ReservationForm   # ✅ agregado
+from app.forms.reservation import ReservationForm, ReservationImportForm   # ✅ agregado
 from app.models.user import User
 from datetime import datetime
 from functools import wraps
 from io import BytesIO
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib import colors
 from app.forms.profile import EditProfileForm
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
+from app.utils.http_cache import conditional
+from app.services.frontdesk import dashboard_summary
+from app.services.pricing import booking_horizon, stay_total
+from app.services.housekeeping import open_task
+from app.services.waitlist import offer_released
+from app.services.reservation_import import ReservationImportError, import_reservations, read_rows, report_csv
+import json
+import time
 
 # --- BLUEPRINT ---
 receptionist_bp = Blueprint(
@@ -49,9 +51,10 @@ def dashboard():
         Reservation.checked_out_at.is_(None)
     ).all()
 
-    available_rooms = Room.query.filter_by(status='disponible').count()
-    occupied_rooms = Room.query.filter_by(status='ocupada').count()
-    maintenance_rooms = Room.query.filter_by(status='mantenimiento').count()
+    summary = dashboard_summary(db.session)
+    available_rooms = summary['available_rooms']
+    occupied_rooms = summary['occupied_rooms']
+    maintenance_rooms = summary['maintenance_rooms']
 
     return render_template(
         'receptionist/dashboard.html',
@@ -66,10 +69,44 @@ def dashboard():
     )
 
 
+# --- EVENTOS EN VIVO (SSE) ---
+@receptionist_bp.route('/events')
+@login_required
+@receptionist_required
+def event_stream():
+    """
+    Flujo Server-Sent Events con los cambios de habitaciones y reservas.
+    Las páginas de dashboard, check-in y check-out lo usan para actualizarse
+    sin recargar. La conexión se cierra cada EVENTS_STREAM_TIMEOUT segundos y
+    el navegador se reconecta solo.
+    """
+    heartbeat = current_app.config['EVENTS_HEARTBEAT']
+    deadline = time.monotonic() + current_app.config['EVENTS_STREAM_TIMEOUT']
+
+    def stream():
+        with events.subscribe() as subscription:
+            yield "retry: 3000\n\n"
+            while time.monotonic() < deadline:
+                event = subscription.get(timeout=heartbeat)
+                if subscription.overflowed:
+                    yield "event: reload\ndata: {}\n\n"
+                    return
+                if event is None:
+                    yield ": ping\n\n"
+                    continue
+                yield f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+    response = Response(stream(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
 # --- ROOMS ---
 @receptionist_bp.route('/rooms')
 @login_required
 @receptionist_required
+@conditional('catalog')
 def rooms():
     rooms = Room.query.all()
     return render_template('receptionist/rooms.html', rooms=rooms)
@@ -110,9 +147,8 @@ def new_reservation():
             flash("⚠️ La habitación seleccionada ya no está disponible.", "danger")
             return redirect(url_for("receptionist.new_reservation"))
 
-        # Calcular precio total (ejemplo: días * precio habitación)
-        nights = (form.check_out_date.data - form.check_in_date.data).days
-        total_price = nights * room.price
+        # Precio total según el calendario de tarifas
+        total_price = stay_total(room, form.check_in_date.data, form.check_out_date.data)
 
         # Crear la reserva
         reservation = Reservation(
@@ -141,6 +177,42 @@ def new_reservation():
     )
 
 
+# --- IMPORTAR RESERVAS (CANALES Y GRUPOS) ---
+@receptionist_bp.route("/reservations/import", methods=["GET", "POST"])
+@login_required
+@receptionist_required
+def import_reservations_page():
+    form = ReservationImportForm()
+    result = None
+    if form.validate_on_submit():
+        upload = form.file.data
+        try:
+            rows = read_rows(upload.filename, upload.stream)
+        except ReservationImportError as e:
+            flash(str(e), "danger")
+            return render_template("receptionist/import_reservations.html", form=form, result=None)
+        result = import_reservations(rows, dry_run=form.dry_run.data, user=current_user)
+
+        if form.download_report.data:
+            buffer = BytesIO(report_csv(result).encode("utf-8-sig"))
+            return send_file(buffer, as_attachment=True, download_name="Informe_Importacion_Reservas.csv",
+                             mimetype="text/csv")
+
+        rejected = result["errors"] + result["conflicts"] + result["duplicates"]
+        if form.dry_run.data:
+            flash(f'Se importarían {result["imported"]} reservas ({result["new_guests"]} huéspedes nuevos) '
+                  f'y {rejected} filas quedarían por fuera. Desmarque "Solo validar" para guardar.', "info")
+        else:
+            flash(f'✅ {result["imported"]} reservas importadas ({result["new_guests"]} huéspedes nuevos) '
+                  f'en {result["duration_ms"]} ms; {rejected} filas no se importaron.',
+                  "success" if not rejected else "warning")
+    elif request.method == "POST":
+        for field, errors in form.errors.items():
+            for error in errors:
+                flash(f"Error en {getattr(form, field).label.text}: {error}", "danger")
+    return render_template("receptionist/import_reservations.html", form=form, result=result)
+
+
 @receptionist_bp.route("/reservation/<int:reservation_id>")
 @login_required
 @receptionist_required
@@ -155,6 +227,7 @@ def reservation_detail(reservation_id):
 @receptionist_required
 def update_status(reservation_id, status):
     reservation = Reservation.query.get_or_404(reservation_id)
+    released = status == "cancelada" and reservation.status in Reservation.ACTIVE_STATUSES
 
     if status == "confirmada":
         reservation.status = "confirmada"
@@ -168,9 +241,11 @@ def update_status(reservation_id, status):
     elif status == "checkout":
         reservation.checked_out_at = datetime.utcnow()
         reservation.status = "completada"
-        reservation.room.status = "limpieza"
+        open_task(reservation.room, reservation)
 
     db.session.commit()
+    if released:
+        offer_released(reservation)
     flash("Estado de la reserva actualizado.", "success")
     return redirect(url_for("receptionist.reservation_detail", reservation_id=reservation.id))
 
@@ -180,6 +255,12 @@ def update_status(reservation_id, status):
 @login_required
 @receptionist_required
 def reservations_pdf():
+    # reportlab se importa en la primera exportación, no al arrancar cada worker
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib import colors
+
     buffer = BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter)
     styles = getSampleStyleSheet()
@@ -239,6 +320,9 @@ def reservations_pdf():
 @login_required
 @receptionist_required
 def reservations_excel():
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill, Alignment
+
     wb = Workbook()
     ws = wb.active
     ws.title = "Reporte de Reservas"
@@ -368,11 +452,17 @@ def checkin_select_room(guest_id, room_id, check_out_date):
         flash(f'La habitación {room.number} no está disponible.', 'warning')
         return redirect(url_for('receptionist.new_checkin'))
 
+    check_in = datetime.now().date()
+    check_out = datetime.strptime(check_out_date, "%Y-%m-%d").date()
+    if not check_in < check_out <= booking_horizon():
+        flash('La fecha de salida no es válida.', 'warning')
+        return redirect(url_for('receptionist.new_checkin'))
     reservation = Reservation(
         guest_id=guest.id,
         room_id=room.id,
-        check_in_date=datetime.now().date(),
-        check_out_date=datetime.strptime(check_out_date, "%Y-%m-%d").date(),
+        check_in_date=check_in,
+        check_out_date=check_out,
+        total_price=stay_total(room, check_in, check_out),
         status='confirmada',
         checked_in_at=datetime.utcnow()
     )
@@ -392,7 +482,7 @@ def checkout(reservation_id):
     if reservation.checked_in_at and not reservation.checked_out_at:
         reservation.checked_out_at = datetime.utcnow()
         reservation.status = 'completada'
-        reservation.room.status = 'limpieza'
+        open_task(reservation.room, reservation)
         db.session.commit()
         flash(f'Check-out realizado para {reservation.room.number}', 'success')
     else:
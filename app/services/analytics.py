@@ -0,0 +1,255 @@
+"""
+Analítica de ocupación e ingresos para administración.
+
+Indicadores por día, semana o mes y por tipo de habitación:
+- Ocupación: noches vendidas / noches disponibles.
+- ADR: ingreso / noches vendidas.
+- RevPAR: ingreso / noches disponibles.
+- Pickup: noches reservadas en los últimos N días para cada fecha de estadía.
+- Ritmo de reservas: ocupación en libros hoy frente a la misma antelación un
+  año antes (STLY). Una reserva estaba en libros ese día si ya se había
+  creado y todavía no se había cancelado (cancelled_at). Las canceladas sin
+  cancelled_at (anteriores a esa columna) no cuentan, así que el STLY de
+  fechas viejas puede quedar algo por debajo de lo que realmente había.
+- Cancelación: reservas canceladas / reservas con llegada en el periodo.
+
+Dos consultas (inventario por tipo y reservas del rango) y el resto con numpy
+sobre una matriz tipo de habitación × día. Cada reserva suma en su llegada y
+resta en su salida, así que una suma acumulada da las noches vendidas de
+todos los días sin recorrer estadías noche por noche. El ingreso de una
+estadía se reparte por igual entre sus noches.
+
+Los resultados se guardan en la caché de valores (page_cache.set_value) con
+llave por versión del catálogo y de las reservas.
+"""
+
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app import db, page_cache
+from app.models.room import Room
+from app.models.reservation import Reservation
+
+GRANULARITIES = ('day', 'week', 'month')
+STLY_DAYS = 364  # 52 semanas: compara el mismo día de la semana
+MAX_DAYS = 3 * 366
+
+
+def _day_index(values, origin):
+    import numpy as np
+    return (np.array(values, dtype='datetime64[D]') - np.datetime64(origin, 'D')).astype(np.int64)
+
+
+def _period_starts(start, end, granularity):
+    """Fechas de inicio de cada periodo dentro de [start, end)."""
+    starts = [start]
+    if granularity == 'day':
+        step = lambda day: day + timedelta(days=1)
+    elif granularity == 'week':
+        step = lambda day: day - timedelta(days=day.weekday()) + timedelta(days=7)
+    else:
+        step = lambda day: (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+    while True:
+        following = step(starts[-1])
+        if following >= end:
+            return starts
+        starts.append(following)
+
+
+def _period_label(day, granularity):
+    if granularity == 'day':
+        return day.strftime('%d/%m/%Y')
+    if granularity == 'week':
+        year, week, _ = day.isocalendar()
+        return f'{year}-S{week:02d}'
+    return day.strftime('%m/%Y')
+
+
+def _ratios(sold, revenue, available, arrivals, cancelled):
+    """Indicadores a partir de sumas (escalares o arreglos del mismo tamaño)."""
+    import numpy as np
+
+    def divide(numerator, denominator):
+        numerator = np.asarray(numerator, dtype=float)
+        denominator = np.asarray(denominator, dtype=float)
+        return np.divide(numerator, denominator, out=np.zeros(np.broadcast(numerator, denominator).shape),
+                         where=denominator > 0)
+
+    return {
+        'occupancy': divide(sold, available),
+        'adr': divide(revenue, sold),
+        'revpar': divide(revenue, available),
+        'cancellation_rate': divide(cancelled, arrivals),
+    }
+
+
+def inventory(origin, days):
+    """
+    Habitaciones por tipo y día desde origin: cada habitación cuenta desde el
+    día en que se creó. Devuelve (tipos, matriz [tipos, days]).
+    """
+    import numpy as np
+
+    inventory_rows = db.session.execute(
+        select(Room.type, func.date(Room.created_at), func.count()).group_by(Room.type, func.date(Room.created_at))
+    ).all()
+    types = sorted({row[0] for row in inventory_rows})
+    row_of = {room_type: index for index, room_type in enumerate(types)}
+    available = np.zeros((len(types), days + 1))
+    for room_type, created, count in inventory_rows:
+        created = date.fromisoformat(str(created)) if created else origin
+        np.add.at(available, (row_of[room_type], min(max((created - origin).days, 0), days)), count)
+    return types, np.cumsum(available, axis=1)[:, :days]
+
+
+def _load(origin, end, as_of, pickup_days):
+    """Matrices tipo × día desde origin hasta end (excl.)."""
+    import numpy as np
+
+    days = (end - origin).days
+    types, available = inventory(origin, days)
+    row_of = {room_type: index for index, room_type in enumerate(types)}
+    shape = (len(types), days + 1)
+
+    reservations = db.session.execute(
+        select(Room.type, Reservation.check_in_date, Reservation.check_out_date, Reservation.total_price,
+               Reservation.status, Reservation.created_at, Reservation.cancelled_at)
+        .join(Room, Room.id == Reservation.room_id)
+        .where(Reservation.check_in_date < end, Reservation.check_out_date > origin)
+    ).all()
+
+    matrices = {name: np.zeros(shape) for name in ('sold', 'revenue', 'pickup', 'stly', 'arrivals', 'cancelled')}
+    if reservations:
+        room_types, check_ins, check_outs, totals, statuses, created, cancelled_at = zip(*reservations)
+        rows = np.array([row_of.get(room_type, 0) for room_type in room_types], dtype=np.intp)
+        arrival = _day_index(check_ins, origin)
+        departure = _day_index(check_outs, origin)
+        booked = _day_index([value or datetime.combine(check_in, datetime.min.time())
+                             for value, check_in in zip(created, check_ins)], origin)
+        nightly = np.asarray(totals, dtype=float) / np.maximum(departure - arrival, 1)
+        statuses = np.array(statuses, dtype=object)
+        cancelled = np.isin(statuses, Reservation.CANCELLED_STATUSES)
+        # No presentadas y expiradas tampoco venden noches, pero no son cancelaciones
+        kept = ~np.isin(statuses, Reservation.RELEASED_STATUSES)
+        # Liberadas sin fecha conocida: como si nunca hubieran estado en libros
+        released = _day_index([value or datetime.combine(origin, datetime.min.time()) for value in cancelled_at],
+                              origin)
+        released_known = np.array([value is not None for value in cancelled_at])
+        first, last = np.clip(arrival, 0, days), np.clip(departure, 0, days)
+        as_of_index = (as_of - origin).days
+        stly_index = as_of_index - STLY_DAYS
+
+        def spread(matrix, mask, weights=None):
+            # +w en la primera noche dentro del rango, -w al salir
+            weights = np.ones(mask.sum()) if weights is None else weights[mask]
+            np.add.at(matrix, (rows[mask], first[mask]), weights)
+            np.add.at(matrix, (rows[mask], last[mask]), -weights)
+
+        spread(matrices['sold'], kept)
+        spread(matrices['revenue'], kept, nightly)
+        spread(matrices['pickup'], kept & (booked > as_of_index - pickup_days) & (booked <= as_of_index))
+        # En libros hace 52 semanas: creada para entonces y cancelada después (o nunca)
+        on_books = kept | (released_known & (released > stly_index))
+        spread(matrices['stly'], on_books & (booked <= stly_index))
+        for name in ('sold', 'revenue', 'pickup', 'stly'):
+            matrices[name] = np.cumsum(matrices[name], axis=1)
+
+        in_range = (arrival >= 0) & (arrival < days)
+        np.add.at(matrices['arrivals'], (rows[in_range], arrival[in_range]), 1)
+        np.add.at(matrices['cancelled'], (rows[in_range & cancelled], arrival[in_range & cancelled]), 1)
+
+    matrices = {name: matrix[:, :days] for name, matrix in matrices.items()}
+    matrices['available'] = available
+    return types, matrices
+
+
+def report(start, end, granularity='month', as_of=None, pickup_days=7):
+    """Indicadores de las estadías entre start (incl.) y end (excl.)."""
+    import numpy as np
+
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Granularidad desconocida: {granularity}")
+    if end <= start:
+        raise ValueError("La fecha final debe ser posterior a la inicial")
+    if (end - start).days > MAX_DAYS:
+        raise ValueError(f"El rango no puede superar {MAX_DAYS} días")
+    as_of = as_of or date.today()
+
+    key = (
+        f"analytics:{start.isoformat()}:{end.isoformat()}:{granularity}:{as_of.isoformat()}:{pickup_days}"
+        f"|catalog:{page_cache.version('catalog')}|availability:{page_cache.version('availability')}"
+    )
+    cached = page_cache.get_value(key)
+    if cached is not None:
+        return cached
+
+    # Un año antes del rango para comparar con la misma antelación (STLY)
+    origin = start - timedelta(days=STLY_DAYS)
+    types, matrices = _load(origin, end, as_of, pickup_days)
+    offset = STLY_DAYS
+    window = {name: matrix[:, offset:] for name, matrix in matrices.items()}
+    window['stly'] = matrices['stly'][:, :-offset]
+    window['stly_available'] = matrices['available'][:, :-offset]
+    by_day = {name: matrix.sum(axis=0) for name, matrix in window.items()}
+
+    starts = _period_starts(start, end, granularity)
+    boundaries = np.array([(day - start).days for day in starts])
+    sums = {name: np.add.reduceat(values, boundaries) if len(values) else values
+            for name, values in by_day.items()}
+    ratios = _ratios(sums['sold'], sums['revenue'], sums['available'], sums['arrivals'], sums['cancelled'])
+    stly_occupancy = _ratios(sums['stly'], 0, sums['stly_available'], 0, 0)['occupancy']
+
+    periods = []
+    for index, day in enumerate(starts):
+        periods.append({
+            'start': day.isoformat(),
+            'label': _period_label(day, granularity),
+            'available': int(sums['available'][index]),
+            'room_nights': int(sums['sold'][index]),
+            'revenue': round(float(sums['revenue'][index]), 2),
+            'occupancy': round(float(ratios['occupancy'][index]), 4),
+            'adr': round(float(ratios['adr'][index]), 2),
+            'revpar': round(float(ratios['revpar'][index]), 2),
+            'pickup': int(sums['pickup'][index]),
+            'stly_occupancy': round(float(stly_occupancy[index]), 4),
+            'arrivals': int(sums['arrivals'][index]),
+            'cancellation_rate': round(float(ratios['cancellation_rate'][index]), 4),
+        })
+
+    per_type = {name: matrix.sum(axis=1) for name, matrix in window.items()}
+    type_ratios = _ratios(per_type['sold'], per_type['revenue'], per_type['available'],
+                          per_type['arrivals'], per_type['cancelled'])
+    room_types = []
+    for index, room_type in enumerate(types):
+        room_types.append({
+            'type': room_type,
+            'label': Room.type_label(room_type),
+            'room_nights': int(per_type['sold'][index]),
+            'revenue': round(float(per_type['revenue'][index]), 2),
+            'occupancy': round(float(type_ratios['occupancy'][index]), 4),
+            'adr': round(float(type_ratios['adr'][index]), 2),
+            'revpar': round(float(type_ratios['revpar'][index]), 2),
+            'cancellation_rate': round(float(type_ratios['cancellation_rate'][index]), 4),
+        })
+
+    totals = {name: float(values.sum()) for name, values in by_day.items()}
+    total_ratios = _ratios(totals['sold'], totals['revenue'], totals['available'],
+                           totals['arrivals'], totals['cancelled'])
+    result = {
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'granularity': granularity,
+        'as_of': as_of.isoformat(),
+        'pickup_days': pickup_days,
+        'totals': {
+            'room_nights': int(totals['sold']),
+            'revenue': round(totals['revenue'], 2),
+            'pickup': int(totals['pickup']),
+            **{name: round(float(value), 4) for name, value in total_ratios.items()},
+        },
+        'periods': periods,
+        'room_types': room_types,
+    }
+    page_cache.set_value(key, result)
+    return result
@@ -0,0 +1,108 @@
+"""
+Disponibilidad y cotización de habitaciones.
+
+Una sola consulta por búsqueda: habitaciones reservables sin ninguna reserva
+activa que se cruce con las fechas pedidas. El resultado se guarda en la caché
+de datos de PageCache (aparte de las páginas) con llave por versión del
+catálogo y de las reservas, así que las
+búsquedas repetidas (el caso normal desde el sitio y la app móvil) no tocan
+la BD hasta que algo cambia o pasa PAGE_CACHE_TTL.
+
+Los totales salen del motor de tarifas (app/services/pricing.py); todas las
+habitaciones de una búsqueda se cotizan en una sola pasada vectorizada.
+"""
+
+from sqlalchemy import select, update
+
+from app import db, page_cache
+from app.models.room import Room
+from app.models.reservation import Reservation
+from app.services import pricing
+
+
+def available_rooms_query(check_in, check_out, guests=1):
+    """Habitaciones libres entre check_in (incl.) y check_out (excl.)."""
+    overlapping = db.session.query(Reservation.id).filter(
+        Reservation.room_id == Room.id,
+        Reservation.status.in_(Reservation.ACTIVE_STATUSES),
+        Reservation.check_in_date < check_out,
+        Reservation.check_out_date > check_in
+    ).exists()
+
+    return Room.query.filter(
+        Room.status == 'disponible',
+        db.func.coalesce(Room.max_occupancy, 2) >= guests,
+        ~overlapping
+    ).order_by(Room.type, Room.price, Room.number)
+
+
+def lock_rooms(room_ids):
+    """
+    Bloquea las habitaciones hasta el fin de la transacción, siempre en orden
+    de id para que dos transacciones que comparten habitaciones no se
+    bloqueen mutuamente. SQLite no tiene bloqueo por fila: ahí una escritura
+    sin cambios sobre las habitaciones toma el bloqueo de escritura de la BD
+    antes de leer.
+    """
+    room_ids = sorted(set(room_ids))
+    if db.session.get_bind().dialect.name == 'sqlite':
+        db.session.execute(
+            update(Room).where(Room.id.in_(room_ids)).values(status=Room.status),
+            execution_options={'synchronize_session': False}
+        )
+    return db.session.execute(
+        select(Room).where(Room.id.in_(room_ids)).order_by(Room.id).with_for_update()
+    ).scalars().all()
+
+
+def _room_quote(room, prices):
+    return {
+        'room_id': room.id,
+        'number': room.number,
+        'type': room.type,
+        'max_occupancy': room.max_occupancy,
+        **prices,
+    }
+
+
+def quote_room(room, check_in, check_out):
+    """Cotización de una habitación con el precio de cada noche."""
+    return _room_quote(room, pricing.quote(room, check_in, check_out))
+
+
+def search(check_in, check_out, guests=1):
+    """Tipos de habitación con sus habitaciones libres y el total de la estadía."""
+    key = (
+        f"api:availability:{check_in.isoformat()}:{check_out.isoformat()}:{guests}"
+        f"|catalog:{page_cache.version('catalog')}|availability:{page_cache.version('availability')}"
+        f"|pricing:{pricing.calendar().version}"
+    )
+    cached = page_cache.get_value(key)
+    if cached is not None:
+        return cached
+
+    rooms = available_rooms_query(check_in, check_out, guests).all()
+    room_types = {}
+    for room, prices in zip(rooms, pricing.quote_many(rooms, check_in, check_out)):
+        entry = room_types.setdefault(room.type, {
+            'type': room.type,
+            'label': room.get_type_display(),
+            'available': 0,
+            'min_total': None,
+            'rooms': [],
+        })
+        quote = _room_quote(room, prices)
+        entry['available'] += 1
+        entry['rooms'].append(quote)
+        if entry['min_total'] is None or quote['total'] < entry['min_total']:
+            entry['min_total'] = quote['total']
+
+    result = {
+        'check_in': check_in.isoformat(),
+        'check_out': check_out.isoformat(),
+        'nights': (check_out - check_in).days,
+        'guests': guests,
+        'room_types': list(room_types.values()),
+    }
+    page_cache.set_value(key, result)
+    return result
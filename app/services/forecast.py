@@ -0,0 +1,241 @@
+"""
+Pronóstico de ocupación a 90 días.
+
+Modelo de curvas de reserva (pickup) por día de la semana:
+- Para cada fecha de estadía ya pasada se mide, a cada antelación L (días
+  antes de la llegada), qué fracción del inventario se reservó después de L
+  (pickup) y qué fracción de lo que ya estaba reservado en L terminó cancelada.
+- Cada observación actualiza la curva de su día de la semana con suavizado
+  exponencial (FORECAST_ALPHA): las semanas recientes pesan más.
+- Pronóstico de una fecha futura a L días de hoy:
+  noches en libros × (1 - cancelación[L]) + pickup[L] × inventario.
+
+Las curvas se guardan en `pickup_curve` junto con la última fecha de estadía
+incorporada. Cada noche solo se procesan las fechas nuevas (normalmente una),
+así que la actualización es incremental. La primera vez se recorre
+FORECAST_HISTORY_DAYS de historia. El pronóstico queda en
+`occupancy_forecast`, que leen la página de analítica y el calendario de
+tarifas (PRICING_DEMAND_FACTORS).
+
+Las reservas se expanden a noches con numpy y se agregan en una matriz
+día × antelación; no hay bucles por reserva.
+"""
+
+from datetime import date, datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, func, select
+
+from app import db
+from app.models.forecast import OccupancyForecast, PickupCurve
+from app.models.reservation import Reservation
+from app.services.analytics import inventory
+
+
+def _nights_by_lead(first_day, days, horizon):
+    """
+    Noches de estadía en [first_day, first_day + days) según la antelación con
+    que se reservaron. Devuelve dos matrices [days, horizon + 1]: todas las
+    noches y solo las que siguen en pie (sin cancelar, no presentadas ni
+    expiradas). La última columna acumula las reservadas con `horizon` días
+    o más de antelación.
+    """
+    import numpy as np
+
+    last_day = first_day + timedelta(days=days)
+    rows = db.session.execute(
+        select(Reservation.check_in_date, Reservation.check_out_date, Reservation.created_at, Reservation.status)
+        .where(Reservation.check_in_date < last_day, Reservation.check_out_date > first_day)
+    ).all()
+    booked_all = np.zeros((days, horizon + 1))
+    booked_kept = np.zeros((days, horizon + 1))
+    if not rows:
+        return booked_all, booked_kept
+
+    check_ins, check_outs, created, statuses = zip(*rows)
+    origin = np.datetime64(first_day, 'D')
+    arrival = (np.array(check_ins, dtype='datetime64[D]') - origin).astype(np.int64)
+    departure = (np.array(check_outs, dtype='datetime64[D]') - origin).astype(np.int64)
+    booked = np.array([value or datetime.combine(check_in, datetime.min.time())
+                       for value, check_in in zip(created, check_ins)], dtype='datetime64[D]')
+    booked = (booked - origin).astype(np.int64)
+    cancelled = np.isin(np.array(statuses, dtype=object), Reservation.RELEASED_STATUSES)
+
+    # Una fila por noche: día de estadía = llegada + 0..noches-1
+    nights = np.maximum(departure - arrival, 0)
+    starts = np.cumsum(nights) - nights
+    day = np.repeat(arrival, nights) + np.arange(nights.sum()) - np.repeat(starts, nights)
+    lead = np.clip(day - np.repeat(booked, nights), 0, horizon)
+    cancelled = np.repeat(cancelled, nights)
+    inside = (day >= 0) & (day < days)
+
+    np.add.at(booked_all, (day[inside], lead[inside]), 1)
+    kept = inside & ~cancelled
+    np.add.at(booked_kept, (day[kept], lead[kept]), 1)
+    return booked_all, booked_kept
+
+
+def _on_the_books(booked):
+    """Noches en libros a cada antelación L: reservadas con L días o más."""
+    import numpy as np
+    return np.flip(np.cumsum(np.flip(booked, axis=1), axis=1), axis=1)
+
+
+def _rooms(first_day, days):
+    _, available = inventory(first_day, days)
+    return available.sum(axis=0)
+
+
+def _load_curve(horizon):
+    import numpy as np
+
+    rows = db.session.execute(
+        select(PickupCurve.weekday, PickupCurve.lead_days, PickupCurve.pickup, PickupCurve.cancellation,
+               PickupCurve.updated_through)
+    ).all()
+    if not rows:
+        return None
+    pickup = np.full((7, horizon + 1), np.nan)
+    cancellation = np.full((7, horizon + 1), np.nan)
+    for weekday, lead, pickup_value, cancellation_value, _ in rows:
+        if lead <= horizon:
+            pickup[weekday, lead] = pickup_value
+            cancellation[weekday, lead] = cancellation_value
+    return pickup, cancellation, max(row[4] for row in rows)
+
+
+def _fold(pickup, cancellation, first_day, last_day, alpha, horizon):
+    """Incorpora a las curvas las fechas de estadía first_day..last_day (incl.)."""
+    import numpy as np
+
+    days = (last_day - first_day).days + 1
+    booked_all, booked_kept = _nights_by_lead(first_day, days, horizon)
+    otb_all, otb_kept = _on_the_books(booked_all), _on_the_books(booked_kept)
+    rooms = _rooms(first_day, days)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        observed_pickup = (otb_kept[:, :1] - otb_kept) / rooms[:, None]
+        observed_cancellation = (otb_all - otb_kept) / otb_all
+    for index in range(days):
+        if rooms[index] <= 0:
+            continue
+        weekday = (first_day + timedelta(days=index)).weekday()
+        for curve, observation in ((pickup, observed_pickup[index]), (cancellation, observed_cancellation[index])):
+            valid = ~np.isnan(observation)
+            fresh = valid & np.isnan(curve[weekday])
+            curve[weekday, fresh] = observation[fresh]
+            update = valid & ~fresh
+            curve[weekday, update] += alpha * (observation[update] - curve[weekday, update])
+
+
+def update_forecast(today=None, echo=None):
+    """
+    Actualiza las curvas con las fechas de estadía cerradas desde la última
+    corrida y recalcula el pronóstico de los próximos FORECAST_HORIZON días.
+    """
+    import numpy as np
+
+    config = current_app.config
+    horizon, alpha = config['FORECAST_HORIZON'], config['FORECAST_ALPHA']
+    today = today or date.today()
+    echo = echo or (lambda message: None)
+
+    loaded = _load_curve(horizon)
+    if loaded is None:
+        pickup = np.full((7, horizon + 1), np.nan)
+        cancellation = np.full((7, horizon + 1), np.nan)
+        first_day = today - timedelta(days=config['FORECAST_HISTORY_DAYS'])
+    else:
+        pickup, cancellation, through = loaded
+        first_day = through + timedelta(days=1)
+    # Una fecha de estadía queda cerrada cuando ya pasó
+    last_day = today - timedelta(days=1)
+    if first_day <= last_day:
+        _fold(pickup, cancellation, first_day, last_day, alpha, horizon)
+        echo(f"  Curvas actualizadas con {(last_day - first_day).days + 1} fechas "
+             f"({first_day.isoformat()} a {last_day.isoformat()})")
+        through = last_day
+    else:
+        through = loaded[2] if loaded else last_day
+        echo("  Curvas al día")
+
+    # Pronóstico: noches en libros hoy + lo que falta por reservar a esa antelación
+    _, booked_kept = _nights_by_lead(today, horizon, horizon)
+    leads = np.arange(horizon)
+    # En libros hoy para la fecha today + L: reservadas con L días o más de antelación
+    otb = _on_the_books(booked_kept)[leads, leads]
+    rooms = _rooms(today, horizon)
+    weekdays = (np.arange(horizon) + today.weekday()) % 7
+    expected_pickup = np.nan_to_num(pickup[weekdays, leads]) * rooms
+    expected_cancellation = np.nan_to_num(cancellation[weekdays, leads])
+    expected = np.clip(otb * (1 - expected_cancellation) + expected_pickup, 0, rooms)
+    occupancy = np.divide(expected, rooms, out=np.zeros(horizon), where=rooms > 0)
+
+    now = datetime.utcnow()
+    db.session.execute(delete(OccupancyForecast).where(OccupancyForecast.stay_date >= today))
+    db.session.execute(OccupancyForecast.__table__.insert(), [
+        {
+            'stay_date': today + timedelta(days=index), 'rooms': int(rooms[index]),
+            'on_the_books': int(otb[index]), 'expected_room_nights': round(float(expected[index]), 2),
+            'expected_occupancy': round(float(occupancy[index]), 4), 'computed_at': now,
+        }
+        for index in range(horizon)
+    ])
+    db.session.execute(delete(PickupCurve))
+    curve_rows = [
+        {
+            'weekday': weekday, 'lead_days': lead, 'updated_through': through,
+            'pickup': float(pickup[weekday, lead]), 'cancellation': float(np.nan_to_num(cancellation[weekday, lead])),
+        }
+        for weekday in range(7) for lead in range(horizon + 1)
+        if not np.isnan(pickup[weekday, lead])
+    ]
+    if curve_rows:
+        db.session.execute(PickupCurve.__table__.insert(), curve_rows)
+    db.session.commit()
+    echo(f"  Pronóstico de {horizon} días desde {today.isoformat()}: "
+         f"ocupación media esperada {occupancy.mean() * 100:.1f}%")
+    return {'through': through, 'days': horizon, 'mean_occupancy': float(occupancy.mean())}
+
+
+def upcoming(start=None, days=None):
+    """Pronóstico guardado desde start (por defecto hoy)."""
+    start = start or date.today()
+    days = days or current_app.config['FORECAST_HORIZON']
+    rows = db.session.execute(
+        select(OccupancyForecast)
+        .where(OccupancyForecast.stay_date >= start, OccupancyForecast.stay_date < start + timedelta(days=days))
+        .order_by(OccupancyForecast.stay_date)
+    ).scalars().all()
+    return [
+        {
+            'date': row.stay_date.isoformat(), 'rooms': row.rooms, 'on_the_books': row.on_the_books,
+            'expected_room_nights': row.expected_room_nights, 'expected_occupancy': row.expected_occupancy,
+        }
+        for row in rows
+    ]
+
+
+def by_week(rows):
+    """Agrupa el pronóstico diario por semana (lunes a domingo)."""
+    weeks = {}
+    for row in rows:
+        day = date.fromisoformat(row['date'])
+        monday = day - timedelta(days=day.weekday())
+        year, number, _ = monday.isocalendar()
+        week = weeks.setdefault(monday, {
+            'start': monday.isoformat(), 'label': f'{year}-S{number:02d}',
+            'rooms': 0, 'on_the_books': 0, 'expected_room_nights': 0.0,
+        })
+        week['rooms'] += row['rooms']
+        week['on_the_books'] += row['on_the_books']
+        week['expected_room_nights'] += row['expected_room_nights']
+    for week in weeks.values():
+        rooms = week['rooms'] or 1
+        week['otb_occupancy'] = round(week['on_the_books'] / rooms, 4)
+        week['expected_occupancy'] = round(week['expected_room_nights'] / rooms, 4)
+    return list(weeks.values())
+
+
+def last_computed():
+    return db.session.execute(select(func.max(OccupancyForecast.computed_at))).scalar()
@@ -0,0 +1,137 @@
+"""
+Eventos de recepción: cambios de estado de habitaciones y reservas.
+
+Los cambios se detectan con eventos de SQLAlchemy durante el flush y se
+publican solo después del commit, junto con un resumen del dashboard
+calculado una vez por cambio (no una vez por pantalla abierta).
+"""
+
+from datetime import datetime
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models.room import Room
+from app.models.reservation import Reservation
+
+STATUS_EVENTS = {
+    'confirmada': 'reservation.confirmed',
+    'confirmed': 'reservation.confirmed',
+    'cancelada': 'reservation.cancelled',
+    'cancelled': 'reservation.cancelled',
+    'completada': 'reservation.checked_out',
+    'en curso': 'reservation.checked_in',
+}
+
+
+def dashboard_summary(connection):
+    """Contadores del dashboard de recepción en tres consultas."""
+    today = datetime.now().date()
+    room_counts = dict(connection.execute(
+        select(Room.status, func.count()).group_by(Room.status)
+    ).all())
+    pending_checkins = connection.execute(
+        select(func.count()).select_from(Reservation).where(
+            Reservation.check_in_date == today,
+            Reservation.status == 'confirmada'
+        )
+    ).scalar()
+    pending_checkouts = connection.execute(
+        select(func.count()).select_from(Reservation).where(
+            Reservation.check_out_date == today,
+            Reservation.checked_in_at.isnot(None),
+            Reservation.checked_out_at.is_(None)
+        )
+    ).scalar()
+    return {
+        'available_rooms': room_counts.get('disponible', 0),
+        'occupied_rooms': room_counts.get('ocupada', 0),
+        'maintenance_rooms': room_counts.get('mantenimiento', 0),
+        'cleaning_rooms': room_counts.get('limpieza', 0),
+        'pending_checkins': pending_checkins,
+        'pending_checkouts': pending_checkouts,
+    }
+
+
+def _reservation_payload(reservation):
+    return {
+        'reservation_id': reservation.id,
+        'room_id': reservation.room_id,
+        'guest_id': reservation.guest_id,
+        'status': reservation.status,
+        'check_in_date': reservation.check_in_date.isoformat() if reservation.check_in_date else None,
+        'check_out_date': reservation.check_out_date.isoformat() if reservation.check_out_date else None,
+    }
+
+
+def _changed(target, name):
+    return inspect(target).attrs[name].history.has_changes()
+
+
+def _queue(target, event_data):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault('frontdesk_events', []).append(event_data)
+
+
+def _room_inserted(mapper, connection, room):
+    _queue(room, {'type': 'room.status', 'room_id': room.id, 'number': room.number,
+                  'old_status': None, 'status': room.status})
+
+
+def _room_updated(mapper, connection, room):
+    if not _changed(room, 'status'):
+        return
+    old = inspect(room).attrs.status.history.deleted
+    _queue(room, {'type': 'room.status', 'room_id': room.id, 'number': room.number,
+                  'old_status': old[0] if old else None, 'status': room.status})
+
+
+def _room_deleted(mapper, connection, room):
+    _queue(room, {'type': 'room.status', 'room_id': room.id, 'number': room.number,
+                  'old_status': room.status, 'status': None})
+
+
+def _reservation_inserted(mapper, connection, reservation):
+    event_type = 'reservation.checked_in' if reservation.checked_in_at else 'reservation.created'
+    _queue(reservation, {'type': event_type, **_reservation_payload(reservation)})
+
+
+def _reservation_updated(mapper, connection, reservation):
+    if _changed(reservation, 'checked_out_at') and reservation.checked_out_at:
+        event_type = 'reservation.checked_out'
+    elif _changed(reservation, 'checked_in_at') and reservation.checked_in_at:
+        event_type = 'reservation.checked_in'
+    elif _changed(reservation, 'status'):
+        event_type = STATUS_EVENTS.get(reservation.status, 'reservation.updated')
+    else:
+        return
+    _queue(reservation, {'type': event_type, **_reservation_payload(reservation)})
+
+
+def track_frontdesk_events(broker):
+    """Conecta los modelos al broker de eventos (llamar una vez en create_app)."""
+    if getattr(broker, '_frontdesk_tracked', False):
+        return
+    broker._frontdesk_tracked = True
+
+    event.listen(Room, 'after_insert', _room_inserted)
+    event.listen(Room, 'after_update', _room_updated)
+    event.listen(Room, 'after_delete', _room_deleted)
+    event.listen(Reservation, 'after_insert', _reservation_inserted)
+    event.listen(Reservation, 'after_update', _reservation_updated)
+
+    @event.listens_for(Session, 'after_commit')
+    def publish(session):
+        pending = session.info.pop('frontdesk_events', None)
+        # Sin pantallas conectadas en ningún worker no se calcula el resumen
+        if not pending or not broker.has_listeners():
+            return
+        with db.engine.connect() as connection:
+            summary = dashboard_summary(connection)
+        broker.publish([{**item, 'summary': summary} for item in pending])
+
+    @event.listens_for(Session, 'after_rollback')
+    def discard(session):
+        session.info.pop('frontdesk_events', None)
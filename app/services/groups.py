@@ -0,0 +1,199 @@
+"""
+Reservas de grupo: varias habitaciones en las mismas fechas, todo o nada.
+
+Cada operación corre en una sola transacción y empieza bloqueando las
+habitaciones del grupo siempre en orden de id (SELECT ... ORDER BY id FOR
+UPDATE). Dos grupos que compiten por habitaciones en común esperan en el
+mismo orden, así que uno espera al otro en vez de quedar bloqueados
+mutuamente; el segundo ve las reservas del primero y falla completo, sin
+dejar reservas sueltas (ver availability.lock_rooms).
+
+Las reservas se crean con el ORM (son pocas filas), así que la caché de
+disponibilidad y los eventos de recepción se actualizan solos al confirmar.
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import select
+
+from app import db
+from app.models.group import ReservationGroup
+from app.models.reservation import Reservation
+from app.models.room import Room
+from app.services import pricing
+from app.services.availability import lock_rooms
+from app.services.housekeeping import open_task
+from app.services.waitlist import offer_released
+
+
+class GroupBookingError(ValueError):
+    """La operación de grupo no se puede hacer; no se guardó nada."""
+
+
+def _fail(message):
+    db.session.rollback()
+    raise GroupBookingError(message)
+
+
+def book_group(name, organizer_id, room_ids, check_in, check_out, guests_per_room=1,
+               special_requests=None, confirm=False, user=None):
+    """
+    Reserva todas las habitaciones de room_ids entre check_in y check_out.
+    `guests_per_room` es un número o {room_id: huéspedes}. Si alguna
+    habitación no se puede reservar no se crea nada y se lanza
+    GroupBookingError con el motivo.
+    """
+    room_ids = sorted({int(room_id) for room_id in room_ids})
+    if not room_ids:
+        raise GroupBookingError("Seleccione al menos una habitación.")
+    if check_out <= check_in:
+        raise GroupBookingError("La fecha de salida debe ser posterior a la de llegada.")
+    if check_in < date.today():
+        raise GroupBookingError("La fecha de llegada no puede ser anterior a hoy.")
+
+    rooms = lock_rooms(room_ids)
+    if len(rooms) != len(room_ids):
+        _fail("Alguna de las habitaciones seleccionadas ya no existe.")
+    blocked = [room.number for room in rooms if room.status == 'mantenimiento']
+    if blocked:
+        _fail(f"Habitaciones en mantenimiento: {', '.join(blocked)}.")
+
+    guests = {room.id: guests_per_room.get(room.id, 1) if isinstance(guests_per_room, dict) else guests_per_room
+              for room in rooms}
+    too_small = [room.number for room in rooms if guests[room.id] > (room.max_occupancy or 2)]
+    if too_small:
+        _fail(f"Superan la capacidad: habitaciones {', '.join(too_small)}.")
+
+    # Con las habitaciones bloqueadas nadie más puede reservarlas mientras se revisa
+    taken = db.session.execute(
+        select(Room.number).join(Reservation, Reservation.room_id == Room.id).where(
+            Reservation.room_id.in_(room_ids),
+            Reservation.status.in_(Reservation.ACTIVE_STATUSES),
+            Reservation.check_in_date < check_out,
+            Reservation.check_out_date > check_in
+        ).distinct().order_by(Room.number)
+    ).scalars().all()
+    if taken:
+        _fail(f"Ya están reservadas en esas fechas: habitaciones {', '.join(taken)}.")
+
+    _, _, totals = pricing.calendar().totals(
+        [room.type for room in rooms], [room.price for room in rooms], check_in, check_out
+    )
+    now = datetime.utcnow()
+    group = ReservationGroup(name=name, organizer_id=organizer_id, check_in_date=check_in,
+                             check_out_date=check_out, notes=special_requests,
+                             created_by_id=user.id if user is not None else None)
+    db.session.add(group)
+    for room, total in zip(rooms, totals.tolist()):
+        db.session.add(Reservation(
+            group=group, guest_id=organizer_id, room_id=room.id,
+            check_in_date=check_in, check_out_date=check_out,
+            guests_count=guests[room.id], total_price=total, special_requests=special_requests,
+            status='confirmada' if confirm else 'pendiente',
+            confirmed_at=now if confirm else None,
+            confirmed_by_id=user.id if confirm and user is not None else None
+        ))
+    db.session.commit()
+    return group
+
+
+# -------------------------
+# Operaciones sobre el grupo
+# -------------------------
+def _locked_group(group_id):
+    """Grupo con sus habitaciones bloqueadas (mismo orden que al reservar)."""
+    group = db.session.get(ReservationGroup, group_id)
+    if group is None:
+        raise GroupBookingError("El grupo no existe.")
+    lock_rooms([r.room_id for r in group.reservations])
+    # Lo leído antes del bloqueo puede estar viejo: se vuelve a cargar
+    db.session.expire_all()
+    return db.session.get(ReservationGroup, group_id)
+
+
+def confirm_group(group_id, user=None):
+    """Confirma las reservas pendientes del grupo. Devuelve cuántas confirmó."""
+    group = _locked_group(group_id)
+    now, count = datetime.utcnow(), 0
+    for reservation in group.reservations:
+        if reservation.status in ('pendiente', 'pending'):
+            reservation.status = 'confirmada'
+            reservation.confirmed_at = now
+            reservation.confirmed_by_id = user.id if user is not None else None
+            count += 1
+    if not count:
+        _fail("El grupo no tiene reservas pendientes de confirmar.")
+    db.session.commit()
+    return count
+
+
+def check_in_group(group_id, today=None):
+    """
+    Check-in de todas las habitaciones confirmadas del grupo que llegan hoy
+    o antes. Devuelve cuántas registró.
+    """
+    today = today or date.today()
+    group = _locked_group(group_id)
+    arriving = [r for r in group.reservations if r.can_check_in() and r.check_in_date <= today]
+    if not arriving:
+        _fail("No hay habitaciones del grupo listas para check-in (deben estar confirmadas y llegar hoy).")
+    now = datetime.utcnow()
+    for reservation in arriving:
+        reservation.checked_in_at = now
+        reservation.status = 'en curso'
+        reservation.room.status = 'ocupada'
+    db.session.commit()
+    return len(arriving)
+
+
+def check_out_group(group_id):
+    """Check-out de todas las habitaciones alojadas del grupo. Devuelve cuántas registró."""
+    group = _locked_group(group_id)
+    leaving = [r for r in group.reservations if r.can_check_out()]
+    if not leaving:
+        _fail("No hay habitaciones del grupo con check-in pendiente de salida.")
+    now = datetime.utcnow()
+    for reservation in leaving:
+        reservation.checked_out_at = now
+        reservation.status = 'completada'
+        open_task(reservation.room, reservation)
+    db.session.commit()
+    return len(leaving)
+
+
+def cancel_group(group_id):
+    """Cancela las reservas del grupo que todavía no tienen check-in."""
+    group = _locked_group(group_id)
+    cancellable = [r for r in group.reservations
+                   if r.status in Reservation.ACTIVE_STATUSES and not r.checked_in_at]
+    if not cancellable:
+        _fail("El grupo no tiene reservas que se puedan cancelar.")
+    for reservation in cancellable:
+        reservation.status = 'cancelada'
+    db.session.commit()
+    for reservation in cancellable:
+        offer_released(reservation)
+    return len(cancellable)
+
+
+# -------------------------
+# Factura
+# -------------------------
+def invoice(group):
+    """Líneas de la factura del grupo (una por habitación no cancelada) y totales."""
+    lines = [
+        {
+            'reservation_id': r.id,
+            'room': r.room.number,
+            'type': r.room.get_type_display(),
+            'guests': r.guests_count,
+            'nights': r.get_nights_count(),
+            'total': r.total_price,
+            'paid': bool(r.payment_type),
+            'payment': r.payment_type or '',
+        }
+        for r in group.active_reservations()
+    ]
+    total = round(sum(line['total'] for line in lines), 2)
+    paid = round(sum(line['total'] for line in lines if line['paid']), 2)
+    return {'lines': lines, 'total': total, 'paid': paid, 'balance': round(total - paid, 2)}
@@ -0,0 +1,204 @@
+"""
+Cola de limpieza (housekeeping).
+
+Cada check-out deja la habitación en 'limpieza' y abre una tarea. La cola se
+ordena primero por las habitaciones con una llegada hoy, porque ese huésped
+necesita la habitación lista, y después por antigüedad.
+
+Tomar la siguiente tarea usa SELECT ... FOR UPDATE SKIP LOCKED: si dos
+personas piden "siguiente" a la vez, cada una recibe una tarea distinta sin
+esperar a la otra. El UPDATE que la asigna además exige que siga pendiente.
+Eso protege también en SQLite, que ignora FOR UPDATE. Si otra persona la
+ganó, se prueba con la siguiente.
+
+Terminar una tarea la cierra y devuelve la habitación a 'disponible' en la
+misma transacción. Ambos UPDATE son condicionales: si la habitación ya no
+está en limpieza (p. ej. pasó a mantenimiento), no se toca. Como son UPDATE
+directos, al final se invalida la caché del catálogo y se avisa a recepción.
+
+Si administración saca una habitación de limpieza a mano (mantenimiento,
+disponible...), su tarea abierta se cancela en la misma transacción para que
+no quede en la cola.
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import case, exists, insert, literal, select, update
+from sqlalchemy.orm import joinedload
+
+from app import db, events, page_cache
+from app.models.housekeeping import HousekeepingTask
+from app.models.reservation import Reservation
+from app.models.room import Room
+from app.services.frontdesk import dashboard_summary
+
+# Reservas que todavía van a llegar (sin check-in)
+ARRIVAL_STATUSES = ('pendiente', 'pending', 'confirmada', 'confirmed')
+# Intentos de "tomar siguiente" cuando otra persona gana la misma tarea
+CLAIM_ATTEMPTS = 5
+
+
+def _arriving_today(today):
+    return exists().where(
+        Reservation.room_id == HousekeepingTask.room_id,
+        Reservation.check_in_date == today,
+        Reservation.status.in_(ARRIVAL_STATUSES),
+        Reservation.checked_in_at.is_(None),
+    )
+
+
+def _queue_order(today):
+    return case((_arriving_today(today), 0), else_=1), HousekeepingTask.created_at, HousekeepingTask.id
+
+
+# -------------------------
+# Creación
+# -------------------------
+def open_task(room, reservation=None):
+    """Deja la habitación en limpieza y abre su tarea si no tiene una abierta. No hace commit."""
+    room.status = 'limpieza'
+    already_open = db.session.execute(
+        select(HousekeepingTask.id).where(
+            HousekeepingTask.room_id == room.id, HousekeepingTask.status.in_(HousekeepingTask.OPEN_STATUSES)
+        ).limit(1)
+    ).scalar()
+    if already_open is None:
+        db.session.add(HousekeepingTask(room=room, reservation=reservation))
+
+
+def open_missing_tasks():
+    """
+    Abre en un solo INSERT ... SELECT las tareas de las habitaciones en
+    limpieza que no tienen una (p. ej. tras la auditoría nocturna). No hace commit.
+    """
+    open_task_exists = exists().where(
+        HousekeepingTask.room_id == Room.id, HousekeepingTask.status.in_(HousekeepingTask.OPEN_STATUSES)
+    )
+    rooms = select(Room.id, literal(HousekeepingTask.PENDING), literal(datetime.utcnow())).where(
+        Room.status == 'limpieza', ~open_task_exists
+    )
+    return db.session.execute(
+        insert(HousekeepingTask).from_select(['room_id', 'status', 'created_at'], rooms)
+    ).rowcount
+
+
+def close_stale_tasks(room_ids=None):
+    """
+    Cancela en un solo UPDATE las tareas abiertas de habitaciones que ya no
+    están en limpieza (solo entre `room_ids` si se indica). No hace commit.
+    """
+    stale_rooms = select(Room.id).where(Room.status != 'limpieza')
+    if room_ids is not None:
+        stale_rooms = stale_rooms.where(Room.id.in_(room_ids))
+    return db.session.execute(
+        update(HousekeepingTask)
+        .where(HousekeepingTask.status.in_(HousekeepingTask.OPEN_STATUSES), HousekeepingTask.room_id.in_(stale_rooms))
+        .values(status=HousekeepingTask.CANCELLED, completed_at=datetime.utcnow()),
+        execution_options={'synchronize_session': False}
+    ).rowcount
+
+
+# -------------------------
+# Cola
+# -------------------------
+def queue(today=None):
+    """Tareas abiertas en orden de prioridad, con la marca de llegada hoy."""
+    today = today or date.today()
+    arriving = _arriving_today(today).label('arriving_today')
+    rows = db.session.execute(
+        select(HousekeepingTask, arriving)
+        .where(HousekeepingTask.status.in_(HousekeepingTask.OPEN_STATUSES))
+        .options(joinedload(HousekeepingTask.room), joinedload(HousekeepingTask.claimed_by))
+        .order_by(*_queue_order(today))
+    ).all()
+    return [{'task': task, 'arriving_today': bool(arriving_today)} for task, arriving_today in rows]
+
+
+def completed_today(today=None):
+    today = today or date.today()
+    return HousekeepingTask.query.filter(
+        HousekeepingTask.status == HousekeepingTask.DONE,
+        HousekeepingTask.completed_at >= datetime.combine(today, datetime.min.time())
+    ).count()
+
+
+# -------------------------
+# Tomar, liberar, terminar
+# -------------------------
+def claim(task_id, user):
+    """Asigna la tarea si sigue pendiente. Devuelve True si quedó para `user`."""
+    result = db.session.execute(
+        update(HousekeepingTask)
+        .where(HousekeepingTask.id == task_id, HousekeepingTask.status == HousekeepingTask.PENDING)
+        .values(status=HousekeepingTask.IN_PROGRESS, claimed_by_id=user.id, claimed_at=datetime.utcnow()),
+        execution_options={'synchronize_session': False}
+    )
+    db.session.commit()
+    return result.rowcount == 1
+
+
+def claim_next(user, today=None):
+    """Toma la tarea pendiente de mayor prioridad que nadie más está tomando. None si no hay."""
+    today = today or date.today()
+    for _ in range(CLAIM_ATTEMPTS):
+        task_id = db.session.execute(
+            select(HousekeepingTask.id)
+            .where(HousekeepingTask.status == HousekeepingTask.PENDING)
+            .order_by(*_queue_order(today))
+            .limit(1)
+            .with_for_update(skip_locked=True, of=HousekeepingTask)
+        ).scalar()
+        if task_id is None:
+            db.session.rollback()
+            return None
+        if claim(task_id, user):
+            return db.session.get(HousekeepingTask, task_id)
+    return None
+
+
+def release(task_id, user):
+    """Devuelve a la cola una tarea en proceso de `user` (el personal de recepción puede liberar cualquiera)."""
+    condition = [HousekeepingTask.id == task_id, HousekeepingTask.status == HousekeepingTask.IN_PROGRESS]
+    if user.is_housekeeping():
+        condition.append(HousekeepingTask.claimed_by_id == user.id)
+    result = db.session.execute(
+        update(HousekeepingTask).where(*condition)
+        .values(status=HousekeepingTask.PENDING, claimed_by_id=None, claimed_at=None),
+        execution_options={'synchronize_session': False}
+    )
+    db.session.commit()
+    return result.rowcount == 1
+
+
+def complete(task_id, user):
+    """
+    Cierra la tarea de `user` y deja la habitación disponible en la misma
+    transacción. Devuelve la habitación, o None si la tarea no estaba en
+    proceso a su nombre.
+    """
+    now = datetime.utcnow()
+    done = db.session.execute(
+        update(HousekeepingTask)
+        .where(HousekeepingTask.id == task_id, HousekeepingTask.status == HousekeepingTask.IN_PROGRESS,
+               HousekeepingTask.claimed_by_id == user.id)
+        .values(status=HousekeepingTask.DONE, completed_at=now),
+        execution_options={'synchronize_session': False}
+    )
+    if done.rowcount != 1:
+        db.session.rollback()
+        return None
+    room_id = select(HousekeepingTask.room_id).where(HousekeepingTask.id == task_id).scalar_subquery()
+    ready = db.session.execute(
+        update(Room).where(Room.id == room_id, Room.status == 'limpieza').values(status='disponible'),
+        execution_options={'synchronize_session': False}
+    ).rowcount
+    db.session.commit()
+
+    task = db.session.get(HousekeepingTask, task_id)
+    if ready:
+        page_cache.bump('catalog')
+        with db.engine.connect() as connection:
+            summary = dashboard_summary(connection)
+        events.publish([{'type': 'room.status', 'room_id': task.room.id, 'number': task.room.number,
+                         'old_status': 'limpieza', 'status': 'disponible', 'summary': summary}])
+    return task.room
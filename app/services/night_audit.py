@@ -0,0 +1,166 @@
+"""
+Auditoría nocturna: cierre del día hotelero (flask night-audit).
+
+Al cerrar el día D:
+- Estadías vencidas: con check-in hecho, sin check-out y salida <= D pasan a
+  'completada' (check-out automático).
+- No presentados: confirmadas sin check-in con llegada <= D.
+- Pendientes vencidas: sin confirmar con llegada <= D, o creadas hace más
+  de NIGHT_AUDIT_PENDING_DAYS días, pasan a 'expirada'.
+- Habitaciones 'ocupada' sin nadie alojado quedan en 'limpieza', con su
+  tarea en la cola de housekeeping.
+- Se guarda un resumen en `night_audit`, y el día abierto pasa a D + 1.
+
+Cada barrido es un solo UPDATE sobre todo el conjunto, sin cargar filas en
+Python ni pasar por el ORM. Todos filtran por estados abiertos y usan el
+índice (status, check_in_date), así que el costo depende de las reservas
+abiertas y no del historial. Como no se disparan los eventos del ORM, al
+final se invalida a mano la caché de páginas y se recargan las pantallas de
+recepción.
+"""
+
+import json
+import time as clock
+from datetime import date, datetime, time, timedelta
+
+from flask import current_app
+from sqlalchemy import and_, func, or_, select, update
+
+from app import db, events, page_cache
+from app.models.night_audit import NightAudit
+from app.models.reservation import Reservation
+from app.models.room import Room
+from app.services.housekeeping import open_missing_tasks
+
+
+def business_date():
+    """Día hotelero abierto: el siguiente al último cerrado (ayer si nunca hubo auditoría)."""
+    last = db.session.execute(select(func.max(NightAudit.business_date))).scalar()
+    return last + timedelta(days=1) if last else date.today() - timedelta(days=1)
+
+
+def _in_house(day):
+    """Estadías con el huésped alojado al cierre de `day` (check-in hecho, sin check-out)."""
+    # Estado + llegada recorren solo un rango del índice (status, check_in_date):
+    # ni el historial cerrado ni las reservas futuras
+    return and_(
+        Reservation.status.in_(Reservation.ACTIVE_STATUSES),
+        Reservation.check_in_date <= day,
+        or_(Reservation.checked_in_at.isnot(None), Reservation.status == 'en curso'),
+        Reservation.checked_out_at.is_(None),
+    )
+
+
+def _sweeps(day, now, pending_days):
+    """(nombre, condición, valores) de cada barrido sobre reservas."""
+    created_before = datetime.combine(day + timedelta(days=1), time.min) - timedelta(days=pending_days)
+    return [
+        ('completed', and_(_in_house(day), Reservation.check_out_date <= day),
+         {'status': 'completada', 'checked_out_at': now}),
+        ('no_shows', and_(Reservation.status.in_(('confirmada', 'confirmed')),
+                          Reservation.checked_in_at.is_(None),
+                          Reservation.check_in_date <= day),
+         {'status': Reservation.NO_SHOW_STATUS, 'cancelled_at': now}),
+        ('expired', and_(Reservation.status.in_(('pendiente', 'pending')),
+                         or_(Reservation.check_in_date <= day, Reservation.created_at < created_before)),
+         {'status': Reservation.EXPIRED_STATUS, 'cancelled_at': now}),
+    ]
+
+
+def _report(day, counts):
+    """Resumen del día cerrado y de lo que viene mañana (consultas agregadas)."""
+    tomorrow = day + timedelta(days=1)
+    rooms = dict(db.session.execute(select(Room.status, func.count()).group_by(Room.status)).all())
+    total_rooms = sum(rooms.values())
+    # Estadías de la noche D: a lo sumo una por habitación
+    night = db.session.execute(
+        select(Reservation.total_price, Reservation.check_in_date, Reservation.check_out_date).where(
+            Reservation.check_in_date <= day, Reservation.check_out_date > day,
+            Reservation.status.notin_(Reservation.RELEASED_STATUSES)
+        )
+    ).all()
+    revenue = sum(total / max((check_out - check_in).days, 1) for total, check_in, check_out in night)
+    active = Reservation.status.in_(Reservation.ACTIVE_STATUSES)
+    arrivals = db.session.execute(
+        select(func.count()).where(Reservation.check_in_date == tomorrow, active, Reservation.checked_in_at.is_(None))
+    ).scalar()
+    departures = db.session.execute(
+        select(func.count()).where(Reservation.check_out_date == tomorrow, _in_house(day))
+    ).scalar()
+    in_house = db.session.execute(select(func.count()).where(_in_house(date.today()))).scalar()
+    return {
+        'business_date': day.isoformat(),
+        **counts,
+        'rooms': rooms,
+        'room_nights': len(night),
+        'occupancy': round(len(night) / total_rooms, 4) if total_rooms else 0.0,
+        'revenue': round(revenue, 2),
+        'adr': round(revenue / len(night), 2) if night else 0.0,
+        'in_house': in_house,
+        'arrivals_tomorrow': arrivals,
+        'departures_tomorrow': departures,
+    }
+
+
+def run(day=None, force=False, dry_run=False):
+    """
+    Cierra el día hotelero `day` (por defecto el día abierto, si ya terminó) y
+    devuelve el resumen. Con dry_run se calcula todo y se deshace al final.
+    """
+    started = clock.perf_counter()
+    now = datetime.utcnow()
+    if day is None:
+        # Sin fecha explícita solo se cierran días ya terminados
+        day = business_date()
+        if day >= date.today():
+            raise ValueError(f"No hay días pendientes de cierre (día abierto: {day.isoformat()})")
+    if day > date.today():
+        raise ValueError(f"No se puede cerrar un día futuro ({day.isoformat()})")
+    if not force and db.session.get(NightAudit, day) is not None:
+        raise ValueError(f"El día {day.isoformat()} ya está cerrado (usar --force para repetir)")
+
+    counts, guests = {}, set()
+    for name, condition, values in _sweeps(day, now, current_app.config['NIGHT_AUDIT_PENDING_DAYS']):
+        guests.update(db.session.execute(select(Reservation.guest_id).where(condition).distinct()).scalars())
+        result = db.session.execute(
+            update(Reservation).where(condition).values(**values),
+            execution_options={'synchronize_session': False}
+        )
+        counts[name] = result.rowcount
+
+    # Habitaciones marcadas ocupadas sin nadie alojado (check-outs automáticos
+    # de arriba y reservas que dejaron la habitación ocupada sin check-in).
+    # Cuenta también a quien ya hizo check-in hoy, antes de la auditoría.
+    occupied = select(Reservation.room_id).where(_in_house(date.today()))
+    counts['rooms_released'] = db.session.execute(
+        update(Room).where(Room.status == 'ocupada', Room.id.notin_(occupied)).values(status='limpieza'),
+        execution_options={'synchronize_session': False}
+    ).rowcount
+    counts['housekeeping_tasks'] = open_missing_tasks()
+
+    report = _report(day, counts)
+    report['duration_ms'] = round((clock.perf_counter() - started) * 1000)
+    if dry_run:
+        db.session.rollback()
+        return report
+
+    audit = db.session.get(NightAudit, day) or NightAudit(business_date=day)
+    audit.started_at = now
+    audit.duration_ms = report['duration_ms']
+    audit.no_shows = counts['no_shows']
+    audit.completed = counts['completed']
+    audit.expired = counts['expired']
+    audit.rooms_released = counts['rooms_released']
+    audit.report = json.dumps(report, ensure_ascii=False)
+    db.session.add(audit)
+    db.session.commit()
+
+    # Los UPDATE masivos no pasan por los eventos del ORM
+    page_cache.bump('availability')
+    if counts['rooms_released']:
+        page_cache.bump('catalog')
+    for guest_id in guests:
+        page_cache.bump(f'reservations:{guest_id}')
+    # Las listas de llegadas y salidas cambiaron en bloque: recepción recarga
+    events.publish([{'type': 'reload', 'reason': 'night_audit', 'business_date': day.isoformat()}])
+    return report
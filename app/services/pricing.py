@@ -0,0 +1,291 @@
+"""
+Tarifas dinámicas por fecha.
+
+Precio de una noche = tarifa base de la habitación (Room.price) × factor de
+temporada × factor del día de la semana. Sobre el total de la estadía se
+aplica un descuento por duración (PRICING_LOS_DISCOUNTS).
+
+Con PRICING_DEMAND_FACTORS la noche se multiplica además por un factor de
+demanda según la ocupación prevista de esa fecha (app/services/forecast.py,
+recalculado cada noche).
+
+Los factores se materializan en un calendario de tarifas: una fila por tipo
+de habitación y una columna por día, guardado como sumas acumuladas. El
+factor total de una estadía es entonces cum[fila, salida] - cum[fila, llegada].
+Cotizar muchas habitaciones (o muchas estadías) es una sola operación
+vectorizada con numpy.
+
+El calendario depende de la configuración (PRICING_*) y, con factores de
+demanda, del último pronóstico guardado. Se construye una vez por proceso, en
+la primera cotización, para PAST_DAYS hacia atrás y FUTURE_DAYS hacia
+adelante, y se rehace si aparece un pronóstico nuevo. Una fecha fuera de ese
+rango se cotiza con una tabla temporal solo para esas noches: el calendario
+en caché no crece con lo que pida cada petición. numpy se importa en ese
+momento y no al arrancar el worker.
+
+Las reservas solo se aceptan con salida hasta booking_horizon() (API,
+formularios e importación).
+"""
+
+import hashlib
+import json
+import threading
+import time
+from datetime import date, timedelta
+
+from flask import current_app
+
+WEEKDAYS = ('lun', 'mar', 'mie', 'jue', 'vie', 'sab', 'dom')
+# Rango del calendario en caché alrededor de hoy (días); FUTURE_DAYS es también
+# hasta dónde se aceptan reservas
+PAST_DAYS = 365
+FUTURE_DAYS = 730
+# Cada cuánto se mira si hay un pronóstico de ocupación nuevo (segundos)
+DEMAND_REFRESH_SECONDS = 300
+
+
+def booking_horizon(today=None):
+    """Última fecha de salida que se acepta al reservar o cotizar."""
+    return (today or date.today()) + timedelta(days=FUTURE_DAYS)
+
+
+def _month_day(value):
+    """'12-15' -> 1215 (mes * 100 + día)."""
+    try:
+        month, day = (int(part) for part in value.split('-'))
+        date(2000, month, day)  # año bisiesto: acepta 02-29
+    except (AttributeError, ValueError):
+        raise ValueError(f"Fecha de temporada inválida: {value!r} (formato MM-DD)")
+    return month * 100 + day
+
+
+class RateCalendar:
+    """Calendario de factores por tipo de habitación y día."""
+
+    def __init__(self, weekday_factors=None, seasons=None, los_discounts=None, demand_factors=None, enabled=True):
+        weekday_factors = weekday_factors or {}
+        unknown = set(weekday_factors) - set(WEEKDAYS)
+        if unknown:
+            raise ValueError(f"Días desconocidos en PRICING_WEEKDAY_FACTORS: {', '.join(sorted(unknown))}")
+
+        self.enabled = enabled
+        self.weekday_factors = [float(weekday_factors.get(day, 1.0)) for day in WEEKDAYS]
+        self.seasons = []
+        for season in seasons or []:
+            self.seasons.append({
+                'name': season.get('name', ''),
+                'start': _month_day(season['start']),
+                'end': _month_day(season['end']),
+                'factor': float(season['factor']),
+                'types': tuple(season.get('types') or ()),
+            })
+        # [(noches mínimas, descuento)] de mayor a menor
+        self.los_discounts = sorted(
+            ((int(nights), float(discount)) for nights, discount in (los_discounts or {}).items()), reverse=True
+        )
+        if any(not 0 <= discount < 1 for _, discount in self.los_discounts):
+            raise ValueError("Los descuentos por duración deben estar entre 0 y 1")
+        # [(ocupación prevista mínima, factor)] de menor a mayor
+        self.demand_factors = sorted(
+            (float(occupancy), float(factor)) for occupancy, factor in (demand_factors or {}).items()
+        )
+
+        # Fila 0: tipos sin temporadas propias; luego una por tipo nombrado
+        named = sorted({room_type for season in self.seasons for room_type in season['types']})
+        self.rows = {room_type: index for index, room_type in enumerate(named, start=1)}
+
+        rules = [self.enabled, self.weekday_factors, self.seasons, self.los_discounts, self.demand_factors]
+        self.rules_version = hashlib.sha1(json.dumps(rules, sort_keys=True).encode()).hexdigest()[:8]
+
+        self._lock = threading.Lock()
+        self._table = None  # (primer día, sumas acumuladas [filas, días + 1], pronóstico usado)
+        self._forecast = (None, float('-inf'))  # (computed_at del pronóstico, cuándo se miró)
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            weekday_factors=config['PRICING_WEEKDAY_FACTORS'],
+            seasons=config['PRICING_SEASONS'],
+            los_discounts=config['PRICING_LOS_DISCOUNTS'],
+            demand_factors=config['PRICING_DEMAND_FACTORS'],
+            enabled=config['PRICING_ENABLED'],
+        )
+
+    @property
+    def version(self):
+        """Cambia con las reglas y, si hay factores de demanda, con cada pronóstico nuevo."""
+        stamp = self._forecast_stamp()
+        return f"{self.rules_version}-{stamp:%Y%m%d%H%M%S}" if stamp else self.rules_version
+
+    def _forecast_stamp(self):
+        if not (self.enabled and self.demand_factors):
+            return None
+        stamp, checked = self._forecast
+        if time.monotonic() - checked > DEMAND_REFRESH_SECONDS:
+            from app.services.forecast import last_computed
+            stamp = last_computed()
+            self._forecast = (stamp, time.monotonic())
+        return stamp
+
+    # -------------------------
+    # Construcción
+    # -------------------------
+    def _demand(self, start, end):
+        """Factor de demanda por día según el pronóstico guardado (1 sin pronóstico)."""
+        import numpy as np
+        from app.services.forecast import upcoming
+
+        demand = np.ones((end - start).days)
+        for row in upcoming(start, (end - start).days):
+            occupancy = row['expected_occupancy']
+            index = (date.fromisoformat(row['date']) - start).days
+            for minimum, factor in self.demand_factors:
+                if occupancy >= minimum:
+                    demand[index] = factor
+        return demand
+
+    def _build(self, start, end, stamp=None):
+        import numpy as np
+
+        days = np.arange(np.datetime64(start, 'D'), np.datetime64(end, 'D'))
+        factors = np.ones((len(self.rows) + 1, len(days)))
+        if self.enabled:
+            # 1970-01-01 fue jueves (3 con lunes = 0)
+            weekday = (days.astype('int64') + 3) % 7
+            factors *= np.asarray(self.weekday_factors)[weekday]
+            months = days.astype('datetime64[M]')
+            month_day = (months.astype('int64') % 12 + 1) * 100 + (days - months).astype('int64') + 1
+            for season in self.seasons:
+                if season['start'] <= season['end']:
+                    mask = (month_day >= season['start']) & (month_day <= season['end'])
+                else:  # cruza el fin de año (p. ej. 12-15 a 01-15)
+                    mask = (month_day >= season['start']) | (month_day <= season['end'])
+                rows = [0] + list(self.rows.values()) if not season['types'] else \
+                    [self.rows[room_type] for room_type in season['types']]
+                for row in rows:
+                    factors[row, mask] *= season['factor']
+            if stamp is not None:
+                factors *= self._demand(start, end)
+
+        cumulative = np.zeros((factors.shape[0], len(days) + 1))
+        np.cumsum(factors, axis=1, out=cumulative[:, 1:])
+        return start, cumulative, stamp
+
+    def _covering(self, first, last):
+        """
+        Tabla que cubre las noches first..last (incl.): la de caché si están
+        dentro de la ventana alrededor de hoy, si no una temporal solo para ellas.
+        """
+        stamp = self._forecast_stamp()
+        table = self._table
+        if table is not None:
+            start, cumulative, built_with = table
+            if built_with == stamp and start <= first and (last - start).days < cumulative.shape[1] - 1:
+                return table
+        today = date.today()
+        start, end = today - timedelta(days=PAST_DAYS), today + timedelta(days=FUTURE_DAYS)
+        if first < start or last >= end:
+            return self._build(first, last + timedelta(days=1), stamp)
+        with self._lock:
+            self._table = table = self._build(start, end, stamp)
+        return table
+
+    # -------------------------
+    # Cotización
+    # -------------------------
+    def row(self, room_type):
+        return self.rows.get(room_type, 0)
+
+    def discount_for(self, nights):
+        if self.enabled:
+            for minimum, discount in self.los_discounts:
+                if nights >= minimum:
+                    return discount
+        return 0.0
+
+    def totals(self, room_types, base_rates, check_ins, check_outs):
+        """
+        Cotiza estadías en bloque. check_ins/check_outs pueden ser una fecha
+        (la misma estadía para todas las habitaciones) o una secuencia.
+        Devuelve (subtotales, descuentos, totales) como arreglos de numpy.
+        """
+        import numpy as np
+
+        check_ins = [check_ins] if isinstance(check_ins, date) else list(check_ins)
+        check_outs = [check_outs] if isinstance(check_outs, date) else list(check_outs)
+        first = min(check_ins)
+        last = max(check_outs) - timedelta(days=1)
+        start, cumulative, _ = self._covering(first, max(last, first))
+
+        rows = np.fromiter((self.row(room_type) for room_type in room_types), dtype=np.intp)
+        rates = np.asarray(base_rates, dtype=float)
+        arrivals = np.array([(day - start).days for day in check_ins])
+        departures = np.array([(day - start).days for day in check_outs])
+        nights = np.maximum(departures - arrivals, 0)
+        departures = arrivals + nights
+
+        factors = cumulative[rows, departures] - cumulative[rows, arrivals]
+        discount_rates = np.array([self.discount_for(n) for n in np.atleast_1d(nights).tolist()])
+        subtotals = np.round(rates * factors, 2)
+        discounts = np.round(subtotals * discount_rates, 2)
+        return subtotals, discounts, subtotals - discounts
+
+    def nightly(self, room_type, base_rate, check_in, check_out):
+        """[(fecha, precio)] noche por noche, sin descuento por duración."""
+        nights = (check_out - check_in).days
+        if nights <= 0:
+            return []
+        start, cumulative, _ = self._covering(check_in, check_out - timedelta(days=1))
+        offset, row = (check_in - start).days, self.row(room_type)
+        factors = cumulative[row, offset + 1:offset + nights + 1] - cumulative[row, offset:offset + nights]
+        return [(check_in + timedelta(days=i), round(base_rate * float(f), 2)) for i, f in enumerate(factors)]
+
+
+# -------------------------
+# Acceso desde la app
+# -------------------------
+def init_pricing(app):
+    """Valida las reglas PRICING_* y deja el calendario en app.extensions."""
+    app.extensions['pricing'] = RateCalendar.from_config(app.config)
+
+
+def calendar():
+    return current_app.extensions['pricing']
+
+
+def stay_total(room, check_in, check_out):
+    """Total a guardar en Reservation.total_price."""
+    _, _, totals = calendar().totals([room.type], [room.price], check_in, check_out)
+    return float(totals[0])
+
+
+def quote_many(rooms, check_in, check_out):
+    """Cotización de la misma estadía para varias habitaciones (una sola pasada)."""
+    rooms = list(rooms)
+    if not rooms:
+        return []
+    nights = max((check_out - check_in).days, 0)
+    subtotals, discounts, totals = calendar().totals(
+        [room.type for room in rooms], [room.price for room in rooms], check_in, check_out
+    )
+    return [
+        {
+            'nights': nights,
+            'price_per_night': room.price,
+            'average_per_night': round(float(total) / nights, 2) if nights else 0.0,
+            'subtotal': float(subtotal),
+            'discount': float(discount),
+            'total': float(total),
+        }
+        for room, subtotal, discount, total in zip(rooms, subtotals, discounts, totals)
+    ]
+
+
+def quote(room, check_in, check_out):
+    """Cotización de una habitación con el detalle por noche."""
+    data = quote_many([room], check_in, check_out)[0]
+    data['nightly'] = [
+        {'date': day.isoformat(), 'price': price}
+        for day, price in calendar().nightly(room.type, room.price, check_in, check_out)
+    ]
+    return data
@@ -0,0 +1,501 @@
+"""
+Importación masiva de reservas desde exportaciones de canales (OTA) o de
+bloques de grupo: CSV, XLSX o JSON.
+
+Pensada para archivos de decenas de miles de filas, así que nada se consulta
+fila por fila:
+- Los huéspedes se buscan por correo con consultas IN por lotes; los que no
+  existen se crean con un INSERT por lotes y una contraseña aleatoria (un
+  solo hash por importación: hashear una por huésped tomaría horas).
+- Las reservas activas que se cruzan con las fechas del archivo se leen en
+  una sola consulta y quedan por habitación como intervalos ordenados. Cada
+  fila se revisa con búsqueda binaria y, si entra, se agrega a su habitación,
+  así que también se detectan los choques entre filas del mismo archivo
+  (gana la que aparece primero). Antes de leerlas se bloquean las
+  habitaciones candidatas (availability.lock_rooms): una reserva que entra
+  mientras tanto espera a la importación en vez de quedar cruzada con ella.
+  Las habitaciones en mantenimiento no reciben reservas activas.
+- Los totales que no trae el archivo salen del motor de tarifas en una sola
+  pasada vectorizada.
+- Las reservas entran con el mismo INSERT por lotes (COPY en PostgreSQL) que
+  usa el generador de datos.
+
+Las estadías de más de MAX_NIGHTS noches o fuera del calendario de tarifas
+(pricing.PAST_DAYS atrás, pricing.booking_horizon adelante) son errores.
+Las filas válidas se importan aunque otras fallen, todo en una transacción;
+el resultado trae una entrada por fila con lo que pasó.
+"""
+
+import csv
+import io
+import json
+import os
+import secrets
+import time
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app import db, events, page_cache, password_hasher
+from app.models.reservation import Reservation
+from app.models.room import Room
+from app.models.user import User
+from app.services import pricing
+from app.services.availability import lock_rooms
+from app.services.seeding import bulk_insert
+from app.utils.tabular import EXTENSIONS, TableError, cell_number, cell_text, read_table, to_records
+
+# Encabezados aceptados (en minúsculas); cubre las exportaciones más comunes
+HEADER_ALIASES = {
+    'email': 'email', 'correo': 'email', 'guest_email': 'email', 'e-mail': 'email',
+    'first_name': 'first_name', 'nombre': 'first_name',
+    'last_name': 'last_name', 'apellido': 'last_name', 'apellidos': 'last_name',
+    'name': 'name', 'guest_name': 'name', 'huesped': 'name', 'huésped': 'name',
+    'phone': 'phone', 'telefono': 'phone', 'teléfono': 'phone',
+    'room': 'room', 'room_number': 'room', 'number': 'room', 'habitacion': 'room', 'habitación': 'room',
+    'room_type': 'room_type', 'tipo': 'room_type', 'type': 'room_type',
+    'check_in': 'check_in', 'arrival': 'check_in', 'llegada': 'check_in', 'fecha_llegada': 'check_in',
+    'check_out': 'check_out', 'departure': 'check_out', 'salida': 'check_out', 'fecha_salida': 'check_out',
+    'guests': 'guests_count', 'guests_count': 'guests_count', 'adults': 'guests_count',
+    'huespedes': 'guests_count', 'huéspedes': 'guests_count', 'personas': 'guests_count',
+    'total': 'total_price', 'total_price': 'total_price', 'price': 'total_price', 'precio': 'total_price',
+    'status': 'status', 'estado': 'status',
+    'channel': 'channel', 'source': 'channel', 'canal': 'channel',
+    'reference': 'reference', 'booking_id': 'reference', 'referencia': 'reference',
+    'special_requests': 'special_requests', 'notes': 'special_requests', 'notas': 'special_requests',
+    'observaciones': 'special_requests',
+}
+STATUS_ALIASES = {
+    'pendiente': 'pendiente', 'pending': 'pendiente',
+    'confirmada': 'confirmada', 'confirmed': 'confirmada', 'booked': 'confirmada', 'ok': 'confirmada',
+    'cancelada': 'cancelada', 'cancelled': 'cancelada', 'canceled': 'cancelada',
+}
+DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%Y/%m/%d', '%d-%m-%Y')
+MAX_ROWS = 100000
+MAX_NIGHTS = 60                 # igual que la API de cotización
+BATCH_SIZE = 5000               # valores por consulta IN y filas por INSERT
+EMAIL_LENGTH = User.email.type.length
+USERNAME_LENGTH = User.username.type.length
+
+# Resultado de cada fila
+IMPORTED, ERROR, CONFLICT, DUPLICATE = 'importada', 'error', 'conflicto', 'duplicada'
+REPORT_COLUMNS = ('line', 'result', 'message', 'email', 'room', 'check_in', 'check_out', 'total_price')
+
+
+class ReservationImportError(ValueError):
+    """Archivo que no se puede leer (formato, encabezados o tamaño)."""
+
+
+# -------------------------
+# Lectura
+# -------------------------
+def _flatten(item):
+    """Claves de un objeto JSON; los objetos anidados ({"guest": {"email": ...}}) se aplanan."""
+    for key, value in item.items():
+        if isinstance(value, dict):
+            yield from _flatten(value)
+        else:
+            yield str(key), value
+
+
+def _read_json(data):
+    try:
+        payload = json.loads(data.decode('utf-8-sig'))
+    except ValueError as exc:
+        raise ReservationImportError(f"JSON no válido: {exc}")
+    if isinstance(payload, dict):
+        payload = payload.get('reservations', payload.get('reservas'))
+    if not isinstance(payload, list) or not all(isinstance(item, dict) for item in payload):
+        raise ReservationImportError('El JSON debe ser una lista de reservas o {"reservations": [...]}')
+
+    rows = []
+    for line, item in enumerate(payload, start=1):
+        row = {}
+        for key, value in _flatten(item):
+            column = HEADER_ALIASES.get(key.strip().lower())
+            if column and column not in row:
+                row[column] = value
+        row['line'] = line
+        rows.append(row)
+    return rows
+
+
+def read_rows(filename, stream):
+    """
+    Filas del archivo como diccionarios con las columnas de HEADER_ALIASES y
+    su número de línea (posición en la lista, para JSON).
+    """
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension == '.json':
+        rows = _read_json(stream.read())
+    elif extension in EXTENSIONS:
+        try:
+            rows = to_records(read_table(filename, stream.read()), HEADER_ALIASES)
+        except TableError as exc:
+            raise ReservationImportError(str(exc))
+    else:
+        raise ReservationImportError("Formato no soportado: use un archivo .csv, .xlsx o .json")
+
+    if not rows:
+        raise ReservationImportError("El archivo no tiene reservas")
+    columns = set().union(*rows)
+    missing = {'email', 'check_in', 'check_out'} - columns
+    if not {'room', 'room_type'} & columns:
+        missing.add('room o room_type')
+    if missing:
+        raise ReservationImportError(f"Faltan columnas obligatorias: {', '.join(sorted(missing))}")
+    if len(rows) > MAX_ROWS:
+        raise ReservationImportError(f"El archivo tiene {len(rows)} filas; el máximo por importación es {MAX_ROWS}")
+    return rows
+
+
+# -------------------------
+# Validación
+# -------------------------
+def _date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = cell_text(value)[:10]   # '2026-10-19T15:00:00' -> '2026-10-19'
+    try:
+        return date.fromisoformat(text)   # lo normal en exportaciones; strptime es mucho más lento
+    except ValueError:
+        pass
+    for date_format in DATE_FORMATS[1:]:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    raise ValueError(f"fecha '{cell_text(value)}' no válida (use AAAA-MM-DD o DD/MM/AAAA)")
+
+
+def _clean(row):
+    """Reserva validada de una fila. Lanza ValueError con el motivo."""
+    email = cell_text(row.get('email')).lower()
+    if '@' not in email or len(email) > EMAIL_LENGTH:
+        raise ValueError(f"correo '{email}' no válido" if email else "falta el correo del huésped")
+
+    check_in, check_out = _date(row.get('check_in')), _date(row.get('check_out'))
+    if check_out <= check_in:
+        raise ValueError("la salida debe ser posterior a la llegada")
+    if (check_out - check_in).days > MAX_NIGHTS:
+        raise ValueError(f"la estadía no puede superar {MAX_NIGHTS} noches")
+    # Fuera del calendario de tarifas la fila agrandaría la consulta de ocupación y la cotización
+    earliest, horizon = date.today() - timedelta(days=pricing.PAST_DAYS), pricing.booking_horizon()
+    if check_in < earliest or check_out > horizon:
+        raise ValueError(f"las fechas deben estar entre {earliest:%d/%m/%Y} y {horizon:%d/%m/%Y}")
+
+    room, room_type = cell_text(row.get('room')), cell_text(row.get('room_type')).lower()
+    if not room and not room_type:
+        raise ValueError("falta la habitación o el tipo de habitación")
+    if not room and room_type not in Room.TYPE_LABELS:
+        raise ValueError(f"tipo '{room_type}' no válido (use {', '.join(Room.TYPE_LABELS)})")
+
+    try:
+        guests = 1 if cell_text(row.get('guests_count')) == '' else cell_number(row.get('guests_count'), int)
+    except ValueError as error:
+        raise ValueError(f"huéspedes '{cell_text(row.get('guests_count'))}' {error}")
+    if guests < 1:
+        raise ValueError("debe haber al menos un huésped")
+
+    total = row.get('total_price')
+    try:
+        total = None if cell_text(total) == '' else round(cell_number(total, float), 2)
+    except ValueError as error:
+        raise ValueError(f"total '{cell_text(total)}' {error}")
+    if total is not None and total < 0:
+        raise ValueError("el total no puede ser negativo")
+
+    status = STATUS_ALIASES.get(cell_text(row.get('status')).lower() or 'confirmada')
+    if status is None:
+        raise ValueError(f"estado '{cell_text(row.get('status'))}' no válido "
+                         f"(use pendiente, confirmada o cancelada)")
+
+    first_name, last_name = cell_text(row.get('first_name')), cell_text(row.get('last_name'))
+    if not (first_name or last_name) and cell_text(row.get('name')):
+        first_name, _, last_name = cell_text(row.get('name')).partition(' ')
+
+    # Canal y referencia quedan en las peticiones para ubicar la reserva en el canal
+    channel = ' #'.join(part for part in (cell_text(row.get('channel')), cell_text(row.get('reference'))) if part)
+    notes = ' · '.join(part for part in (channel, cell_text(row.get('special_requests'))) if part)
+
+    return {
+        'email': email, 'first_name': first_name[:50] or None, 'last_name': last_name[:50] or None,
+        'phone': cell_text(row.get('phone'))[:20] or None,
+        'room': room, 'room_type': room_type, 'check_in': check_in, 'check_out': check_out,
+        'guests_count': guests, 'total_price': total, 'status': status, 'special_requests': notes or None,
+    }
+
+
+# -------------------------
+# Disponibilidad
+# -------------------------
+def _merged(stays):
+    """Estadías de una habitación como intervalos ordenados y disjuntos (inicios, fines)."""
+    starts, ends = [], []
+    for start, end in sorted(stays):
+        if ends and start <= ends[-1]:
+            ends[-1] = max(ends[-1], end)
+        else:
+            starts.append(start)
+            ends.append(end)
+    return starts, ends
+
+
+def _is_free(booked, start, end):
+    starts, ends = booked
+    index = bisect_right(starts, start) - 1
+    if index >= 0 and ends[index] > start:
+        return False
+    return index + 1 == len(starts) or starts[index + 1] >= end
+
+
+def _book(booked, start, end):
+    starts, ends = booked
+    index = bisect_right(starts, start)
+    starts.insert(index, start)
+    ends.insert(index, end)
+
+
+def _occupancy(first, last):
+    """
+    Reservas activas entre first y last en una sola consulta: intervalos por
+    habitación y las estadías ya registradas por huésped. Para que no cambien
+    antes del commit, las habitaciones tienen que estar bloqueadas.
+    """
+    stays, by_room = set(), {}
+    for room_id, guest_id, check_in, check_out in db.session.execute(
+        select(Reservation.room_id, Reservation.guest_id, Reservation.check_in_date, Reservation.check_out_date)
+        .where(Reservation.status.in_(Reservation.ACTIVE_STATUSES),
+               Reservation.check_in_date < last,
+               Reservation.check_out_date > first)
+    ):
+        by_room.setdefault(room_id, []).append((check_in, check_out))
+        stays.add((guest_id, check_in, check_out))
+    return {room_id: _merged(intervals) for room_id, intervals in by_room.items()}, stays
+
+
+# -------------------------
+# Huéspedes
+# -------------------------
+def _chunks(values, size=BATCH_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _guest_ids(emails):
+    """{correo en minúsculas: id} de los usuarios que ya existen."""
+    ids = {}
+    for chunk in _chunks(emails):
+        ids.update(db.session.execute(
+            select(func.lower(User.email), User.id).where(func.lower(User.email).in_(chunk))
+        ).all())
+    return ids
+
+
+def _usernames(emails):
+    """El correo como nombre de usuario; si ya está tomado, con un sufijo aleatorio."""
+    wanted = {email: email[:USERNAME_LENGTH] for email in emails}
+    taken = set()
+    for chunk in _chunks(set(wanted.values())):
+        taken.update(db.session.execute(select(User.username).where(User.username.in_(chunk))).scalars())
+    names = {}
+    for email, name in wanted.items():
+        while name in taken:
+            name = f"{email[:USERNAME_LENGTH - 9]}-{secrets.token_hex(4)}"
+        taken.add(name)
+        names[email] = name
+    return names
+
+
+def _create_guests(guests):
+    """Crea los huéspedes {correo: reserva} en lote y devuelve {correo: id}."""
+    now = datetime.utcnow()
+    # Nadie conoce esta contraseña: el huésped la cambia con recepción
+    password_hash = password_hasher.hash(secrets.token_urlsafe(32))
+    usernames = _usernames(guests)
+    bulk_insert(User, (
+        {
+            'username': usernames[email], 'email': email, 'password_hash': password_hash, 'role': 'huesped',
+            'first_name': booking['first_name'], 'last_name': booking['last_name'], 'phone': booking['phone'],
+            'created_at': now, 'is_active': True,
+        }
+        for email, booking in guests.items()
+    ), BATCH_SIZE)
+    return _guest_ids(guests)
+
+
+# -------------------------
+# Importación
+# -------------------------
+def import_reservations(rows, dry_run=False, user=None):
+    """
+    Importa las filas válidas y libres en una transacción. `user` queda como
+    quien confirmó las reservas confirmadas. Devuelve los conteos por
+    resultado y 'rows' con una entrada por fila (ver REPORT_COLUMNS).
+    """
+    started = time.perf_counter()
+    report, bookings = [], []
+    for row in rows:
+        entry = {'line': row['line'], 'result': None, 'message': '', 'email': cell_text(row.get('email')),
+                 'room': cell_text(row.get('room')) or cell_text(row.get('room_type')),
+                 'check_in': cell_text(row.get('check_in')), 'check_out': cell_text(row.get('check_out')),
+                 'total_price': None}
+        report.append(entry)
+        try:
+            booking = _clean(row)
+        except ValueError as exc:
+            entry.update(result=ERROR, message=str(exc))
+            continue
+        entry.update(email=booking['email'], check_in=booking['check_in'].isoformat(),
+                     check_out=booking['check_out'].isoformat())
+        bookings.append((entry, booking))
+
+    rooms = db.session.execute(
+        select(Room.id, Room.number, Room.type, Room.price, Room.status,
+               func.coalesce(Room.max_occupancy, 2).label('capacity'))
+        .order_by(Room.number)
+    ).all()
+    by_number = {room.number: room for room in rooms}
+    by_type = {}
+    for room in rooms:
+        by_type.setdefault(room.type, []).append(room)
+
+    guest_ids = _guest_ids({booking['email'] for _, booking in bookings})
+    emails = {guest_id: email for email, guest_id in guest_ids.items()}
+    candidate_ids = {by_number[booking['room']].id for _, booking in bookings if booking['room'] in by_number}
+    candidate_ids.update(room.id for _, booking in bookings if not booking['room']
+                         for room in by_type.get(booking['room_type'], ()))
+    # La simulación no escribe nada y no bloquea. Al bloquear se relee el
+    # estado: el de la consulta anterior puede estar viejo.
+    if candidate_ids and not dry_run:
+        maintenance = {room.id for room in lock_rooms(candidate_ids) if room.status == 'mantenimiento'}
+    else:
+        maintenance = {room.id for room in rooms if room.status == 'mantenimiento'}
+    if bookings:
+        occupied, stays = _occupancy(min(booking['check_in'] for _, booking in bookings),
+                                     max(booking['check_out'] for _, booking in bookings))
+    else:
+        occupied, stays = {}, set()
+    # Misma estadía del mismo huésped: ya registrada o repetida en el archivo
+    stays = {(emails[guest_id], check_in, check_out) for guest_id, check_in, check_out in stays
+             if guest_id in emails}
+
+    accepted = []
+    for entry, booking in bookings:
+        active = booking['status'] != 'cancelada'
+        stay = (booking['email'], booking['check_in'], booking['check_out'])
+        if active and stay in stays:
+            entry.update(result=DUPLICATE, message="el huésped ya tiene una reserva en esas fechas")
+            continue
+
+        if booking['room']:
+            room = by_number.get(booking['room'])
+            if room is None:
+                entry.update(result=ERROR, message=f"la habitación {booking['room']} no existe")
+                continue
+            if booking['guests_count'] > room.capacity:
+                entry.update(result=ERROR, message=f"la habitación {room.number} admite {room.capacity} huéspedes")
+                continue
+            if active and room.id in maintenance:
+                entry.update(result=CONFLICT, message=f"la habitación {room.number} está en mantenimiento")
+                continue
+            candidates = [room]
+        else:
+            candidates = [room for room in by_type.get(booking['room_type'], ())
+                          if room.capacity >= booking['guests_count']]
+            if not candidates:
+                entry.update(result=ERROR, message=f"no hay habitaciones {booking['room_type']} "
+                                                   f"para {booking['guests_count']} huéspedes")
+                continue
+            if active:
+                candidates = [room for room in candidates if room.id not in maintenance]
+
+        if active:
+            room = next((room for room in candidates
+                         if _is_free(occupied.setdefault(room.id, ([], [])), booking['check_in'],
+                                     booking['check_out'])), None)
+            if room is None:
+                entry.update(result=CONFLICT, message=(
+                    f"la habitación {candidates[0].number} está ocupada en esas fechas" if booking['room']
+                    else f"no hay habitaciones {booking['room_type']} libres en esas fechas"))
+                continue
+            _book(occupied[room.id], booking['check_in'], booking['check_out'])
+            stays.add(stay)
+        else:
+            room = candidates[0]
+
+        booking['room_id'] = room.id
+        entry.update(result=IMPORTED, room=room.number)
+        accepted.append((entry, booking, room))
+
+    # Los totales que faltan se cotizan de una vez
+    missing = [(entry, booking, room) for entry, booking, room in accepted if booking['total_price'] is None]
+    if missing:
+        _, _, totals = pricing.calendar().totals(
+            [room.type for _, _, room in missing], [room.price for _, _, room in missing],
+            [booking['check_in'] for _, booking, _ in missing], [booking['check_out'] for _, booking, _ in missing]
+        )
+        for (_, booking, _), total in zip(missing, totals.tolist()):
+            booking['total_price'] = total
+    for entry, booking, _ in accepted:
+        entry['total_price'] = booking['total_price']
+
+    new_guests = {}
+    for _, booking, _ in accepted:
+        if booking['email'] not in guest_ids:
+            new_guests.setdefault(booking['email'], booking)
+
+    result = {
+        'imported': len(accepted),
+        'errors': sum(entry['result'] == ERROR for entry in report),
+        'conflicts': sum(entry['result'] == CONFLICT for entry in report),
+        'duplicates': sum(entry['result'] == DUPLICATE for entry in report),
+        'new_guests': len(new_guests),
+        'rows': report,
+    }
+    if dry_run or not accepted:
+        result['duration_ms'] = round((time.perf_counter() - started) * 1000)
+        return result
+
+    existing_guests = {guest_ids[booking['email']] for _, booking, _ in accepted if booking['email'] in guest_ids}
+    if new_guests:
+        guest_ids.update(_create_guests(new_guests))
+
+    now = datetime.utcnow()
+    confirmed_by = user.id if user is not None else None
+    bulk_insert(Reservation, (
+        {
+            'guest_id': guest_ids[booking['email']], 'room_id': booking['room_id'],
+            'check_in_date': booking['check_in'], 'check_out_date': booking['check_out'],
+            'guests_count': booking['guests_count'], 'total_price': booking['total_price'],
+            'status': booking['status'], 'special_requests': booking['special_requests'],
+            'created_at': now,
+            'confirmed_at': now if booking['status'] == 'confirmada' else None,
+            'confirmed_by_id': confirmed_by if booking['status'] == 'confirmada' else None,
+            'checked_in_at': None, 'checked_out_at': None, 'payment_type': None, 'payment_detail': None,
+            'cancelled_at': now if booking['status'] == 'cancelada' else None,
+        }
+        for _, booking, _ in accepted
+    ), BATCH_SIZE)
+    db.session.commit()
+
+    # El INSERT por lotes no pasa por los eventos del ORM
+    page_cache.bump('availability')
+    for guest_id in existing_guests:
+        page_cache.bump(f'reservations:{guest_id}')
+    events.publish([{'type': 'reload', 'reason': 'reservation_import', 'imported': len(accepted)}])
+    result['duration_ms'] = round((time.perf_counter() - started) * 1000)
+    return result
+
+
+def report_csv(result):
+    """Informe por fila en CSV."""
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=REPORT_COLUMNS)
+    writer.writeheader()
+    writer.writerows(result['rows'])
+    return output.getvalue()
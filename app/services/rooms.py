@@ -0,0 +1,242 @@
+"""
+Operaciones en bloque sobre el catálogo de habitaciones.
+
+- Importación desde CSV o XLSX: se valida todo el archivo, el chequeo de
+  números repetidos es una sola consulta para todo el lote y las
+  habitaciones nuevas entran en un INSERT por lotes (executemany). Con
+  `update_existing`, los números que ya existen se actualizan en vez de
+  rechazarse (UPDATE por llave primaria, también en lote).
+- Cambios de estado o precio para varias habitaciones elegidas en la página
+  de habitaciones: un solo UPDATE ... WHERE id IN (...).
+
+Todo corre en una transacción: si una fila falla no se guarda nada. Como son
+operaciones en bloque no pasan por los eventos del ORM, así que al final se
+invalida a mano la caché del catálogo y se avisa a recepción.
+"""
+
+import csv
+import io
+
+from sqlalchemy import Numeric, cast, func, insert, select, update
+
+from app import db, events, page_cache
+from app.models.room import Room
+from app.services.frontdesk import dashboard_summary
+from app.services.housekeeping import close_stale_tasks, open_missing_tasks
+from app.utils.tabular import TableError, cell_number, cell_text, read_table, to_records
+
+STATUSES = ('disponible', 'ocupada', 'mantenimiento', 'limpieza')
+COLUMNS = ('number', 'type', 'price', 'max_occupancy', 'status', 'description', 'amenities')
+# Encabezados aceptados (en minúsculas) para cada columna
+HEADER_ALIASES = {
+    'number': 'number', 'numero': 'number', 'número': 'number', 'habitacion': 'number', 'habitación': 'number',
+    'type': 'type', 'tipo': 'type',
+    'price': 'price', 'precio': 'price',
+    'max_occupancy': 'max_occupancy', 'capacidad': 'max_occupancy',
+    'status': 'status', 'estado': 'status',
+    'description': 'description', 'descripcion': 'description', 'descripción': 'description',
+    'amenities': 'amenities', 'comodidades': 'amenities',
+}
+MAX_ROWS = 5000
+NUMBER_LENGTH = Room.number.type.length
+
+
+class RoomImportError(ValueError):
+    """Archivo que no se puede leer (formato, encabezados o tamaño)."""
+
+
+# -------------------------
+# Lectura
+# -------------------------
+def read_rows(filename, stream):
+    """
+    Filas del archivo como diccionarios con las columnas de COLUMNS, junto con
+    su número de línea en el archivo. Ignora las filas vacías.
+    """
+    try:
+        table = read_table(filename, stream.read())
+    except TableError as exc:
+        raise RoomImportError(str(exc))
+
+    missing = {'number', 'type', 'price'} - {HEADER_ALIASES.get(str(cell or '').strip().lower()) for cell in table[0]}
+    if missing:
+        raise RoomImportError(f"Faltan columnas obligatorias: {', '.join(sorted(missing))}")
+
+    rows = to_records(table, HEADER_ALIASES)
+    if len(rows) > MAX_ROWS:
+        raise RoomImportError(f"El archivo tiene {len(rows)} filas; el máximo por importación es {MAX_ROWS}")
+    return rows
+
+
+# -------------------------
+# Validación
+# -------------------------
+def _clean(row):
+    """Fila validada lista para guardar. Lanza ValueError con el motivo."""
+    number = cell_text(row.get('number'))
+    if not number:
+        raise ValueError("falta el número de habitación")
+    if len(number) > NUMBER_LENGTH:
+        raise ValueError(f"el número '{number}' supera {NUMBER_LENGTH} caracteres")
+
+    room_type = cell_text(row.get('type')).lower()
+    if room_type not in Room.TYPE_LABELS:
+        raise ValueError(f"tipo '{room_type}' no válido (use {', '.join(Room.TYPE_LABELS)})")
+
+    try:
+        price = cell_number(row.get('price'), float)
+    except ValueError as error:
+        raise ValueError(f"precio '{cell_text(row.get('price'))}' {error}")
+    if price < 0:
+        raise ValueError("el precio no puede ser negativo")
+
+    occupancy = row.get('max_occupancy')
+    try:
+        occupancy = 2 if cell_text(occupancy) == '' else cell_number(occupancy, int)
+    except ValueError as error:
+        raise ValueError(f"capacidad '{cell_text(occupancy)}' {error}")
+    if occupancy < 1:
+        raise ValueError("la capacidad debe ser al menos 1")
+
+    status = cell_text(row.get('status')).lower() or 'disponible'
+    if status not in STATUSES:
+        raise ValueError(f"estado '{status}' no válido (use {', '.join(STATUSES)})")
+
+    return {
+        'number': number,
+        'type': room_type,
+        'price': round(price, 2),
+        'max_occupancy': occupancy,
+        'status': status,
+        'description': cell_text(row.get('description'))[:500],
+        'amenities': cell_text(row.get('amenities'))[:500],
+    }
+
+
+def validate(rows, update_existing=False):
+    """
+    Valida las filas y las separa en nuevas y existentes. Devuelve
+    (nuevas, existentes, errores), con errores como [(línea, motivo)].
+    El chequeo contra la base es una sola consulta para todo el lote.
+    """
+    cleaned, errors, seen = [], [], {}
+    for row in rows:
+        try:
+            room = _clean(row)
+        except ValueError as exc:
+            errors.append((row['line'], str(exc)))
+            continue
+        if room['number'] in seen:
+            errors.append((row['line'], f"número {room['number']} repetido (ya está en la línea {seen[room['number']]})"))
+            continue
+        seen[room['number']] = row['line']
+        cleaned.append((row, room))
+
+    existing = dict(db.session.execute(
+        select(Room.number, Room.id).where(Room.number.in_([room['number'] for _, room in cleaned]))
+    ).all()) if cleaned else {}
+
+    new, updates = [], []
+    for row, room in cleaned:
+        if room['number'] not in existing:
+            new.append(room)
+        elif update_existing:
+            # Solo las columnas que trae el archivo: las demás se conservan
+            updates.append({'id': existing[room['number']],
+                            **{column: value for column, value in room.items() if column in row}})
+        else:
+            errors.append((row['line'], f"la habitación {room['number']} ya existe"))
+    return new, updates, sorted(errors)
+
+
+def import_rooms(rows, update_existing=False, dry_run=False):
+    """
+    Importa las filas en una sola transacción. Si hay errores no se guarda
+    nada. Devuelve {'created', 'updated', 'errors', 'preview'}.
+    """
+    new, updates, errors = validate(rows, update_existing)
+    result = {
+        'created': len(new),
+        'updated': len(updates),
+        'errors': errors,
+        'preview': [{'action': 'crear', **room} for room in new] +
+                   [{'action': 'actualizar', **room} for room in updates],
+    }
+    if errors or dry_run or not (new or updates):
+        return result
+
+    if new:
+        db.session.execute(insert(Room), new)
+    if updates:
+        db.session.execute(update(Room), updates)
+    open_missing_tasks()
+    close_stale_tasks()
+    db.session.commit()
+    _catalog_changed()
+    return result
+
+
+def template_csv():
+    """Plantilla de importación con una fila de ejemplo."""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(COLUMNS)
+    writer.writerow(['101', 'doble', '180000', '2', 'disponible', 'Vista al jardín', 'WiFi, TV'])
+    return output.getvalue()
+
+
+# -------------------------
+# Cambios en bloque
+# -------------------------
+def bulk_update(room_ids, status=None, price=None, price_percent=None):
+    """
+    Cambia estado y/o precio de varias habitaciones en un solo UPDATE.
+    `price` fija el precio; `price_percent` lo ajusta (p. ej. 10 = +10 %).
+    Devuelve el número de habitaciones modificadas.
+    """
+    room_ids = sorted({int(room_id) for room_id in room_ids})
+    values = {}
+    if status is not None:
+        if status not in STATUSES:
+            raise ValueError(f"Estado no válido: {status}")
+        values['status'] = status
+    if price is not None:
+        if price < 0:
+            raise ValueError("El precio no puede ser negativo")
+        values['price'] = round(price, 2)
+    elif price_percent is not None:
+        if price_percent <= -100:
+            raise ValueError("El ajuste debe ser mayor a -100 %")
+        # round(double precision, int) no existe en PostgreSQL: se redondea como numeric
+        values['price'] = func.round(cast(Room.price * (1 + price_percent / 100), Numeric), 2)
+    if not room_ids or not values:
+        return 0
+
+    before = db.session.execute(
+        select(Room.id, Room.number, Room.status).where(Room.id.in_(room_ids))
+    ).all()
+    changed = db.session.execute(
+        update(Room).where(Room.id.in_(room_ids)).values(**values),
+        execution_options={'synchronize_session': False}
+    ).rowcount
+    if status == 'limpieza':
+        open_missing_tasks()
+    elif status is not None:
+        close_stale_tasks(room_ids)
+    db.session.commit()
+
+    moved = [(room_id, number, old) for room_id, number, old in before if status and old != status]
+    _catalog_changed(moved, status)
+    return changed
+
+
+def _catalog_changed(moved=(), status=None):
+    """Invalida el catálogo y avisa a recepción: un evento por habitación que cambió de estado."""
+    page_cache.bump('catalog')
+    with db.engine.connect() as connection:
+        summary = dashboard_summary(connection)
+    events.publish([
+        {'type': 'room.status', 'room_id': room_id, 'number': number, 'old_status': old,
+         'status': status, 'summary': summary}
+        for room_id, number, old in moved
+    ] or [{'type': 'room.status', 'summary': summary}])   # solo actualiza los contadores
@@ -0,0 +1,269 @@
+"""
+Generador de datos sintéticos a escala (flask seed --scale N, benchmarks).
+
+Crea habitaciones, recepcionistas, huéspedes y reservas realistas:
+- Por habitación las estancias se encadenan en el tiempo (salida de una =
+  llegada de la siguiente como muy pronto), así que nunca se solapan.
+- El estado sale de las fechas respecto a `today`: pasadas completadas o
+  canceladas, en curso con check-in hecho, futuras pendientes/confirmadas.
+- Totales del motor de tarifas, como una reserva hecha desde la app.
+- Pagos con el mismo formato que registra recepción (efectivo, transferencia,
+  tarjeta).
+
+Todo se inserta por lotes con Core (INSERT de muchas filas) o con COPY en
+PostgreSQL, sin pasar por el ORM ni sus eventos. Con la misma semilla y la
+misma fecha de referencia el resultado es idéntico.
+"""
+
+import csv
+import io
+import random
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import select, func, update
+
+from app import db, page_cache, password_hasher
+from app.models.user import User
+from app.models.room import Room
+from app.models.reservation import Reservation
+from app.services import pricing
+
+# Lo que genera `--scale 1`; los tamaños crecen linealmente con N
+SCALE_UNIT = {'rooms': 100, 'guests': 2000, 'staff': 2, 'reservations': 20000}
+
+ROOM_TYPES = [
+    # tipo, capacidad, precio base, peso, imagen
+    ('individual', 1, 313815.20, 3, 'Hab1.png'),
+    ('doble', 2, 470722.80, 5, 'Hab2.png'),
+    ('suite', 2, 784538.00, 1, 'Hab3.png'),
+    ('familiar', 4, 588403.50, 2, 'Hab5.png'),
+]
+AMENITIES = ['WiFi', 'TV', 'Aire acondicionado', 'Minibar', 'Caja fuerte', 'Balcón', 'Jacuzzi', 'Vista al jardín']
+FIRST_NAMES = ['Ana', 'Carlos', 'María', 'Juan', 'Laura', 'Andrés', 'Camila', 'Felipe', 'Valentina', 'Santiago',
+               'Daniela', 'Sebastián', 'Paula', 'Mateo', 'Sofía', 'Diego', 'Isabella', 'Julián', 'Mariana', 'Tomás']
+LAST_NAMES = ['Gómez', 'Rodríguez', 'Martínez', 'López', 'García', 'Hernández', 'Díaz', 'Moreno', 'Álvarez',
+              'Romero', 'Torres', 'Ramírez', 'Vargas', 'Castro', 'Rojas', 'Ortiz', 'Jiménez', 'Suárez']
+SPECIAL_REQUESTS = ['Cama adicional', 'Llegada tarde', 'Piso alto', 'Cuna para bebé', 'Habitación silenciosa']
+NIGHTS = [1, 2, 3, 4, 5, 7, 10]
+NIGHTS_WEIGHTS = [20, 25, 20, 12, 10, 8, 5]
+# Noches promedio + días libres promedio entre estancias
+AVG_CYCLE = sum(n * w for n, w in zip(NIGHTS, NIGHTS_WEIGHTS)) / sum(NIGHTS_WEIGHTS) + 1.5
+
+
+def scaled_counts(scale):
+    return {name: value * scale for name, value in SCALE_UNIT.items()}
+
+
+# -------------------------
+# Inserción masiva
+# -------------------------
+def _batches(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _copy(connection, table, chunk):
+    """COPY ... FROM STDIN (CSV) de PostgreSQL; None viaja como NULL."""
+    columns = list(chunk[0])
+    preparer = connection.dialect.identifier_preparer
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in chunk:
+        writer.writerow([row[column] for column in columns])
+    buffer.seek(0)
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {preparer.format_table(table)} ({', '.join(preparer.quote(c) for c in columns)}) "
+            f"FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+    finally:
+        cursor.close()
+
+
+def bulk_insert(model, rows, batch_size=10000):
+    """Inserta un iterable de dicts por lotes; devuelve cuántas filas insertó."""
+    connection = db.session.connection()
+    table = model.__table__
+    use_copy = connection.dialect.name == 'postgresql' and connection.dialect.driver == 'psycopg2'
+    total = 0
+    for chunk in _batches(rows, batch_size):
+        if use_copy:
+            _copy(connection, table, chunk)
+        else:
+            connection.execute(table.insert(), chunk)
+        total += len(chunk)
+    return total
+
+
+# -------------------------
+# Filas
+# -------------------------
+def _room_rows(rng, count, start_number):
+    types = [t for t in ROOM_TYPES for _ in range(t[3])]
+    created = datetime.combine(date(2023, 1, 1), time(9))
+    for i in range(count):
+        room_type, occupancy, base_price, _, image = rng.choice(types)
+        status = rng.choices(['disponible', 'mantenimiento', 'limpieza'], [92, 3, 5])[0]
+        yield {
+            'number': str(start_number + i), 'type': room_type,
+            'price': round(base_price * rng.uniform(0.9, 1.15), -2),
+            'status': status, 'description': f'Habitación {room_type} del piso {1 + i // 20}',
+            'image': image, 'amenities': ', '.join(rng.sample(AMENITIES, rng.randint(2, 5))),
+            'max_occupancy': occupancy, 'created_at': created,
+        }
+
+
+def _user_rows(rng, count, role, prefix, domain, password_hash, today):
+    for i in range(count):
+        first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        name = prefix if i == 0 and role == 'recepcionista' else f'{prefix}{i}'
+        yield {
+            'username': name, 'email': f'{name}@{domain}', 'password_hash': password_hash, 'role': role,
+            'first_name': first_name, 'last_name': last_name, 'phone': f'3{rng.randrange(10**9):09d}',
+            'created_at': datetime.combine(today - timedelta(days=rng.randint(0, 1000)), time(rng.randint(0, 23))),
+            'is_active': True,
+        }
+
+
+def _payment(rng, total):
+    payment_type = rng.choice(['efectivo', 'transferencia', 'tarjeta'])
+    if payment_type == 'efectivo':
+        return payment_type, f"Valor recibido: {total:.0f}"
+    if payment_type == 'transferencia':
+        return payment_type, f"Plataforma: {rng.choice(['Nequi', 'Daviplata', 'PSE', 'Bancolombia'])}"
+    return payment_type, f"Tarjeta terminada en {rng.randrange(10000):04d}"
+
+
+def _reservation_rows(rng, rooms, guest_ids, staff_ids, total, today, calendar):
+    per_room, extra = divmod(total, len(rooms))
+    for index, (room_id, room_type, price, occupancy) in enumerate(rooms):
+        count = per_room + (1 if index < extra else 0)
+        # Dos tercios de la historia en el pasado, un tercio por delante
+        day = today - timedelta(days=int(count * AVG_CYCLE * 2 / 3))
+        stays = []
+        for _ in range(count):
+            day += timedelta(days=rng.choices([0, 1, 2, 3, 5], [40, 25, 15, 12, 8])[0])
+            nights = rng.choices(NIGHTS, NIGHTS_WEIGHTS)[0]
+            stays.append((day, day + timedelta(days=nights)))
+            day = stays[-1][1]
+        if not stays:
+            continue
+        # Todas las estadías de la habitación se cotizan de una vez
+        _, _, totals = calendar.totals(
+            [room_type] * count, [price] * count, [stay[0] for stay in stays], [stay[1] for stay in stays]
+        )
+
+        for (check_in, check_out), total_price in zip(stays, totals.tolist()):
+            # Reservada entre 1 y 90 días antes de llegar, nunca después de hoy
+            booked = min(check_in - timedelta(days=rng.randint(1, 90)), today)
+            row = {
+                'guest_id': rng.choice(guest_ids), 'room_id': room_id,
+                'check_in_date': check_in, 'check_out_date': check_out,
+                'guests_count': rng.randint(1, occupancy), 'total_price': total_price,
+                'special_requests': rng.choice(SPECIAL_REQUESTS) if rng.random() < 0.1 else None,
+                'created_at': datetime.combine(booked, time(rng.randint(7, 22))),
+                'confirmed_at': None, 'checked_in_at': None, 'checked_out_at': None,
+                'confirmed_by_id': None, 'payment_type': None, 'payment_detail': None,
+                'cancelled_at': None,
+            }
+            arrival = datetime.combine(check_in, time(15))
+            if check_out <= today:
+                status = rng.choices(['completada', 'cancelada'], [88, 12])[0]
+            elif check_in <= today:
+                status = 'en curso'
+            else:
+                status = rng.choices(['confirmada', 'pendiente', 'cancelada'], [60, 30, 10])[0]
+
+            if status in ('completada', 'en curso', 'confirmada'):
+                row['confirmed_at'] = row['created_at'] + timedelta(hours=rng.randint(1, 48))
+                row['confirmed_by_id'] = rng.choice(staff_ids)
+            if status in ('completada', 'en curso'):
+                row['checked_in_at'] = arrival
+                row['payment_type'], row['payment_detail'] = _payment(rng, total_price)
+            if status == 'completada':
+                row['checked_out_at'] = datetime.combine(check_out, time(11))
+            if status == 'cancelada':
+                # A mitad de camino entre la reserva y la llegada, sin pasar de hoy
+                midway = row['created_at'] + (arrival - row['created_at']) / 2
+                row['cancelled_at'] = max(min(midway, datetime.combine(today, time(12))), row['created_at'])
+            if status == 'en curso':
+                # Recepción deja 'confirmada' con checked_in_at al hacer el check-in
+                status = 'confirmada'
+            elif status == 'confirmada' and rng.random() < 0.5:
+                row['payment_type'], row['payment_detail'] = _payment(rng, total_price)
+            row['status'] = status
+            yield row
+
+
+# -------------------------
+# Punto de entrada
+# -------------------------
+def generate_hotel(rooms, guests, staff, reservations, seed=42, today=None, password='secreto123',
+                   batch_size=10000, echo=print):
+    """
+    Genera el hotel completo en la BD de la app (llamar dentro de un app context).
+
+    Los huéspedes son huesped0..N@hotel.com y el personal recepcion@hotel.com,
+    recepcion1@hotel.com...; todos comparten `password` (un solo hash).
+    """
+    if rooms < 1 or guests < 1 or staff < 1:
+        raise ValueError("Se necesita al menos una habitación, un huésped y un recepcionista")
+    if db.session.execute(select(User.id).where(User.email == 'huesped0@hotel.com')).first():
+        raise ValueError("La base de datos ya tiene huéspedes generados (huesped0@hotel.com)")
+
+    rng = random.Random(seed)
+    today = today or date.today()
+    password_hash = password_hasher.hash(password)
+
+    # Números de habitación por encima de los existentes (p. ej. las de ejemplo)
+    start_number = max(1000, (db.session.execute(select(func.count(Room.id))).scalar() or 0) + 1000)
+    first_room = (db.session.execute(select(func.max(Room.id))).scalar() or 0)
+    bulk_insert(Room, _room_rows(rng, rooms, start_number), batch_size)
+    echo(f"  {rooms} habitaciones")
+
+    first_user = (db.session.execute(select(func.max(User.id))).scalar() or 0)
+    bulk_insert(User, _user_rows(rng, staff, 'recepcionista', 'recepcion', 'hotel.com', password_hash, today),
+                batch_size)
+    bulk_insert(User, _user_rows(rng, guests, 'huesped', 'huesped', 'hotel.com', password_hash, today),
+                batch_size)
+    echo(f"  {staff} recepcionistas y {guests} huéspedes")
+
+    room_data = db.session.execute(
+        select(Room.id, Room.type, Room.price, Room.max_occupancy).where(Room.id > first_room).order_by(Room.id)
+    ).all()
+    staff_ids = db.session.execute(
+        select(User.id).where(User.id > first_user, User.role == 'recepcionista')
+    ).scalars().all()
+    guest_ids = db.session.execute(
+        select(User.id).where(User.id > first_user, User.role == 'huesped')
+    ).scalars().all()
+
+    inserted = bulk_insert(
+        Reservation,
+        _reservation_rows(rng, room_data, guest_ids, staff_ids, reservations, today, pricing.calendar()),
+        batch_size
+    )
+    echo(f"  {inserted} reservas")
+
+    # Habitaciones con una estancia en curso quedan ocupadas
+    in_house = select(Reservation.room_id).where(
+        Reservation.check_in_date <= today, Reservation.check_out_date > today,
+        Reservation.checked_in_at.isnot(None), Reservation.checked_out_at.is_(None)
+    )
+    db.session.execute(
+        update(Room).where(Room.id > first_room, Room.id.in_(in_house)).values(status='ocupada')
+    )
+    db.session.commit()
+
+    # Core no dispara los eventos del ORM: invalidar a mano el catálogo cacheado
+    page_cache.bump('catalog')
+    page_cache.bump('availability')
+    return {'rooms': rooms, 'staff': staff, 'guests': guests, 'reservations': inserted}
@@ -0,0 +1,285 @@
+"""
+Lista de espera con ofertas automáticas.
+
+Un huésped se anota para un tipo de habitación en unas fechas. Cuando una
+reserva se cancela (o vence una oferta sin respuesta) se buscan solicitudes
+que ahora caben en esa habitación:
+
+- El hueco libre alrededor de las fechas liberadas sale de dos consultas por
+  el índice de reservas (room_id, check_in_date, check_out_date): dónde
+  termina la reserva anterior y dónde empieza la siguiente.
+- Una solicitud es elegible si cabe dentro del hueco y toca las fechas
+  liberadas, es decir, llega entre el inicio del hueco y la salida liberada.
+  Eso es un recorrido por rango de ix_waitlist_match (tipo, estado, llegada,
+  salida) acotado por el ancho del hueco: el costo no depende de cuántas
+  solicitudes haya en total en la lista.
+- Se atienden por orden de inscripción. Cada oferta crea una reserva
+  pendiente a nombre del huésped que retiene la habitación durante
+  WAITLIST_HOLD_HOURS; si no responde a tiempo se libera y se ofrece al
+  siguiente.
+
+La habitación se bloquea (availability.lock_rooms) antes de revisar y
+ofrecer, así dos liberaciones simultáneas no la ofrecen dos veces.
+
+No hay envío de correo en la aplicación: el aviso al huésped es la oferta en
+su panel y un evento 'waitlist.offered' para recepción.
+"""
+
+import bisect
+from datetime import date, datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import func, select
+
+from app import db, events
+from app.models.reservation import Reservation
+from app.models.room import Room
+from app.models.waitlist import WaitlistEntry
+from app.services import pricing
+from app.services.availability import available_rooms_query, lock_rooms
+
+# Noches máximas por solicitud: estadías más largas casi nunca caben en un hueco
+MAX_NIGHTS = 30
+
+
+class WaitlistError(ValueError):
+    """La operación sobre la lista de espera no es válida; no se guardó nada."""
+
+
+# -------------------------
+# Inscripción
+# -------------------------
+def join(guest, room_type, check_in, check_out, guests_count=1):
+    """
+    Anota al huésped en la lista de espera. Si ya hay una habitación libre
+    se le ofrece en el acto. Devuelve la solicitud.
+    """
+    if room_type not in Room.TYPE_LABELS:
+        raise WaitlistError("Tipo de habitación no válido.")
+    if check_in < date.today():
+        raise WaitlistError("La fecha de llegada no puede ser anterior a hoy.")
+    if check_out <= check_in:
+        raise WaitlistError("La fecha de salida debe ser posterior a la de llegada.")
+    if (check_out - check_in).days > MAX_NIGHTS:
+        raise WaitlistError(f"La estadía no puede superar {MAX_NIGHTS} noches.")
+    if check_out > pricing.booking_horizon():
+        raise WaitlistError(f"Solo se aceptan fechas con salida hasta el {pricing.booking_horizon():%d/%m/%Y}.")
+
+    open_entries = WaitlistEntry.query.filter(
+        WaitlistEntry.guest_id == guest.id,
+        WaitlistEntry.status.in_(WaitlistEntry.OPEN_STATUSES)
+    ).all()
+    if len(open_entries) >= current_app.config['WAITLIST_MAX_ENTRIES']:
+        raise WaitlistError(f"Ya tiene {len(open_entries)} solicitudes abiertas en la lista de espera.")
+    if any((e.room_type, e.check_in_date, e.check_out_date) == (room_type, check_in, check_out)
+           for e in open_entries):
+        raise WaitlistError("Ya está en la lista de espera para esas fechas y ese tipo de habitación.")
+
+    entry = WaitlistEntry(guest_id=guest.id, room_type=room_type, check_in_date=check_in,
+                          check_out_date=check_out, guests_count=guests_count)
+    db.session.add(entry)
+    db.session.commit()
+
+    # Si ya hay habitaciones libres se ofrecen por orden de inscripción: las
+    # primeras pueden ir a solicitudes anteriores para las mismas fechas
+    free_rooms = available_rooms_query(check_in, check_out, guests_count).filter(
+        Room.type == room_type
+    ).with_entities(Room.id).all()
+    for (room_id,) in free_rooms:
+        match_room(room_id, check_in, check_out)
+        if db.session.get(WaitlistEntry, entry.id).status != WaitlistEntry.WAITING:
+            break
+    return entry
+
+
+# -------------------------
+# Emparejamiento
+# -------------------------
+def _overlaps(booked, check_in, check_out):
+    """`booked` es una lista ordenada de (llegada, salida) sin cruces entre sí."""
+    i = bisect.bisect_left(booked, (check_out,))
+    return i > 0 and booked[i - 1][1] > check_in
+
+
+def candidates_query(room, check_in, check_out, gap_start, gap_end=None):
+    """
+    Solicitudes en espera que caben en la habitación entre gap_start y
+    gap_end (None = sin reserva siguiente) y tocan las fechas liberadas.
+    Es un recorrido por rango de ix_waitlist_match; devuelve solo columnas,
+    los objetos se cargan para las pocas solicitudes que reciben oferta.
+    """
+    conditions = [
+        WaitlistEntry.room_type == room.type,
+        WaitlistEntry.status == WaitlistEntry.WAITING,
+        WaitlistEntry.check_in_date >= gap_start,
+        WaitlistEntry.check_in_date < check_out,
+        WaitlistEntry.check_out_date > check_in,
+        WaitlistEntry.guests_count <= (room.max_occupancy or 2),
+    ]
+    if gap_end is not None:
+        conditions.append(WaitlistEntry.check_out_date <= gap_end)
+    return select(WaitlistEntry.id, WaitlistEntry.check_in_date, WaitlistEntry.check_out_date).where(
+        *conditions).order_by(WaitlistEntry.created_at, WaitlistEntry.id)
+
+
+def match_room(room_id, check_in, check_out, today=None):
+    """
+    Ofrece la habitación liberada entre check_in y check_out a las
+    solicitudes en espera que caben en ella. Devuelve las solicitudes
+    ofrecidas. Hace commit (también cuando no ofrece nada, para soltar el
+    bloqueo).
+    """
+    today = today or date.today()
+    check_in = max(check_in, today)
+    if check_out <= check_in:
+        return []
+
+    rooms = lock_rooms([room_id])
+    if not rooms or rooms[0].status == 'mantenimiento':
+        db.session.commit()
+        return []
+    room = rooms[0]
+
+    active = (Reservation.room_id == room.id, Reservation.status.in_(Reservation.ACTIVE_STATUSES))
+    gap_start = db.session.execute(
+        select(func.max(Reservation.check_out_date)).where(*active, Reservation.check_in_date < check_in)
+    ).scalar()
+    gap_end = db.session.execute(
+        select(func.min(Reservation.check_in_date)).where(*active, Reservation.check_in_date >= check_out)
+    ).scalar()
+    gap_start = max(gap_start or today, today)
+
+    candidates = db.session.execute(candidates_query(room, check_in, check_out, gap_start, gap_end)).all()
+    if not candidates:
+        db.session.commit()
+        return []
+
+    # Lo que ya está ocupado dentro del hueco (normalmente nada; cubre reservas
+    # que se cruzan con las fechas liberadas)
+    until = max(c.check_out_date for c in candidates)
+    booked = sorted(db.session.execute(
+        select(Reservation.check_in_date, Reservation.check_out_date).where(
+            *active, Reservation.check_in_date < until, Reservation.check_out_date > gap_start)
+    ).tuples().all())
+    chosen = []
+    for candidate in candidates:
+        if not _overlaps(booked, candidate.check_in_date, candidate.check_out_date):
+            bisect.insort(booked, (candidate.check_in_date, candidate.check_out_date))
+            chosen.append(candidate.id)
+
+    offered = WaitlistEntry.query.filter(WaitlistEntry.id.in_(chosen)).order_by(
+        WaitlistEntry.created_at, WaitlistEntry.id).all()
+    for entry in offered:
+        _offer(entry, room)
+    db.session.commit()
+    events.publish([
+        {'type': 'waitlist.offered', 'entry_id': entry.id, 'guest_id': entry.guest_id,
+         'reservation_id': entry.reservation_id, 'room_id': room.id, 'number': room.number,
+         'hold_expires_at': entry.hold_expires_at.isoformat()}
+        for entry in offered
+    ])
+    return offered
+
+
+def _offer(entry, room):
+    """Retiene la habitación para la solicitud con una reserva pendiente. No hace commit."""
+    now = datetime.utcnow()
+    expires = now + timedelta(hours=current_app.config['WAITLIST_HOLD_HOURS'])
+    entry.reservation = Reservation(
+        guest_id=entry.guest_id, room_id=room.id,
+        check_in_date=entry.check_in_date, check_out_date=entry.check_out_date,
+        guests_count=entry.guests_count,
+        total_price=pricing.stay_total(room, entry.check_in_date, entry.check_out_date),
+        status='pendiente',
+        special_requests=f"Lista de espera #{entry.id}"
+    )
+    entry.status = WaitlistEntry.OFFERED
+    entry.offered_at = now
+    entry.hold_expires_at = expires
+
+
+def offer_released(reservation):
+    """
+    Llamar después de cancelar una reserva (ya confirmada la cancelación):
+    vence las ofertas atrasadas y ofrece las fechas liberadas a la lista.
+    """
+    expire_offers()
+    return match_room(reservation.room_id, reservation.check_in_date, reservation.check_out_date)
+
+
+# -------------------------
+# Respuesta del huésped
+# -------------------------
+def _own_entry(entry_id, guest, status):
+    entry = db.session.get(WaitlistEntry, entry_id)
+    if entry is None or entry.guest_id != guest.id:
+        raise WaitlistError("La solicitud no existe.")
+    if entry.status != status:
+        raise WaitlistError(f"La solicitud está {entry.get_status_display().lower()}.")
+    return entry
+
+
+def accept(entry_id, guest):
+    """El huésped acepta la oferta: la reserva queda pendiente de confirmación como cualquier otra."""
+    entry = _own_entry(entry_id, guest, WaitlistEntry.OFFERED)
+    if entry.hold_expires_at <= datetime.utcnow():
+        expire_offers()
+        raise WaitlistError("La oferta ya venció.")
+    if entry.reservation.status not in Reservation.ACTIVE_STATUSES:
+        # Recepción canceló la retención mientras esperaba respuesta
+        entry.status = WaitlistEntry.EXPIRED
+        db.session.commit()
+        raise WaitlistError("La habitación ofrecida ya no está disponible.")
+    entry.status = WaitlistEntry.ACCEPTED
+    entry.reservation.special_requests = f"Lista de espera #{entry.id} (aceptada)"
+    db.session.commit()
+    return entry.reservation
+
+
+def decline(entry_id, guest):
+    """El huésped rechaza la oferta: se libera la habitación para el siguiente."""
+    entry = _own_entry(entry_id, guest, WaitlistEntry.OFFERED)
+    entry.status = WaitlistEntry.DECLINED
+    reservation = entry.reservation
+    reservation.status = 'cancelada'
+    db.session.commit()
+    offer_released(reservation)
+    return entry
+
+
+def withdraw(entry_id, guest):
+    """El huésped se retira de la lista de espera."""
+    entry = _own_entry(entry_id, guest, WaitlistEntry.WAITING)
+    entry.status = WaitlistEntry.WITHDRAWN
+    db.session.commit()
+    return entry
+
+
+# -------------------------
+# Vencimiento de ofertas
+# -------------------------
+def expire_offers(now=None):
+    """
+    Vence las ofertas sin respuesta (índice ix_waitlist_status_hold) y
+    vuelve a ofrecer sus habitaciones. Devuelve cuántas venció. Pensado para
+    correr también desde cron (`flask waitlist-expire`).
+    """
+    now = now or datetime.utcnow()
+    expired = WaitlistEntry.query.filter(
+        WaitlistEntry.status == WaitlistEntry.OFFERED,
+        WaitlistEntry.hold_expires_at <= now
+    ).all()
+    if not expired:
+        return 0
+    freed = []
+    for entry in expired:
+        entry.status = WaitlistEntry.EXPIRED
+        # Solo si la retención sigue pendiente: recepción pudo confirmarla a mano
+        if entry.reservation.status == 'pendiente':
+            entry.reservation.status = Reservation.EXPIRED_STATUS
+            freed.append((entry.reservation.room_id, entry.check_in_date, entry.check_out_date))
+    db.session.commit()
+
+    for room_id, check_in, check_out in freed:
+        match_room(room_id, check_in, check_out)
+    return len(expired)
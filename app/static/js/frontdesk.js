@@ -0,0 +1,75 @@
+// Actualización en vivo de las pantallas de recepción (dashboard, check-in, check-out)
+// a partir del flujo Server-Sent Events de /receptionist/events.
+document.addEventListener("DOMContentLoaded", () => {
+  const root = document.querySelector("[data-frontdesk-stream]")
+  if (!root || !window.EventSource) return
+
+  const page = root.dataset.frontdeskPage || "dashboard"
+  const today = new Date().toLocaleDateString("en-CA") // AAAA-MM-DD en hora local
+  const source = new EventSource(root.dataset.frontdeskStream)
+
+  // Contadores del dashboard y gráfico
+  const applySummary = (summary) => {
+    if (!summary) return
+    document.querySelectorAll("[data-summary]").forEach((el) => {
+      const value = summary[el.dataset.summary]
+      if (value !== undefined) el.textContent = value
+    })
+    if (typeof dashboardChart !== "undefined") {
+      dashboardChart.data.datasets[0].data = [
+        summary.available_rooms,
+        summary.occupied_rooms,
+        summary.pending_checkins,
+        summary.pending_checkouts,
+      ]
+      dashboardChart.update()
+    }
+  }
+
+  const removeRow = (reservationId) => {
+    const row = root.querySelector(`[data-reservation-id="${reservationId}"]`)
+    if (row) row.remove()
+  }
+
+  // Aviso para cambios que no se pueden dibujar sin recargar (p. ej. una llegada nueva)
+  const showRefreshNotice = () => {
+    if (root.querySelector(".frontdesk-refresh")) return
+    const notice = document.createElement("div")
+    notice.className = "alert alert-info frontdesk-refresh"
+    notice.innerHTML = 'Hay cambios nuevos para hoy. <a href="" class="alert-link">Actualizar</a>'
+    root.prepend(notice)
+  }
+
+  source.addEventListener("room.status", (e) => {
+    const data = JSON.parse(e.data)
+    applySummary(data.summary)
+    root.querySelectorAll(`[data-room-status="${data.room_id}"]`).forEach((el) => {
+      el.textContent = data.status
+    })
+  })
+
+  const onReservation = (e) => {
+    const data = JSON.parse(e.data)
+    applySummary(data.summary)
+
+    if (page === "checkin") {
+      if (["reservation.checked_in", "reservation.cancelled"].includes(e.type)) removeRow(data.reservation_id)
+      else if (e.type === "reservation.confirmed" && data.check_in_date === today) showRefreshNotice()
+    } else if (page === "checkout") {
+      if (e.type === "reservation.checked_out") removeRow(data.reservation_id)
+      else if (e.type === "reservation.checked_in" && data.check_out_date === today) showRefreshNotice()
+    }
+  }
+
+  ;[
+    "reservation.created",
+    "reservation.confirmed",
+    "reservation.checked_in",
+    "reservation.checked_out",
+    "reservation.cancelled",
+    "reservation.updated",
+  ].forEach((type) => source.addEventListener(type, onReservation))
+
+  // El servidor pide recargar si esta pantalla se quedó atrás
+  source.addEventListener("reload", () => window.location.reload())
+})
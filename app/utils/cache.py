@@ -0,0 +1,385 @@
+"""
+Caché de páginas y fragmentos.
+
+- LRUCache: caché en memoria del proceso (primer nivel, siempre activo).
+- SQLiteCache: backend compartido entre workers usando un archivo SQLite local.
+  Sirve como sustituto de un servidor compartido (Redis/Memcached): cualquier
+  clase con los métodos get/set/delete/counter/set_counter/incr/clear se puede conectar igual.
+- PageCache: extensión de Flask que cachea el HTML renderizado por una vista,
+  con llave por versión del catálogo y "stale-while-revalidate", y datos
+  calculados (búsquedas, reportes) en un LRU aparte con TTL.
+"""
+
+import itertools
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import request, session, make_response, current_app, g
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.exc import SQLAlchemyError
+
+
+class LRUCache:
+    """Caché LRU en memoria, segura entre hilos."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def counter(self, key):
+        return self._counters.get(key, 0)
+
+    def set_counter(self, key, value):
+        with self._lock:
+            self._counters[key] = value
+
+    def incr(self, key):
+        # Los contadores no entran en el LRU: perderlos reiniciaría versiones
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._counters.clear()
+
+
+class SQLiteCache:
+    """
+    Backend compartido sobre un archivo SQLite (visible para todos los workers).
+
+    Cada entrada guarda su vencimiento. Cada PRUNE_EVERY escrituras se borran
+    las vencidas y, si aún quedan más de max_entries, las que vencen antes:
+    las llaves con versión vieja o con query strings arbitrarios no se
+    acumulan para siempre.
+    """
+    PRUNE_EVERY = 200
+
+    def __init__(self, path, max_entries=10000, ttl=86400):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._writes = itertools.count(1)
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(cache)")]
+        if columns and 'expires' not in columns:
+            # Archivo de una versión anterior, sin vencimientos: es solo caché
+            conn.execute("DROP TABLE cache")
+        conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, expires REAL NOT NULL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_expires ON cache (expires)")
+        conn.execute("CREATE TABLE IF NOT EXISTS counters (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def after_fork(self):
+        # Una conexión SQLite no puede usarse desde dos procesos
+        self._local = threading.local()
+
+    def get(self, key):
+        row = self._conn().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires > ?", (key, time.time())
+        ).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def set(self, key, value, ttl=None):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+            (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), time.time() + (ttl or self.ttl))
+        )
+        if next(self._writes) % self.PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self):
+        """Borra las entradas vencidas y deja como máximo max_entries."""
+        conn = self._conn()
+        conn.execute("DELETE FROM cache WHERE expires <= ?", (time.time(),))
+        conn.execute(
+            "DELETE FROM cache WHERE key IN "
+            "(SELECT key FROM cache ORDER BY expires DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def delete(self, key):
+        self._conn().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def counter(self, key):
+        row = self._conn().execute("SELECT value FROM counters WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def set_counter(self, key, value):
+        self._conn().execute("INSERT OR REPLACE INTO counters (key, value) VALUES (?, ?)", (key, value))
+
+    def incr(self, key):
+        conn = self._conn()
+        conn.execute(
+            "INSERT INTO counters (key, value) VALUES (?, 1) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + 1",
+            (key,)
+        )
+        return conn.execute("SELECT value FROM counters WHERE key = ?", (key,)).fetchone()[0]
+
+    def clear(self):
+        conn = self._conn()
+        conn.execute("DELETE FROM cache")
+        conn.execute("DELETE FROM counters")
+
+
+class PageCache:
+    """
+    Cachea páginas públicas renderizadas.
+
+    La llave incluye la versión del "namespace" (p. ej. 'catalog'); al cambiar una
+    habitación la versión sube y las páginas viejas dejan de usarse sin tener que
+    borrarlas. Si la página expira (TTL) o la versión cambió mientras otro hilo ya
+    la está regenerando, se sirve la copia anterior en lugar de esperar a la BD.
+    """
+
+    def __init__(self, app=None):
+        self.local = LRUCache()
+        self.values = LRUCache()
+        self.shared = None
+        self.ttl = 300
+        self.processes = 1
+        self.epoch = ''
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self._session_hooks = False
+        self._watched = set()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.local = LRUCache(app.config.get('PAGE_CACHE_MAX_ENTRIES', 256))
+        # Una llave por combinación de fechas: aparte, para no desplazar páginas
+        self.values = LRUCache(app.config.get('PAGE_CACHE_MAX_VALUES', 1024))
+        self.ttl = app.config.get('PAGE_CACHE_TTL', 300)
+        self.processes = app.config.get('WEB_WORKERS') or 1
+        backend = app.config.get('PAGE_CACHE_BACKEND', 'memory')
+        if backend == 'sqlite':
+            self.shared = SQLiteCache(app.config['PAGE_CACHE_PATH'],
+                                      max_entries=app.config.get('PAGE_CACHE_SHARED_MAX_ENTRIES', 10000),
+                                      ttl=app.config.get('PAGE_CACHE_STALE_TTL', 86400))
+        elif backend != 'memory':
+            raise ValueError(f"Backend de caché no soportado: {backend}")
+        # En memoria las versiones vuelven a 0 al reiniciar el proceso: el epoch
+        # evita que un ETag anterior al reinicio coincida por casualidad
+        self.epoch = 'shared' if self.shared is not None else str(time.time_ns())
+        app.extensions['page_cache'] = self
+
+    def after_fork(self):
+        """Llamar en cada worker cuando la app se cargó antes del fork."""
+        self.epoch = 'shared' if self.shared is not None else str(time.time_ns())
+        if self.shared is not None:
+            self.shared.after_fork()
+
+    # -------------------------
+    # Versiones
+    # -------------------------
+    @property
+    def versions_shared(self):
+        """
+        Las versiones de este proceso reflejan los cambios de todos los workers.
+        Con backend "memory" y varios workers no: un cambio hecho en otro
+        worker no sube la versión aquí.
+        """
+        return self.shared is not None or self.processes == 1
+
+    def version(self, namespace):
+        """Versión actual del namespace (0 si nunca cambió)."""
+        return (self.shared or self.local).counter(f"version:{namespace}")
+
+    def bump(self, namespace):
+        """Invalida todo lo cacheado bajo el namespace."""
+        store = self.shared or self.local
+        store.set_counter(f"modified:{namespace}", int(time.time()))
+        return store.incr(f"version:{namespace}")
+
+    def last_modified(self, namespace):
+        """Momento (epoch) del último cambio del namespace, o 0 si no se conoce."""
+        return (self.shared or self.local).counter(f"modified:{namespace}")
+
+    def watch(self, model, namespace, key=None):
+        """
+        Sube la versión del namespace cuando se inserta, actualiza o elimina una
+        instancia del modelo. Solo se aplica después del commit, así un rollback
+        no invalida nada. `key(obj)` permite versiones por sub-llave
+        (p. ej. por huésped): el namespace queda como 'namespace:<llave>'.
+        """
+        if (model, namespace) in self._watched:
+            return
+        self._watched.add((model, namespace))
+
+        def mark(mapper, connection, target):
+            pending = object_session(target).info.setdefault('page_cache_bumps', set())
+            pending.add(namespace if key is None else f"{namespace}:{key(target)}")
+
+        for name in ('after_insert', 'after_update', 'after_delete'):
+            event.listen(model, name, mark)
+
+        if not self._session_hooks:
+            event.listen(Session, 'after_commit', self._flush_bumps)
+            event.listen(Session, 'after_rollback', self._drop_bumps)
+            self._session_hooks = True
+
+    def _flush_bumps(self, session):
+        for namespace in session.info.pop('page_cache_bumps', ()):
+            self.bump(namespace)
+
+    def _drop_bumps(self, session):
+        session.info.pop('page_cache_bumps', None)
+
+    # -------------------------
+    # Entradas
+    # -------------------------
+    def get(self, key):
+        entry = self.local.get(key)
+        if entry is None and self.shared is not None:
+            entry = self.shared.get(key)
+            if entry is not None:
+                self.local.set(key, entry)
+        return entry
+
+    def set(self, key, entry):
+        self.local.set(key, entry)
+        if self.shared is not None:
+            self.shared.set(key, entry)
+
+    def clear(self):
+        self.local.clear()
+        self.values.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+    def get_value(self, key, ttl=None):
+        """
+        Dato guardado con set_value, o None si no está, tiene más de `ttl`
+        segundos (PAGE_CACHE_TTL por defecto) o las versiones no son
+        compartidas entre workers.
+        """
+        if not self.versions_shared:
+            return None
+        entry = self.values.get(key)
+        if entry is None and self.shared is not None:
+            entry = self.shared.get(f"value:{key}")
+            if entry is not None:
+                self.values.set(key, entry)
+        if entry is None or time.time() - entry[0] >= (ttl or self.ttl):
+            return None
+        return entry[1]
+
+    def set_value(self, key, value, ttl=None):
+        """Guarda un dato calculado. Con versiones por proceso y varios workers no guarda nada."""
+        if not self.versions_shared:
+            return
+        entry = (time.time(), value)
+        self.values.set(key, entry)
+        if self.shared is not None:
+            self.shared.set(f"value:{key}", entry, ttl=ttl or self.ttl)
+
+    def _request_key(self):
+        return f"page:{request.full_path}"
+
+    def stale(self):
+        """Última copia conocida de la página actual, sin importar su versión."""
+        entry = self.get(f"{self._request_key()}|latest")
+        return entry[1] if entry else None
+
+    def _begin_refresh(self, key):
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def _end_refresh(self, key):
+        with self._refresh_lock:
+            self._refreshing.discard(key)
+
+    @staticmethod
+    def cacheable():
+        """Solo visitantes anónimos, GET y sin mensajes flash pendientes."""
+        from flask_login import current_user
+        return (
+            request.method == 'GET'
+            and not current_user.is_authenticated
+            and '_flashes' not in session
+        )
+
+    def cached(self, namespace, ttl=None):
+        """Decorador para vistas cuyo HTML solo depende del namespace dado."""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not current_app.config.get('PAGE_CACHE_ENABLED', True) or not self.cacheable():
+                    return view(*args, **kwargs)
+
+                base_key = self._request_key()
+                key = f"{base_key}|{namespace}:{self.version(namespace)}"
+                entry = self.get(key)
+                now = time.time()
+                if entry and now - entry[0] < (ttl or self.ttl):
+                    return entry[1]
+
+                # Otro hilo ya está regenerando: servir la copia anterior
+                if not self._begin_refresh(key):
+                    stale = entry or self.get(f"{base_key}|latest")
+                    if stale:
+                        return stale[1]
+                    return view(*args, **kwargs)
+
+                try:
+                    try:
+                        response = make_response(view(*args, **kwargs))
+                    except SQLAlchemyError:
+                        stale = entry or self.get(f"{base_key}|latest")
+                        if stale:
+                            return stale[1]
+                        raise
+
+                    if response.status_code == 200 and not g.get('page_cache_skip'):
+                        new_entry = (now, response.get_data(as_text=True))
+                        self.set(key, new_entry)
+                        self.set(f"{base_key}|latest", new_entry)
+                finally:
+                    self._end_refresh(key)
+                return response
+            return wrapper
+        return decorator
@@ -0,0 +1,133 @@
+"""
+Compresión de respuestas HTML/JSON (gzip y, si el paquete `brotli` está
+instalado, br).
+
+Solo se comprimen respuestas con un tipo de contenido permitido y de tamaño
+mayor al umbral; las descargas (PDF/XLSX, archivos estáticos) y las
+respuestas ya codificadas se dejan tal cual. Las respuestas en streaming se
+comprimen por bloques sin esperar a que terminen.
+"""
+
+import gzip
+import zlib
+
+from flask import request
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # pragma: no cover - dependencia opcional
+    brotli = None
+
+
+DEFAULT_MIMETYPES = (
+    'text/html',
+    'text/css',
+    'text/plain',
+    'text/csv',
+    'application/json',
+    'application/javascript',
+    'image/svg+xml',
+)
+
+
+class Compress:
+
+    def __init__(self, app=None):
+        self.min_size = 500
+        self.level = 6
+        self.mimetypes = DEFAULT_MIMETYPES
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config.get('COMPRESS_ENABLED', True):
+            return
+        self.min_size = app.config.get('COMPRESS_MIN_SIZE', 500)
+        self.level = app.config.get('COMPRESS_LEVEL', 6)
+        self.mimetypes = tuple(app.config.get('COMPRESS_MIMETYPES') or DEFAULT_MIMETYPES)
+        app.after_request(self.after_request)
+        app.extensions['compress'] = self
+
+    def choose_encoding(self):
+        accepted = request.accept_encodings
+        if brotli is not None and accepted['br']:
+            return 'br'
+        if accepted['gzip']:
+            return 'gzip'
+        return None
+
+    def should_compress(self, response):
+        if response.status_code < 200 or response.status_code in (204, 206, 304):
+            return False
+        if request.method == 'HEAD' or 'Content-Encoding' in response.headers:
+            return False
+        # send_file (PDF, XLSX, estáticos) usa direct_passthrough
+        if response.direct_passthrough:
+            return False
+        if response.mimetype not in self.mimetypes:
+            return False
+        if not response.is_streamed and response.content_length is not None \
+                and response.content_length < self.min_size:
+            return False
+        return True
+
+    def after_request(self, response):
+        vary = response.vary
+        if response.mimetype in self.mimetypes:
+            vary.add('Accept-Encoding')
+        if not self.should_compress(response):
+            return response
+
+        encoding = self.choose_encoding()
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = self._stream(response.response, encoding)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            response.set_data(self._compress(data, encoding))
+
+        response.headers['Content-Encoding'] = encoding
+        # El cuerpo cambió: un ETag fuerte ya no identifica los mismos bytes
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    def _compress(self, data, encoding):
+        if encoding == 'br':
+            return brotli.compress(data, quality=min(self.level, 11))
+        return gzip.compress(data, compresslevel=self.level)
+
+    def _stream(self, chunks, encoding):
+        try:
+            yield from self._stream_chunks(chunks, encoding)
+        finally:
+            # Libera el iterable original (p. ej. stream_with_context) si el cliente se va
+            if hasattr(chunks, 'close'):
+                chunks.close()
+
+    def _stream_chunks(self, chunks, encoding):
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=min(self.level, 11))
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode()
+                data = compressor.process(chunk) + compressor.flush()
+                if data:
+                    yield data
+            yield compressor.finish()
+        else:
+            # wbits=31 -> formato gzip; SYNC_FLUSH entrega cada bloque de inmediato
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode()
+                data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+                if data:
+                    yield data
+            yield compressor.flush()
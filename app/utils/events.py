@@ -0,0 +1,197 @@
+"""
+Difusión de eventos a pantallas abiertas (Server-Sent Events).
+
+- Backend "memory": los eventos se reparten entre los suscriptores del mismo
+  proceso. Suficiente con un solo worker.
+- Backend "sqlite": los eventos se escriben en un archivo SQLite local que hace
+  de broker; cada proceso tiene un único hilo que lee los nuevos y los reparte
+  a sus suscriptores. El costo crece con los eventos, no con las pantallas.
+  Ese hilo anota en la tabla listeners que su proceso tiene pantallas
+  conectadas, así cualquier proceso sabe si vale la pena publicar.
+"""
+
+import itertools
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+# Cada cuántos segundos un proceso con pantallas renueva su fila en listeners;
+# una fila sin renovar en 3 intervalos es de un proceso que ya no está
+LISTENER_HEARTBEAT = 5
+
+
+class Subscription:
+
+    def __init__(self, broker, max_queue):
+        self.broker = broker
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.overflowed = False
+
+    def get(self, timeout):
+        """Siguiente evento o None si no llegó nada en `timeout` segundos."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            # Cliente demasiado lento: se le pide recargar en vez de acumular memoria
+            self.overflowed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.broker.unsubscribe(self)
+
+
+class EventBroker:
+
+    def __init__(self, app=None):
+        self.backend = 'memory'
+        self.path = None
+        self.poll_interval = 1.0
+        self.max_queue = 100
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._poller = None
+        self._local = threading.local()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.backend = app.config.get('EVENTS_BACKEND', 'memory')
+        self.path = app.config.get('EVENTS_PATH')
+        self.poll_interval = app.config.get('EVENTS_POLL_INTERVAL', 1.0)
+        self.max_queue = app.config.get('EVENTS_MAX_QUEUE', 100)
+        if self.backend == 'sqlite':
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = self._conn()
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS events "
+                "(id INTEGER PRIMARY KEY AUTOINCREMENT, created REAL NOT NULL, payload TEXT NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS listeners "
+                "(pid INTEGER PRIMARY KEY, subscribers INTEGER NOT NULL, seen REAL NOT NULL)"
+            )
+        elif self.backend != 'memory':
+            raise ValueError(f"Backend de eventos no soportado: {self.backend}")
+        app.extensions['events'] = self
+
+    def after_fork(self):
+        self._local = threading.local()
+        self._poller = None
+        with self._lock:
+            self._subscribers.clear()
+
+    # -------------------------
+    # Suscripción
+    # -------------------------
+    def subscribe(self):
+        subscription = Subscription(self, self.max_queue)
+        with self._lock:
+            self._subscribers.add(subscription)
+        if self.backend == 'sqlite':
+            self._heartbeat(self._conn())
+            self._ensure_poller()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    def has_listeners(self):
+        """Hay alguna pantalla conectada: en este proceso o, con sqlite, en cualquier otro."""
+        if self._subscribers:
+            return True
+        if self.backend != 'sqlite':
+            return False
+        return self._conn().execute(
+            "SELECT 1 FROM listeners WHERE subscribers > 0 AND seen > ? LIMIT 1",
+            (time.time() - 3 * LISTENER_HEARTBEAT,)
+        ).fetchone() is not None
+
+    # -------------------------
+    # Publicación
+    # -------------------------
+    def publish(self, events):
+        """Publica una lista de eventos (diccionarios serializables a JSON)."""
+        if not events:
+            return
+        if self.backend == 'sqlite':
+            now = time.time()
+            self._conn().executemany(
+                "INSERT INTO events (created, payload) VALUES (?, ?)",
+                [(now, json.dumps(event, default=str)) for event in events]
+            )
+            return
+        for event in events:
+            self._dispatch({**event, 'id': next(self._ids)})
+
+    def _dispatch(self, event):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.put(event)
+
+    # -------------------------
+    # Broker SQLite
+    # -------------------------
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _ensure_poller(self):
+        with self._lock:
+            if self._poller is None:
+                self._poller = threading.Thread(target=self._poll, name='events-poller', daemon=True)
+                self._poller.start()
+
+    def _heartbeat(self, conn):
+        conn.execute(
+            "INSERT OR REPLACE INTO listeners (pid, subscribers, seen) VALUES (?, ?, ?)",
+            (os.getpid(), len(self._subscribers), time.time())
+        )
+
+    def _poll(self):
+        conn = self._conn()
+        last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()[0]
+        last_purge = last_beat = time.time()
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._poller = None
+                    conn.execute("DELETE FROM listeners WHERE pid = ?", (os.getpid(),))
+                    return
+            if time.time() - last_beat >= LISTENER_HEARTBEAT:
+                self._heartbeat(conn)
+                last_beat = time.time()
+            rows = conn.execute(
+                "SELECT id, payload FROM events WHERE id > ? ORDER BY id", (last_id,)
+            ).fetchall()
+            for event_id, payload in rows:
+                self._dispatch({**json.loads(payload), 'id': event_id})
+                last_id = event_id
+            if time.time() - last_purge > 600:
+                # Los eventos solo sirven a pantallas ya conectadas
+                conn.execute("DELETE FROM events WHERE created < ?", (time.time() - 3600,))
+                last_purge = time.time()
+            time.sleep(self.poll_interval)
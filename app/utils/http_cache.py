@@ -0,0 +1,73 @@
+"""
+GET condicional (ETag / Last-Modified) a partir de las versiones de PageCache.
+
+El ETag se calcula solo con marcadores baratos (versión del catálogo, versión de
+las reservas del huésped, usuario actual), así que un 304 se responde antes de
+ejecutar la vista: sin consultas de listas y sin renderizar plantillas.
+
+Con versiones por proceso (backend "memory" y varios workers) el ETag no
+cambiaría al modificar los datos desde otro worker: ahí no se responde 304.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import request, session, current_app, make_response
+from flask_login import current_user
+
+
+def _resolve(namespaces):
+    return [ns() if callable(ns) else ns for ns in namespaces]
+
+
+def conditional(*namespaces):
+    """
+    Decorador para vistas GET cuyo HTML depende solo de los namespaces dados.
+
+    Cada namespace puede ser un texto ('catalog') o una función que lo
+    construye en la petición (p. ej. lambda: f"reservations:{current_user.id}").
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # Los mensajes flash se consumen al renderizar: no se puede responder 304
+            if request.method != 'GET' or '_flashes' in session:
+                return view(*args, **kwargs)
+
+            cache = current_app.extensions['page_cache']
+            if not cache.versions_shared:
+                return view(*args, **kwargs)
+            resolved = _resolve(namespaces)
+            if current_user.is_authenticated:
+                # La barra de navegación muestra el nombre y rol del usuario
+                resolved.append(f"user:{current_user.id}")
+
+            parts = [cache.epoch, request.full_path] + [f"{ns}:{cache.version(ns)}" for ns in resolved]
+            etag = hashlib.sha1("|".join(parts).encode()).hexdigest()
+            modified = [cache.last_modified(ns) for ns in resolved]
+            last_modified = None
+            if all(modified):
+                last_modified = datetime.fromtimestamp(max(modified), tz=timezone.utc)
+
+            not_modified = False
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(etag)
+            elif last_modified and request.if_modified_since:
+                not_modified = last_modified <= request.if_modified_since
+
+            if not_modified:
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            if last_modified:
+                response.last_modified = last_modified
+            # Siempre revalidar; las páginas con sesión no se guardan en cachés compartidas
+            response.headers['Cache-Control'] = 'private, no-cache' if current_user.is_authenticated else 'no-cache'
+            return response
+        return wrapper
+    return decorator
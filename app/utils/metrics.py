@@ -0,0 +1,211 @@
+"""
+Métricas en formato Prometheus en /metrics.
+
+- Peticiones por endpoint (contador) y latencia (histograma).
+- Consultas SQL y tiempo en BD por endpoint (de SQLStats).
+- Pool de conexiones de SQLAlchemy (gauges por worker, sumados).
+- Duración y tamaño de las exportaciones PDF/XLSX.
+- Habitaciones y reservas por estado, calculadas al momento del scrape y
+  cacheadas METRICS_BUSINESS_TTL segundos.
+
+Con varios workers de gunicorn, gunicorn.conf.py define PROMETHEUS_MULTIPROC_DIR
+antes de cargar la app: cada proceso escribe sus valores en archivos de ese
+directorio y /metrics los agrega, así el scrape ve todo el servidor y no solo
+el worker que atendió la petición.
+
+Acceso: con METRICS_TOKEN el scraper manda "Authorization: Bearer <token>".
+Sin token /metrics solo responde a localhost (conexiones directas, no las
+reenviadas por un proxy) y a administradores con sesión, salvo
+METRICS_PUBLIC=True.
+"""
+
+import hmac
+import os
+import threading
+import time
+
+from flask import g, request, Response, abort
+from flask_login import current_user
+from sqlalchemy import func, select
+
+try:
+    from prometheus_client import (
+        CollectorRegistry, Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST, REGISTRY,
+    )
+    from prometheus_client import multiprocess
+    from prometheus_client.core import GaugeMetricFamily
+except ImportError:  # pragma: no cover - dependencia opcional
+    Counter = None
+
+EXPORT_MIMETYPES = {
+    'application/pdf': 'pdf',
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': 'xlsx',
+}
+
+LOOPBACK = {'127.0.0.1', '::1'}
+
+if Counter is not None:
+    REQUESTS = Counter(
+        'hotel_http_requests_total', 'Peticiones HTTP atendidas',
+        ['endpoint', 'method', 'status']
+    )
+    LATENCY = Histogram(
+        'hotel_http_request_duration_seconds', 'Latencia de las peticiones HTTP',
+        ['endpoint', 'method'],
+        buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+    )
+    DB_QUERIES = Counter('hotel_db_queries_total', 'Sentencias SQL ejecutadas', ['endpoint'])
+    DB_TIME = Counter('hotel_db_time_seconds_total', 'Tiempo acumulado en la BD', ['endpoint'])
+    POOL_CHECKED_OUT = Gauge(
+        'hotel_db_pool_checked_out', 'Conexiones del pool en uso', multiprocess_mode='livesum'
+    )
+    POOL_SIZE = Gauge(
+        'hotel_db_pool_size', 'Conexiones abiertas en el pool', multiprocess_mode='livesum'
+    )
+    POOL_OVERFLOW = Gauge(
+        'hotel_db_pool_overflow', 'Conexiones por encima del tamaño del pool', multiprocess_mode='livesum'
+    )
+    EXPORT_DURATION = Histogram(
+        'hotel_export_duration_seconds', 'Tiempo de generación de exportaciones',
+        ['endpoint', 'format'], buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+    )
+    EXPORT_SIZE = Histogram(
+        'hotel_export_size_bytes', 'Tamaño de las exportaciones',
+        ['endpoint', 'format'],
+        buckets=(10e3, 50e3, 100e3, 500e3, 1e6, 5e6, 10e6, 50e6)
+    )
+
+
+class _ProcessCollector:
+    """Métricas del registro global (un solo proceso, p. ej. `flask run`)."""
+
+    def collect(self):
+        return REGISTRY.collect()
+
+
+class BusinessCollector:
+    """Gauges de negocio calculados en el scrape, con caché corta."""
+
+    def __init__(self, engine, ttl):
+        self.engine = engine
+        self.ttl = ttl
+        self._cached = None
+        self._cached_at = 0
+        self._lock = threading.Lock()
+
+    def _load(self):
+        from app.models.room import Room
+        from app.models.reservation import Reservation
+        with self.engine.connect() as connection:
+            rooms = connection.execute(select(Room.status, func.count()).group_by(Room.status)).all()
+            reservations = connection.execute(
+                select(Reservation.status, func.count()).group_by(Reservation.status)
+            ).all()
+        return rooms, reservations
+
+    def collect(self):
+        with self._lock:
+            if self._cached is None or time.monotonic() - self._cached_at > self.ttl:
+                self._cached = self._load()
+                self._cached_at = time.monotonic()
+            rooms, reservations = self._cached
+
+        room_gauge = GaugeMetricFamily('hotel_rooms', 'Habitaciones por estado', labels=['status'])
+        for status, count in rooms:
+            room_gauge.add_metric([status or 'sin_estado'], count)
+        yield room_gauge
+
+        reservation_gauge = GaugeMetricFamily('hotel_reservations', 'Reservas por estado', labels=['status'])
+        for status, count in reservations:
+            reservation_gauge.add_metric([status or 'sin_estado'], count)
+        yield reservation_gauge
+
+
+class Metrics:
+
+    def __init__(self, app=None):
+        self.enabled = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config.get('METRICS_ENABLED', True):
+            return
+        if Counter is None:
+            app.logger.warning("prometheus_client no está instalado: /metrics desactivado")
+            return
+        from app import db
+        self.enabled = True
+        self.token = app.config.get('METRICS_TOKEN')
+        self.public = app.config.get('METRICS_PUBLIC', False)
+        with app.app_context():
+            business = BusinessCollector(db.engine, app.config.get('METRICS_BUSINESS_TTL', 30))
+        if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+            self.registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(self.registry)
+        else:
+            self.registry = CollectorRegistry()
+            self.registry.register(_ProcessCollector())
+        self.registry.register(business)
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+        app.extensions['metrics'] = self
+
+    # -------------------------
+    # Camino caliente: solo relojes y contadores
+    # -------------------------
+    @staticmethod
+    def before_request():
+        g.metrics_start = time.perf_counter()
+
+    def after_request(self, response):
+        start = g.get('metrics_start')
+        if start is None or request.endpoint == 'metrics':
+            return response
+        elapsed = time.perf_counter() - start
+        endpoint = request.endpoint or 'desconocido'
+
+        REQUESTS.labels(endpoint, request.method, response.status_code).inc()
+        LATENCY.labels(endpoint, request.method).observe(elapsed)
+
+        stats = g.get('sql_stats')
+        if stats is not None:
+            DB_QUERIES.labels(endpoint).inc(stats['count'])
+            DB_TIME.labels(endpoint).inc(stats['time'])
+            self._pool_gauges()
+
+        export_format = EXPORT_MIMETYPES.get(response.mimetype)
+        if export_format:
+            EXPORT_DURATION.labels(endpoint, export_format).observe(elapsed)
+            if response.content_length is not None:
+                EXPORT_SIZE.labels(endpoint, export_format).observe(response.content_length)
+        return response
+
+    @staticmethod
+    def _pool_gauges():
+        from app import db
+        pool = db.engine.pool
+        # QueuePool (PostgreSQL) expone contadores; otros pools (SQLite) no
+        if hasattr(pool, 'checkedout'):
+            POOL_CHECKED_OUT.set(pool.checkedout())
+            POOL_SIZE.set(pool.checkedin() + pool.checkedout())
+            POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+    # -------------------------
+    # Scrape
+    # -------------------------
+    def allowed(self):
+        if self.token:
+            return hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {self.token}")
+        if self.public:
+            return True
+        # Detrás de un proxy local todo llega desde 127.0.0.1: lo reenviado no cuenta como local
+        if request.remote_addr in LOOPBACK and 'X-Forwarded-For' not in request.headers:
+            return True
+        return current_user.is_authenticated and current_user.is_admin()
+
+    def metrics_view(self):
+        if not self.allowed():
+            abort(403)
+        return Response(generate_latest(self.registry), mimetype=CONTENT_TYPE_LATEST)
@@ -0,0 +1,93 @@
+"""
+Hash de contraseñas en un pool de hilos acotado.
+
+scrypt/pbkdf2 son costosos a propósito. Con una ráfaga de logins (cambio de
+turno o un ataque de credenciales) cada petición se quedaba calculando hashes
+y los workers dejaban de atender el resto del sitio. Aquí el número de hashes
+simultáneos tiene un tope y, si la cola está llena, se rechaza de inmediato
+con PasswordHasherBusy en lugar de encolar sin límite.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, generate_password_hash, check_password_hash
+
+
+class PasswordHasherBusy(Exception):
+    """El pool de hash está saturado; reintentar más tarde."""
+
+
+def _method_params(method):
+    """
+    Método y parámetros con los valores por omisión de werkzeug completados:
+    "pbkdf2:sha256" y "pbkdf2:sha256:1000000" describen el mismo hash.
+    """
+    name, *args = method.split(':')
+    if name == 'scrypt':
+        defaults = [32768, 8, 1]
+    elif name == 'pbkdf2':
+        defaults = ['sha256', DEFAULT_PBKDF2_ITERATIONS]
+    else:
+        return (name, *args)
+    args += defaults[len(args):]
+    return (name, *(type(default)(value) for value, default in zip(args, defaults)))
+
+
+class PasswordHasher:
+
+    def __init__(self, app=None):
+        self.method = 'scrypt:32768:8:1'
+        self.workers = os.cpu_count() or 2
+        self.queue_limit = self.workers * 4
+        self.timeout = 10
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(self.queue_limit)
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.method = app.config.get('PASSWORD_HASH_METHOD', self.method)
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS') or self.workers
+        self.queue_limit = app.config.get('PASSWORD_HASH_QUEUE') or self.workers * 4
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', self.timeout)
+        self.after_fork()
+        app.extensions['password_hasher'] = self
+
+    def after_fork(self):
+        # El pool se crea en el primer uso: nunca en el maestro de gunicorn
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(self.queue_limit)
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='pwhash')
+            return self._executor
+
+    def _run(self, fn, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy()
+        try:
+            future = self._pool().submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # El hash sigue corriendo y ocupa su lugar hasta terminar; la petición no espera más
+            raise PasswordHasherBusy() from None
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, method=self.method)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True si el hash guardado usa otro método o parámetros que los configurados."""
+        return _method_params(password_hash.split('$', 1)[0]) != _method_params(self.method)
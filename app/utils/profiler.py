@@ -0,0 +1,228 @@
+"""
+Perfilado de peticiones bajo demanda.
+
+Perfila una fracción de las peticiones (o solo algunos endpoints) y deja un
+archivo por petición en PROFILER_DIR:
+
+- "sample": un hilo toma la pila del hilo de la petición cada
+  PROFILER_INTERVAL_MS y escribe pilas colapsadas (.collapsed), el formato de
+  flamegraph.pl / speedscope. Sobrecarga baja, apto para producción.
+- "cprofile": cProfile durante la petición, guardado como .pstats (snakeviz,
+  `python -m pstats`). Más preciso pero más caro.
+- "both": las dos cosas.
+
+La configuración fija sale de Settings (PROFILER_SAMPLE_RATE/ENDPOINTS). Desde
+/admin/profiler se puede activar por unos minutos sin reiniciar: el plan se
+guarda en PROFILER_DIR/control.json y cada worker lo relee como mucho una vez
+por segundo (un os.stat), así llega a todos los procesos de gunicorn.
+"""
+
+import cProfile
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from flask import g, request
+
+CONTROL_FILE = 'control.json'
+PROFILE_SUFFIXES = ('.collapsed', '.pstats')
+
+
+class StackSampler:
+    """Muestrea la pila de un hilo a intervalo fijo desde otro hilo."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiler-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def collapsed(self):
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class RequestProfiler:
+
+    def __init__(self, app=None):
+        self.directory = None
+        self.mode = 'sample'
+        self.interval = 0.005
+        self.sample_rate = 0.0
+        self.endpoints = set()
+        self.max_files = 200
+        self._plan = None
+        self._plan_mtime = None
+        self._plan_checked = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config.get('PROFILER_ENABLED', True):
+            return
+        self.directory = app.config['PROFILER_DIR']
+        os.makedirs(self.directory, exist_ok=True)
+        self.mode = app.config.get('PROFILER_MODE', 'sample')
+        if self.mode not in ('sample', 'cprofile', 'both'):
+            raise ValueError(f"Modo de perfilado no soportado: {self.mode}")
+        self.interval = app.config.get('PROFILER_INTERVAL_MS', 5) / 1000
+        self.sample_rate = app.config.get('PROFILER_SAMPLE_RATE', 0.0)
+        self.endpoints = set(app.config.get('PROFILER_ENDPOINTS') or [])
+        self.max_files = app.config.get('PROFILER_MAX_FILES', 200)
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+        app.teardown_request(self.teardown_request)
+        app.extensions['profiler'] = self
+
+    # -------------------------
+    # Plan activado desde el panel (compartido entre workers)
+    # -------------------------
+    @property
+    def control_path(self):
+        return os.path.join(self.directory, CONTROL_FILE)
+
+    def plan(self):
+        """Plan vigente de control.json o None; se relee como mucho cada segundo."""
+        now = time.time()
+        if now - self._plan_checked >= 1:
+            self._plan_checked = now
+            try:
+                mtime = os.stat(self.control_path).st_mtime
+            except FileNotFoundError:
+                self._plan, self._plan_mtime = None, None
+            else:
+                if mtime != self._plan_mtime:
+                    try:
+                        with open(self.control_path) as f:
+                            self._plan = json.load(f)
+                    except (OSError, ValueError):
+                        self._plan = None
+                    self._plan_mtime = mtime
+        if self._plan and self._plan.get('expires', 0) > now:
+            return self._plan
+        return None
+
+    def arm(self, endpoints=(), rate=1.0, minutes=10, mode=None):
+        plan = {
+            'endpoints': sorted(endpoints),
+            'rate': rate,
+            'expires': time.time() + minutes * 60,
+            'mode': mode or self.mode,
+        }
+        tmp = self.control_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(plan, f)
+        os.replace(tmp, self.control_path)
+        self._plan_checked = 0
+        return plan
+
+    def disarm(self):
+        try:
+            os.remove(self.control_path)
+        except FileNotFoundError:
+            pass
+        self._plan_checked = 0
+
+    def _decide(self, endpoint):
+        """Modo con el que perfilar esta petición, o None."""
+        plan = self.plan()
+        if plan is not None:
+            if (not plan['endpoints'] or endpoint in plan['endpoints']) and random.random() < plan['rate']:
+                return plan.get('mode', self.mode)
+        if self.sample_rate and (not self.endpoints or endpoint in self.endpoints):
+            if random.random() < self.sample_rate:
+                return self.mode
+        return None
+
+    # -------------------------
+    # Ciclo de la petición
+    # -------------------------
+    def before_request(self):
+        if request.endpoint in (None, 'static'):
+            return
+        mode = self._decide(request.endpoint)
+        if mode is None:
+            return
+        profile = {
+            'name': f"{time.strftime('%Y%m%d-%H%M%S')}-{request.endpoint}-{os.getpid()}-{random.randrange(16**4):04x}",
+            'start': time.perf_counter(),
+            'sampler': None,
+            'cprofile': None,
+        }
+        if mode in ('sample', 'both'):
+            profile['sampler'] = StackSampler(threading.get_ident(), self.interval)
+            profile['sampler'].start()
+        if mode in ('cprofile', 'both'):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Ya hay otro perfilador activo en el proceso (Python 3.12+)
+                profiler = None
+            profile['cprofile'] = profiler
+        g.request_profile = profile
+
+    @staticmethod
+    def after_request(response):
+        profile = g.get('request_profile')
+        if profile is not None:
+            response.headers['X-Profile'] = profile['name']
+        return response
+
+    def teardown_request(self, exc):
+        profile = g.pop('request_profile', None)
+        if profile is None:
+            return
+        elapsed_ms = (time.perf_counter() - profile['start']) * 1000
+        base = os.path.join(self.directory, f"{profile['name']}-{elapsed_ms:.0f}ms")
+        if profile['cprofile'] is not None:
+            profile['cprofile'].disable()
+            profile['cprofile'].dump_stats(base + '.pstats')
+        if profile['sampler'] is not None:
+            profile['sampler'].stop()
+            with open(base + '.collapsed', 'w') as f:
+                f.write(profile['sampler'].collapsed())
+        self._prune()
+
+    # -------------------------
+    # Archivos
+    # -------------------------
+    def profiles(self):
+        """Perfiles guardados, del más reciente al más antiguo."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(PROFILE_SUFFIXES):
+                stat = entry.stat()
+                entries.append({'name': entry.name, 'size': stat.st_size, 'mtime': stat.st_mtime})
+        entries.sort(key=lambda e: e['mtime'], reverse=True)
+        return entries
+
+    def _prune(self):
+        for entry in self.profiles()[self.max_files:]:
+            try:
+                os.remove(os.path.join(self.directory, entry['name']))
+            except FileNotFoundError:
+                pass
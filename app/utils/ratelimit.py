@@ -0,0 +1,196 @@
+"""
+Limitación de peticiones con token bucket.
+
+Cada llave (ruta + usuario, o ruta + IP para anónimos) tiene un balde de
+`capacidad` fichas que se rellena a `capacidad / periodo` fichas por segundo.
+Los límites se configuran por blueprint o por endpoint en RATE_LIMITS, p. ej.
+{"auth": "10/minute", "guest.reserve": "20/minute"}; el endpoint tiene
+prioridad sobre el blueprint.
+
+La IP es request.remote_addr. Detrás de proxies, TRUSTED_PROXY_HOPS activa
+ProxyFix, que toma la dirección que agregó el último proxy de confianza; la
+primera de X-Forwarded-For la escribe el cliente y no sirve como llave.
+
+- MemoryBucketStore: por proceso, O(1) por petición, con tope de llaves (LRU).
+- SQLiteBucketStore: compartido entre workers a través de un archivo SQLite,
+  sustituto local de un almacén compartido (Redis o similar).
+"""
+
+import itertools
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask import request, current_app
+from flask_login import current_user
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+def parse_limit(value):
+    """'10/minute' -> (10, 60)"""
+    count, _, period = value.partition('/')
+    return int(count), PERIODS[period.strip().rstrip('s')]
+
+
+class MemoryBucketStore:
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key, capacity, period, now=None):
+        """Consume una ficha. Devuelve (permitido, fichas restantes, segundos de espera)."""
+        now = now or time.monotonic()
+        rate = capacity / period
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, int(tokens), 0 if allowed else (1 - tokens) / rate
+
+    def after_fork(self):
+        self._buckets.clear()
+
+
+class SQLiteBucketStore:
+    """
+    Cada fila guarda cuándo su balde vuelve a estar lleno (`full`). Cada
+    PRUNE_EVERY escrituras se borran los baldes ya llenos (equivalen a no
+    tener fila) y, si aún quedan más de max_keys, los que se llenan antes,
+    igual que el tope del almacén en memoria.
+    """
+    PRUNE_EVERY = 200
+
+    def __init__(self, path, max_keys=100000):
+        self.path = path
+        self.max_keys = max_keys
+        self._writes = itertools.count(1)
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(buckets)")]
+        if columns and 'full' not in columns:
+            # Archivo de una versión anterior: perderlo solo rellena los baldes
+            conn.execute("DROP TABLE buckets")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets "
+            "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, full REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_buckets_full ON buckets (full)")
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key, capacity, period, now=None):
+        # Reloj de pared: debe ser comparable entre procesos
+        now = now or time.time()
+        rate = capacity / period
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            conn.execute("INSERT OR REPLACE INTO buckets (key, tokens, updated, full) VALUES (?, ?, ?, ?)",
+                         (key, tokens, now, now + (capacity - tokens) / rate))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        if next(self._writes) % self.PRUNE_EVERY == 0:
+            self.prune(now)
+        return allowed, int(tokens), 0 if allowed else (1 - tokens) / rate
+
+    def prune(self, now=None):
+        """Borra los baldes que ya se rellenaron y deja como máximo max_keys."""
+        conn = self._conn()
+        conn.execute("DELETE FROM buckets WHERE full <= ?", (now or time.time(),))
+        conn.execute(
+            "DELETE FROM buckets WHERE key IN "
+            "(SELECT key FROM buckets ORDER BY full DESC LIMIT -1 OFFSET ?)",
+            (self.max_keys,)
+        )
+
+    def after_fork(self):
+        self._local = threading.local()
+
+
+class RateLimiter:
+
+    def __init__(self, app=None):
+        self.store = MemoryBucketStore()
+        self.limits = {}
+        self.methods = {'POST'}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config.get('RATE_LIMIT_ENABLED', True):
+            return
+        backend = app.config.get('RATE_LIMIT_BACKEND', 'memory')
+        if backend == 'sqlite':
+            self.store = SQLiteBucketStore(app.config['RATE_LIMIT_PATH'],
+                                           app.config.get('RATE_LIMIT_MAX_KEYS', 100000))
+        elif backend == 'memory':
+            self.store = MemoryBucketStore(app.config.get('RATE_LIMIT_MAX_KEYS', 100000))
+        else:
+            raise ValueError(f"Backend de rate limit no soportado: {backend}")
+        self.limits = {name: parse_limit(value) for name, value in (app.config.get('RATE_LIMITS') or {}).items()}
+        self.methods = {method.upper() for method in app.config.get('RATE_LIMIT_METHODS', ['POST'])}
+        app.before_request(self.check)
+        app.extensions['rate_limiter'] = self
+
+    def after_fork(self):
+        self.store.after_fork()
+
+    def limit_for(self, endpoint):
+        if not endpoint:
+            return None
+        return self.limits.get(endpoint) or self.limits.get(endpoint.split('.', 1)[0])
+
+    def client_key(self):
+        if current_user.is_authenticated:
+            return f"user:{current_user.id}"
+        # Detrás de proxies, ProxyFix (TRUSTED_PROXY_HOPS) ya dejó aquí la IP real
+        return f"ip:{request.remote_addr}"
+
+    def check(self):
+        if request.method not in self.methods:
+            return None
+        limit = self.limit_for(request.endpoint)
+        if limit is None:
+            return None
+        capacity, period = limit
+        allowed, remaining, retry_after = self.store.hit(
+            f"{request.endpoint}|{self.client_key()}", capacity, period
+        )
+        if allowed:
+            return None
+        response = current_app.response_class(
+            'Demasiadas solicitudes. Intenta de nuevo en unos segundos.', status=429, mimetype='text/plain'
+        )
+        response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+        response.headers['X-RateLimit-Limit'] = f"{capacity};w={period}"
+        response.headers['X-RateLimit-Remaining'] = str(remaining)
+        return response
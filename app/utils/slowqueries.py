@@ -0,0 +1,160 @@
+"""
+Registro de consultas lentas.
+
+SQLStats ya mide cada sentencia; las que superan SLOW_QUERY_THRESHOLD_MS se
+guardan aquí con sus parámetros (redactados), la ruta que las ejecutó y,
+opcionalmente, el plan de ejecución (EXPLAIN) para verlas en /admin/slow-queries.
+
+Se guarda en un archivo SQLite local (no en la BD de la app, para no sumar
+escrituras a la base que se está midiendo) con un tope de filas: al pasarlo se
+borran las más antiguas. Durante una petición los registros se acumulan en `g`
+y se escriben al terminarla, fuera de la transacción de la vista; el EXPLAIN se
+ejecuta en otra conexión por la misma razón.
+"""
+
+import datetime
+import decimal
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+SENSITIVE = re.compile(r'pass|hash|token|secret|email|phone|document', re.IGNORECASE)
+ISO_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}([ T][\d:.]+)?$')
+
+
+def _redact_value(value, key=None):
+    if key is not None and SENSITIVE.search(str(key)):
+        return '***'
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (datetime.date, datetime.datetime, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, str) and ISO_DATE.match(value):
+        return value
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f'<bytes:{len(value)}>'
+    # Textos libres (nombres, correos, notas): solo el largo
+    return f'<str:{len(value)}>' if isinstance(value, str) else f'<{type(value).__name__}>'
+
+
+def redact(parameters):
+    """Parámetros aptos para guardar: números y fechas tal cual, textos ocultos."""
+    if isinstance(parameters, dict):
+        return {key: _redact_value(value, key) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact_value(value) for value in parameters]
+    return _redact_value(parameters)
+
+
+def normalize(statement):
+    return ' '.join(statement.split())
+
+
+class SlowQueryLog:
+
+    def __init__(self, path, max_rows=5000):
+        self.path = path
+        self.max_rows = max_rows
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn().executescript("""
+            CREATE TABLE IF NOT EXISTS slow_queries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created REAL NOT NULL,
+                statement TEXT NOT NULL,
+                parameters TEXT,
+                duration_ms REAL NOT NULL,
+                route TEXT,
+                plan TEXT
+            );
+            CREATE INDEX IF NOT EXISTS ix_slow_queries_statement ON slow_queries (statement);
+        """)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def after_fork(self):
+        self._local = threading.local()
+
+    def write(self, records):
+        if not records:
+            return
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO slow_queries (created, statement, parameters, duration_ms, route, plan) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(time.time(), normalize(r['statement']), json.dumps(r['parameters'], ensure_ascii=False),
+                  round(r['duration'] * 1000, 2), r['route'], r.get('plan')) for r in records]
+            )
+            # Rotación: conservar solo las max_rows más recientes
+            conn.execute(
+                "DELETE FROM slow_queries WHERE id <= (SELECT MAX(id) FROM slow_queries) - ?",
+                (self.max_rows,)
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def top(self, limit=50):
+        """Sentencias agrupadas, ordenadas por tiempo total."""
+        rows = self._conn().execute("""
+            SELECT statement, COUNT(*), SUM(duration_ms), AVG(duration_ms), MAX(duration_ms), MAX(created)
+            FROM slow_queries
+            GROUP BY statement
+            ORDER BY SUM(duration_ms) DESC
+            LIMIT ?
+        """, (limit,)).fetchall()
+        result = []
+        for statement, calls, total, avg, worst, last_seen in rows:
+            # La muestra más lenta de cada sentencia: ruta, parámetros y plan
+            route, parameters, plan = self._conn().execute(
+                "SELECT route, parameters, plan FROM slow_queries WHERE statement = ? "
+                "ORDER BY duration_ms DESC LIMIT 1", (statement,)
+            ).fetchone()
+            result.append({
+                'statement': statement,
+                'calls': calls,
+                'total_ms': total,
+                'avg_ms': avg,
+                'max_ms': worst,
+                'last_seen': datetime.datetime.fromtimestamp(last_seen),
+                'route': route,
+                'parameters': parameters,
+                'plan': plan,
+            })
+        return result
+
+    def clear(self):
+        self._conn().execute("DELETE FROM slow_queries")
+
+
+def explain(engine, statement, parameters):
+    """Plan de ejecución en una conexión aparte; None si no aplica o falla."""
+    if not statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+        return None
+    prefix = 'EXPLAIN QUERY PLAN ' if engine.dialect.name == 'sqlite' else 'EXPLAIN '
+    try:
+        with engine.connect().execution_options(sql_stats_ignore=True) as connection:
+            rows = connection.exec_driver_sql(prefix + statement, parameters or ()).all()
+    except Exception:
+        return None
+    if engine.dialect.name == 'sqlite':
+        # (id, parent, notused, detail)
+        return '\n'.join(str(row[-1]) for row in rows)
+    return '\n'.join(str(row[0]) for row in rows)
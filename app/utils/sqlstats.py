@@ -0,0 +1,170 @@
+"""
+Instrumentación SQL por petición.
+
+Cuenta las sentencias y el tiempo en BD de cada petición y detecta patrones
+repetidos (la misma sentencia ejecutada muchas veces seguidas suele ser un
+N+1: una consulta por fila dentro de un bucle, p. ej. `res.guest` en una lista).
+
+- En modo debug (o con SQL_STATS_HEADERS) los totales van en cabeceras
+  X-SQL-Queries / X-SQL-Time-ms / X-SQL-Max-Repeat.
+- En producción se escribe una línea JSON en el logger "app.sql" cuando la
+  petición supera SQL_STATS_QUERY_THRESHOLD consultas o alguna sentencia se
+  repite SQL_NPLUSONE_THRESHOLD veces o más, con las sentencias más repetidas.
+- Con SLOW_QUERY_ENABLED las sentencias que tardan SLOW_QUERY_THRESHOLD_MS o
+  más van al registro de consultas lentas (ver slowqueries.py).
+"""
+
+import json
+import logging
+import time
+from collections import Counter
+
+from flask import g, request, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.slowqueries import SlowQueryLog, explain, redact
+
+logger = logging.getLogger('app.sql')
+
+
+class SQLStats:
+
+    def __init__(self, app=None):
+        self.headers = False
+        self.query_threshold = 30
+        self.nplusone_threshold = 5
+        self.log_all = False
+        self.slow_log = None
+        self.slow_threshold = None
+        self.slow_explain = False
+        self._listening = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config.get('SQL_STATS_ENABLED', True):
+            return
+        self.headers = app.config.get('SQL_STATS_HEADERS') or app.debug
+        self.query_threshold = app.config.get('SQL_STATS_QUERY_THRESHOLD', 30)
+        self.nplusone_threshold = app.config.get('SQL_NPLUSONE_THRESHOLD', 5)
+        self.log_all = app.config.get('SQL_STATS_LOG_ALL', False)
+        if app.config.get('SLOW_QUERY_ENABLED', True):
+            self.slow_log = SlowQueryLog(app.config['SLOW_QUERY_PATH'], app.config.get('SLOW_QUERY_MAX_ROWS', 5000))
+            self.slow_threshold = app.config.get('SLOW_QUERY_THRESHOLD_MS', 200) / 1000
+            self.slow_explain = app.config.get('SLOW_QUERY_EXPLAIN', False)
+        if not self._listening:
+            event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+            event.listen(Engine, 'handle_error', self._handle_error)
+            self._listening = True
+        app.after_request(self.after_request)
+        app.extensions['sql_stats'] = self
+
+    def after_fork(self):
+        if self.slow_log is not None:
+            self.slow_log.after_fork()
+
+    # -------------------------
+    # Eventos de SQLAlchemy
+    # -------------------------
+    @staticmethod
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('sql_stats_start', []).append(time.perf_counter())
+
+    @staticmethod
+    def _handle_error(exception_context):
+        # Una sentencia que falla no llega a after_cursor_execute: sin esto su
+        # inicio queda en la pila y la conexión (del pool) mide mal las siguientes
+        conn = exception_context.connection
+        starts = conn.info.get('sql_stats_start') if conn is not None else None
+        if starts:
+            starts.pop()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['sql_stats_start'].pop()
+        if context is not None and context.execution_options.get('sql_stats_ignore'):
+            return
+        in_request = has_request_context()
+        if self.slow_threshold is not None and elapsed >= self.slow_threshold:
+            self._slow_query(conn, statement, parameters, executemany, elapsed, in_request)
+        if not in_request:
+            return
+        stats = g.get('sql_stats')
+        if stats is None:
+            stats = g.sql_stats = {'count': 0, 'time': 0.0, 'statements': Counter(), 'times': Counter()}
+        stats['count'] += 1
+        stats['time'] += elapsed
+        stats['statements'][statement] += 1
+        stats['times'][statement] += elapsed
+
+    def _slow_query(self, conn, statement, parameters, executemany, elapsed, in_request):
+        record = {
+            'statement': statement,
+            # executemany: solo la primera fila como muestra
+            'parameters': redact(parameters[0] if executemany and parameters else parameters),
+            'raw_parameters': None if executemany else parameters,
+            'duration': elapsed,
+            'route': f"{request.method} {request.endpoint or request.path}" if in_request else None,
+            'engine': conn.engine,
+        }
+        if in_request:
+            g.setdefault('slow_queries', []).append(record)
+        else:
+            self._write_slow([record])
+
+    def _write_slow(self, records):
+        try:
+            for record in records:
+                if self.slow_explain and record['raw_parameters'] is not None:
+                    record['plan'] = explain(record['engine'], record['statement'], record['raw_parameters'])
+            self.slow_log.write(records)
+        except Exception:
+            # El registro es diagnóstico: nunca debe tumbar la petición
+            logger.exception("No se pudo guardar el registro de consultas lentas")
+
+    # -------------------------
+    # Resumen por petición
+    # -------------------------
+    @staticmethod
+    def current():
+        """Estadísticas de la petición en curso (o None si no hubo consultas)."""
+        return g.get('sql_stats')
+
+    def after_request(self, response):
+        slow = g.pop('slow_queries', None)
+        if slow:
+            # Después de enviar la respuesta: el EXPLAIN no suma latencia
+            response.call_on_close(lambda: self._write_slow(slow))
+
+        stats = g.get('sql_stats')
+        if stats is None or request.endpoint == 'static':
+            return response
+
+        repeated = [(sql, n) for sql, n in stats['statements'].most_common(3) if n > 1]
+        max_repeat = repeated[0][1] if repeated else 1
+
+        if self.headers:
+            response.headers['X-SQL-Queries'] = str(stats['count'])
+            response.headers['X-SQL-Time-ms'] = f"{stats['time'] * 1000:.1f}"
+            response.headers['X-SQL-Max-Repeat'] = str(max_repeat)
+
+        suspicious = max_repeat >= self.nplusone_threshold
+        too_many = stats['count'] >= self.query_threshold
+        if suspicious or too_many or self.log_all:
+            record = {
+                'endpoint': request.endpoint,
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'queries': stats['count'],
+                'db_time_ms': round(stats['time'] * 1000, 1),
+                'nplusone_suspect': suspicious,
+                'top_repeated': [
+                    {'count': n, 'time_ms': round(stats['times'][sql] * 1000, 1), 'sql': ' '.join(sql.split())[:300]}
+                    for sql, n in repeated
+                ],
+            }
+            level = logging.WARNING if suspicious or too_many else logging.INFO
+            logger.log(level, json.dumps(record, ensure_ascii=False))
+        return response
@@ -0,0 +1,66 @@
+"""
+Medición del arranque en frío de la app.
+
+Cada medición corre en un proceso nuevo (sin módulos ya importados ni
+cachés en memoria): importa `app`, llama a create_app() y reporta el tiempo
+total y qué librerías quedaron cargadas. Con `importtime=True` se añade el
+desglose de `python -X importtime` por módulo.
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+# Librerías que no deben cargarse al arrancar un worker: reportes (solo al
+# exportar PDF/Excel), alembic (solo `flask db`) y numpy (primera cotización)
+LAZY_MODULES = ('reportlab', 'openpyxl', 'alembic', 'numpy')
+
+_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+from app import create_app
+create_app()
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({'ms': elapsed, 'loaded': [m for m in %r if m in sys.modules]}))
+""" % (LAZY_MODULES,)
+
+_IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def measure_cold_start(cwd, importtime=False, env=None):
+    """
+    Arranca create_app() en un proceso nuevo. Devuelve
+    {'ms': float, 'loaded': [...], 'imports': [(módulo, self_us, acumulado_us, nivel), ...]}.
+    """
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    command += ['-c', _SNIPPET]
+    # Medir como un worker web: sin la marca del CLI de flask (ver create_app)
+    child_env = {name: value for name, value in os.environ.items() if name != 'FLASK_RUN_FROM_CLI'}
+    result = subprocess.run(
+        command, cwd=cwd, env={**child_env, **(env or {})},
+        capture_output=True, text=True, check=False
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"create_app() falló en el proceso de medición:\n{result.stderr[-2000:]}")
+    data = json.loads(result.stdout.strip().splitlines()[-1])
+    data['imports'] = []
+    if importtime:
+        for line in result.stderr.splitlines():
+            match = _IMPORTTIME.match(line)
+            if match:
+                self_us, cumulative_us, indent, name = match.groups()
+                data['imports'].append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return data
+
+
+def by_package(imports):
+    """Tiempo propio sumado por paquete de primer nivel, de mayor a menor (µs)."""
+    totals = defaultdict(int)
+    for name, self_us, _, _ in imports:
+        totals[name.split('.', 1)[0]] += self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
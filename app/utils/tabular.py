@@ -0,0 +1,110 @@
+"""
+Lectura de archivos tabulares subidos por el personal (CSV o Excel).
+
+Devuelve las filas como listas de valores; cada importador decide qué
+columnas espera. openpyxl se importa solo al leer un Excel.
+"""
+
+import csv
+import io
+import math
+import os
+import re
+
+EXTENSIONS = ('.csv', '.xlsx', '.xlsm')
+
+NUMBER = re.compile(r'[+-]?\d+(?:[.,]\d+)?')
+AMBIGUOUS = re.compile(r'[+-]?\d+[.,]\d{3}')  # 180.000: ¿ciento ochenta o ciento ochenta mil?
+
+
+class TableError(ValueError):
+    """Archivo que no se puede leer como tabla."""
+
+
+def _read_csv(data):
+    try:
+        text = data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        text = data.decode('latin-1')   # CSV guardado desde Excel en Windows
+    try:
+        dialect = csv.Sniffer().sniff(text[:4096], delimiters=',;\t')
+    except csv.Error:
+        dialect = csv.excel
+    return list(csv.reader(io.StringIO(text, newline=''), dialect))
+
+
+def _read_xlsx(data):
+    from openpyxl import load_workbook
+    try:
+        workbook = load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    except Exception as exc:
+        raise TableError(f"No se pudo leer el archivo Excel: {exc}")
+    rows = [list(row) for row in workbook.active.iter_rows(values_only=True)]
+    workbook.close()
+    return rows
+
+
+def read_table(filename, data):
+    """Filas (listas de valores) de un .csv o .xlsx, incluido el encabezado."""
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension == '.csv':
+        table = _read_csv(data)
+    elif extension in ('.xlsx', '.xlsm'):
+        table = _read_xlsx(data)
+    else:
+        raise TableError("Formato no soportado: use un archivo .csv o .xlsx")
+    if not table:
+        raise TableError("El archivo está vacío")
+    return table
+
+
+def cell_text(value):
+    """Texto de una celda; los enteros que Excel guarda como 101.0 vuelven a ser '101'."""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return '' if value is None else str(value).strip()
+
+
+def cell_number(value, cast):
+    """
+    Número finito de una celda con `cast` (int o float). El texto acepta coma
+    o punto decimal, sin separador de miles: '180.000' o '180,000' podrían ser
+    cualquiera de los dos y se rechazan. ValueError dice qué tiene la celda.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        text = value  # celda numérica de Excel
+    else:
+        text = cell_text(value).replace(' ', '')
+        if not NUMBER.fullmatch(text):
+            raise ValueError("no es un número")
+        if AMBIGUOUS.fullmatch(text):
+            raise ValueError("es ambiguo (¿separador de miles o decimal?); escríbalo sin separador de miles")
+        text = text.replace(',', '.')
+    try:
+        number = float(text)
+    except OverflowError:
+        number = math.inf
+    if not math.isfinite(number):
+        raise ValueError("no es un número finito")
+    if cast is int:
+        if not number.is_integer():
+            raise ValueError("no es un número entero")
+        return int(number)
+    return number
+
+
+def to_records(table, aliases):
+    """
+    Convierte las filas en diccionarios usando el encabezado: `aliases` lleva
+    cada encabezado (en minúsculas) a su columna; los que no están se ignoran.
+    Cada fila lleva su número de línea en 'line' y se saltan las vacías.
+    """
+    header = [aliases.get(str(cell or '').strip().lower()) for cell in table[0]]
+    records = []
+    for line, values in enumerate(table[1:], start=2):
+        if all(value in (None, '') for value in values):
+            continue
+        record = {column: value for column, value in zip(header, values) if column}
+        record['line'] = line
+        records.append(record)
+    return records
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Búsquedas de disponibilidad concurrentes: API JSON contra el formulario.
+
+Compara /api/availability con el POST a main.reserve (PublicReservationForm,
+que además exige sesión y token CSRF) sobre un mismo gunicorn. Cada cliente
+busca fechas distintas para que la caché no lo resuelva todo.
+
+Uso:
+    python benchmarks/availability_api.py --duration 10 --concurrency 32
+"""
+
+import argparse
+import http.cookiejar
+import random
+import re
+import urllib.parse
+import urllib.request
+from datetime import date, timedelta
+
+from common import make_app, seed_small, gunicorn_server, hammer, report
+
+CSRF_RE = re.compile(r'name="csrf_token" type="hidden" value="([^"]+)"')
+
+
+def random_stay(rng, spread):
+    check_in = date.today() + timedelta(days=rng.randint(1, spread))
+    return check_in, check_in + timedelta(days=rng.randint(1, 5)), rng.randint(1, 2)
+
+
+def api_client(base_url, spread):
+    def make_client():
+        rng = random.Random()
+
+        def request_once():
+            check_in, check_out, guests = random_stay(rng, spread)
+            query = urllib.parse.urlencode({
+                'check_in': check_in.isoformat(), 'check_out': check_out.isoformat(), 'guests': guests
+            })
+            urllib.request.urlopen(f"{base_url}/api/availability?{query}", timeout=30).read()
+        return request_once
+    return make_client
+
+
+def form_client(base_url, spread):
+    def make_client():
+        rng = random.Random()
+        opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+
+        def csrf(path):
+            return CSRF_RE.search(opener.open(base_url + path, timeout=30).read().decode()).group(1)
+
+        opener.open(base_url + '/auth/login', data=urllib.parse.urlencode({
+            'csrf_token': csrf('/auth/login'), 'email': 'huesped0@hotel.com', 'password': 'secreto123'
+        }).encode(), timeout=30).read()
+        token = csrf('/reserve')
+
+        def request_once():
+            check_in, check_out, guests = random_stay(rng, spread)
+            opener.open(base_url + '/reserve', data=urllib.parse.urlencode({
+                'csrf_token': token, 'check_in_date': check_in.isoformat(),
+                'check_out_date': check_out.isoformat(), 'guests_count': guests,
+            }).encode(), timeout=30).read()
+        return request_once
+    return make_client
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--spread', type=int, default=30, help="días posibles de llegada")
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--port', type=int, default=8099)
+    args = parser.parse_args()
+
+    seed_small(make_app(), rooms=200, guests=50, reservations_per_guest=10)
+
+    with gunicorn_server(args.port, WEB_WORKER_CLASS='gthread',
+                         WEB_WORKERS=args.workers, WEB_THREADS=args.threads) as base_url:
+        print(f"concurrencia={args.concurrency} duración={args.duration}s")
+        for label, factory in (('formulario /reserve', form_client), ('api /api/availability', api_client)):
+            latencies, errors = hammer(factory(base_url, args.spread), args.duration, args.concurrency)
+            report(label, latencies, errors, args.duration)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Presupuesto de arranque en frío de create_app().
+
+Arranca la app varias veces, cada vez en un proceso nuevo, y falla (código 1)
+en dos casos:
+- la mediana supera --budget-ms;
+- se cargan al arrancar librerías que deben ser perezosas (reportlab,
+  openpyxl, alembic, numpy; ver app/utils/startup.py).
+Sirve como verificación en CI: una importación pesada nueva en el camino de
+arranque rompe el presupuesto. El desglose por módulo está en
+`flask startup-profile`.
+
+Uso:
+    python benchmarks/cold_start.py [--budget-ms 1500] [--runs 5]
+"""
+
+import argparse
+import statistics
+import sys
+
+from common import ROOT
+from app.utils.startup import measure_cold_start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--budget-ms', type=float, default=1500)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    runs = [measure_cold_start(ROOT) for _ in range(args.runs)]
+    timings = sorted(run['ms'] for run in runs)
+    median = statistics.median(timings)
+    loaded = sorted({module for run in runs for module in run['loaded']})
+
+    print(f"create_app() en frío: mediana {median:.0f} ms, mín {timings[0]:.0f} ms, máx {timings[-1]:.0f} ms "
+          f"(presupuesto {args.budget_ms:.0f} ms)")
+    failed = False
+    if median > args.budget_ms:
+        print(f"❌ Presupuesto excedido por {median - args.budget_ms:.0f} ms")
+        failed = True
+    if loaded:
+        print(f"❌ Importadas al arrancar: {', '.join(loaded)}")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("✅ Dentro del presupuesto")
+
+
+if __name__ == '__main__':
+    main()
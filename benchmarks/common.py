@@ -0,0 +1,205 @@
+"""
+Utilidades compartidas por los scripts de benchmarks/.
+
+Los scripts crean la app contra SQLite (o la BD indicada en DATABASE_URL),
+cargan unos pocos datos y cuentan las consultas SQL por petición.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Valores por defecto para que Settings cargue sin un .env de producción
+for _name, _value in {
+    'DATABASE_HOST': 'localhost', 'DATABASE_PORT': '5432', 'DATABASE_USER': 'bench',
+    'DATABASE_PASSWORD': 'bench', 'DATABASE_NAME': 'bench', 'SECRET_KEY': 'bench',
+}.items():
+    os.environ.setdefault(_name, _value)
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.gettempdir(), 'hotel_bench.db'))
+# Caché, eventos y límites compartidos (sqlite) nuevos en cada corrida: los de
+# una corrida anterior traerían versiones y baldes de otra BD. Gunicorn hereda
+# estas rutas, así que el script y sus workers usan los mismos archivos.
+_shared_dir = tempfile.mkdtemp(prefix='hotel-bench-')
+for _name, _file in {'PAGE_CACHE_PATH': 'page_cache.sqlite3', 'EVENTS_PATH': 'events.sqlite3',
+                     'RATE_LIMIT_PATH': 'ratelimit.sqlite3'}.items():
+    os.environ.setdefault(_name, os.path.join(_shared_dir, _file))
+
+
+def make_app(reset=True):
+    """Crea la app con CSRF desactivado y, con `reset`, las tablas vacías."""
+    from app import create_app, db
+    app = create_app()
+    app.config['WTF_CSRF_ENABLED'] = False
+    if reset:
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+    return app
+
+
+def seed_small(app, rooms=20, guests=5, reservations_per_guest=4):
+    """Datos mínimos: admin, recepcionista, huéspedes, habitaciones y reservas."""
+    from datetime import date, timedelta
+    from app import db
+    from app.models.user import User
+    from app.models.room import Room
+    from app.models.reservation import Reservation
+
+    with app.app_context():
+        users = [
+            User(username='admin', email='admin@hotel.com', role='administrador'),
+            User(username='recepcion', email='recepcion@hotel.com', role='recepcionista'),
+        ] + [
+            User(username=f'huesped{i}', email=f'huesped{i}@hotel.com', role='huesped')
+            for i in range(guests)
+        ]
+        for user in users:
+            user.set_password('secreto123')
+        db.session.add_all(users)
+
+        room_list = [
+            Room(number=str(100 + i), type='doble', price=250000.0, status='disponible',
+                 description='Habitación de prueba', max_occupancy=2)
+            for i in range(rooms)
+        ]
+        db.session.add_all(room_list)
+        db.session.flush()
+
+        today = date.today()
+        for guest in users[2:]:
+            for j in range(reservations_per_guest):
+                room = room_list[(guest.id + j) % rooms]
+                check_in = today + timedelta(days=7 * j)
+                db.session.add(Reservation(
+                    guest_id=guest.id, room_id=room.id,
+                    check_in_date=check_in, check_out_date=check_in + timedelta(days=2),
+                    total_price=room.price * 2, status='confirmada'
+                ))
+        db.session.commit()
+
+
+def seed_large(app, rooms=500, guests=20000, reservations=100000, seed=42):
+    """
+    Datos sintéticos a escala con el generador de `flask seed --scale`
+    (app/services/seeding.py), más admin@hotel.com. Todos los usuarios usan
+    'secreto123'.
+    """
+    from app import db
+    from app.models.user import User
+    from app.services.seeding import generate_hotel
+
+    with app.app_context():
+        admin = User(username='admin', email='admin@hotel.com', role='administrador')
+        admin.set_password('secreto123')
+        db.session.add(admin)
+        db.session.commit()
+        generate_hotel(rooms=rooms, guests=guests, staff=2, reservations=reservations, seed=seed,
+                       password='secreto123', echo=lambda message: None)
+
+
+def login(client, email, password='secreto123'):
+    return client.post('/auth/login', data={'email': email, 'password': password})
+
+
+@contextmanager
+def count_queries(app):
+    """Cuenta las sentencias SQL ejecutadas dentro del bloque."""
+    from sqlalchemy import event
+    from app import db
+
+    counter = {'count': 0}
+
+    def before_cursor_execute(*args):
+        counter['count'] += 1
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+# -------------------------
+# Servidor real y clientes concurrentes
+# -------------------------
+@contextmanager
+def gunicorn_server(port=8099, **settings):
+    """Levanta gunicorn con gunicorn.conf.py; `settings` sobreescribe variables de Settings."""
+    env = {**os.environ, 'APP_PORT': str(port), 'WEB_MAX_REQUESTS': '0'}
+    env.update({name: str(value) for name, value in settings.items()})
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'run:app',
+         '--access-logfile', '/dev/null'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        _wait_until_up(base_url + '/about')
+        yield base_url
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def _wait_until_up(url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.2)
+    raise RuntimeError(f"gunicorn no respondió en {url}")
+
+
+def hammer(make_client, duration, concurrency):
+    """
+    Ejecuta `concurrency` hilos durante `duration` segundos. `make_client()` se
+    llama una vez por hilo y devuelve una función que hace una petición.
+    Devuelve (latencias ordenadas, errores).
+    """
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def worker():
+        request_once = make_client()
+        local = []
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            try:
+                request_once()
+                local.append(time.perf_counter() - start)
+            except (urllib.error.URLError, ConnectionError, OSError):
+                with lock:
+                    errors[0] += 1
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies.sort()
+    return latencies, errors[0]
+
+
+def report(label, latencies, errors, duration):
+    rps = len(latencies) / duration
+    p50 = statistics.median(latencies) * 1000 if latencies else 0
+    p99 = latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000 if latencies else 0
+    print(f"{label:<22} {rps:9.1f} req/s   p50={p50:7.1f} ms   p99={p99:7.1f} ms   errores={errors}")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Verifica el GET condicional de las páginas de habitaciones y reservas.
+
+Para cada ruta hace una petición normal, repite con If-None-Match y comprueba
+que la respuesta sea 304 y cuántas consultas SQL costó (solo la carga del
+usuario de la sesión, nunca las listas). Luego cambia una habitación y
+comprueba que el ETag deja de coincidir.
+
+Uso:
+    python benchmarks/conditional_get.py
+"""
+
+import sys
+
+from common import make_app, seed_small, login, count_queries
+
+ROUTES = [
+    # (ruta, email del usuario o None para anónimo, consultas máximas en un 304)
+    ('/rooms', None, 0),
+    ('/guest/rooms', 'huesped0@hotel.com', 1),
+    ('/guest/reservations', 'huesped0@hotel.com', 1),
+    ('/receptionist/rooms', 'recepcion@hotel.com', 1),
+]
+
+
+def check_route(app, path, email, max_queries):
+    client = app.test_client()
+    if email:
+        login(client, email)
+        # El login deja un mensaje flash; la primera página lo consume
+        client.get(path)
+
+    first = client.get(path)
+    etag = first.headers.get('ETag')
+    assert first.status_code == 200, f"{path}: {first.status_code}"
+    assert etag, f"{path}: sin ETag"
+
+    with count_queries(app) as queries:
+        second = client.get(path, headers={'If-None-Match': etag})
+    ok = second.status_code == 304 and queries['count'] <= max_queries
+    print(f"{'OK ' if ok else 'ERR'} {path:<24} 304={second.status_code == 304} "
+          f"consultas={queries['count']} (máx {max_queries}) bytes={len(second.data)}")
+    return ok, client, etag
+
+
+def main():
+    app = make_app()
+    seed_small(app)
+
+    results = [check_route(app, *route) for route in ROUTES]
+    all_ok = all(ok for ok, _, _ in results)
+
+    # Un cambio en el catálogo debe invalidar los ETags
+    from app import db
+    from app.models.room import Room
+    with app.app_context():
+        Room.query.first().status = 'mantenimiento'
+        db.session.commit()
+
+    for (path, _, _), (_, client, etag) in zip(ROUTES, results):
+        after = client.get(path, headers={'If-None-Match': etag})
+        ok = after.status_code == 200
+        all_ok = all_ok and ok
+        print(f"{'OK ' if ok else 'ERR'} {path:<24} tras cambio de habitación -> {after.status_code}")
+
+    return 0 if all_ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Reservas de grupo en competencia: todo o nada y sin habitaciones dobles.
+
+Varios hilos reservan a la vez grupos de habitaciones elegidas al azar (en
+orden aleatorio, para forzar el caso de bloqueos cruzados) sobre fechas que
+se solapan. Al final se comprueba que:
+- ninguna habitación quedó con dos reservas activas que se crucen,
+- cada grupo creado tiene todas sus habitaciones y los que fallaron no
+  dejaron nada (ni el grupo ni reservas sueltas),
+- ningún intento terminó en otro error que el rechazo esperado
+  (GroupBookingError); un interbloqueo aparecería aquí.
+
+Corre contra SQLite por defecto o contra la BD de DATABASE_URL (PostgreSQL
+para probar los bloqueos por fila de verdad).
+
+Uso:
+    python benchmarks/group_booking_race.py [--threads 16] [--groups 400] [--rooms 30] [--size 4]
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from datetime import date, timedelta
+
+from common import make_app
+
+
+def seed(app, rooms):
+    from app import db
+    from app.models.room import Room
+    from app.models.user import User
+
+    with app.app_context():
+        organizer = User(username='grupo', email='grupo@hotel.com', role='huesped')
+        organizer.set_password('secreto123')
+        db.session.add(organizer)
+        db.session.add_all(
+            Room(number=str(100 + i), type='doble', price=250000.0, status='disponible', max_occupancy=2)
+            for i in range(rooms)
+        )
+        db.session.commit()
+        return organizer.id, [room.id for room in Room.query.order_by(Room.id)]
+
+
+def race(app, organizer_id, room_ids, groups, threads, size, seed_value):
+    from app.services.groups import GroupBookingError, book_group
+
+    rng = random.Random(seed_value)
+    today = date.today()
+    attempts = [
+        (rng.sample(room_ids, size), today + timedelta(days=rng.randint(1, 4)), rng.randint(1, 3))
+        for _ in range(groups)
+    ]
+    results = {'booked': [], 'rejected': 0, 'errors': []}
+    lock = threading.Lock()
+
+    def worker(chunk):
+        with app.app_context():
+            for index, (rooms, check_in, nights) in chunk:
+                try:
+                    group = book_group(f'Grupo {index}', organizer_id, rooms, check_in,
+                                       check_in + timedelta(days=nights))
+                except GroupBookingError:
+                    with lock:
+                        results['rejected'] += 1
+                except Exception as exc:   # interbloqueo, tiempo de espera agotado...
+                    from app import db
+                    db.session.rollback()
+                    with lock:
+                        results['errors'].append(f'{type(exc).__name__}: {exc}')
+                else:
+                    with lock:
+                        results['booked'].append((group.id, sorted(rooms)))
+
+    numbered = list(enumerate(attempts))
+    pool = [threading.Thread(target=worker, args=(numbered[n::threads],)) for n in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    results['elapsed'] = time.perf_counter() - start
+    return results
+
+
+def verify(app, results):
+    from sqlalchemy import func, select
+    from sqlalchemy.orm import aliased
+    from app import db
+    from app.models.group import ReservationGroup
+    from app.models.reservation import Reservation
+
+    problems = []
+    with app.app_context():
+        first, second = aliased(Reservation), aliased(Reservation)
+        overlaps = db.session.execute(
+            select(func.count()).select_from(first).join(second, (first.room_id == second.room_id) &
+                                                                  (first.id < second.id)).where(
+                first.status.in_(Reservation.ACTIVE_STATUSES), second.status.in_(Reservation.ACTIVE_STATUSES),
+                first.check_in_date < second.check_out_date, first.check_out_date > second.check_in_date
+            )
+        ).scalar()
+        if overlaps:
+            problems.append(f"{overlaps} pares de reservas se cruzan en la misma habitación")
+
+        stored = {
+            group_id: sorted(room_id for (room_id,) in db.session.execute(
+                select(Reservation.room_id).where(Reservation.group_id == group_id)))
+            for group_id in db.session.execute(select(ReservationGroup.id)).scalars()
+        }
+        expected = dict(results['booked'])
+        if stored != expected:
+            problems.append(f"grupos guardados ({len(stored)}) no coinciden con los reservados ({len(expected)})")
+        orphans = db.session.execute(
+            select(func.count(Reservation.id)).where(Reservation.group_id.is_(None))
+        ).scalar()
+        if orphans:
+            problems.append(f"{orphans} reservas sin grupo")
+    if results['errors']:
+        problems.append(f"{len(results['errors'])} intentos con errores inesperados, p. ej. {results['errors'][0]}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--groups', type=int, default=400)
+    parser.add_argument('--rooms', type=int, default=30)
+    parser.add_argument('--size', type=int, default=4, help="Habitaciones por grupo")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    app = make_app()
+    organizer_id, room_ids = seed(app, args.rooms)
+    results = race(app, organizer_id, room_ids, args.groups, args.threads, args.size, args.seed)
+    print(f"{args.groups} grupos de {args.size} habitaciones en {args.threads} hilos: "
+          f"{len(results['booked'])} reservados, {results['rejected']} rechazados, "
+          f"{len(results['errors'])} errores en {results['elapsed']:.2f} s")
+
+    problems = verify(app, results)
+    for problem in problems:
+        print(f"❌ {problem}")
+    if problems:
+        return 1
+    print("✅ Sin habitaciones dobles ni grupos a medias")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
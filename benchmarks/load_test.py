@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Prueba de carga local comparando configuraciones de workers de Gunicorn.
+
+Levanta gunicorn con gunicorn.conf.py para cada configuración, lanza
+clientes concurrentes contra las rutas indicadas durante unos segundos y
+reporta peticiones por segundo y latencias p50/p99.
+
+Uso:
+    python benchmarks/load_test.py --duration 10 --concurrency 32 --path / --path /rooms
+    python benchmarks/load_test.py --config sync:4:1 --config gthread:2:8
+"""
+
+import argparse
+import itertools
+import urllib.request
+
+from common import make_app, seed_small, gunicorn_server, hammer, report
+
+DEFAULT_CONFIGS = ['sync:2:1', 'sync:4:1', 'gthread:2:4', 'gthread:4:4']
+
+
+def run_config(spec, args):
+    worker_class, workers, threads = spec.split(':')
+    with gunicorn_server(args.port, WEB_WORKER_CLASS=worker_class,
+                         WEB_WORKERS=workers, WEB_THREADS=threads) as base_url:
+        def make_client():
+            urls = itertools.cycle([base_url + path for path in args.paths])
+            return lambda: urllib.request.urlopen(next(urls), timeout=30).read()
+
+        latencies, errors = hammer(make_client, args.duration, args.concurrency)
+    report(spec, latencies, errors, args.duration)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--config', action='append', dest='configs',
+                        help="clase:workers:hilos (se puede repetir)")
+    parser.add_argument('--path', action='append', dest='paths', help="ruta a pedir (se puede repetir)")
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--no-seed', action='store_true', help="usar la BD de DATABASE_URL tal como está")
+    args = parser.parse_args()
+    args.configs = args.configs or DEFAULT_CONFIGS
+    args.paths = args.paths or ['/', '/rooms', '/about']
+
+    if not args.no_seed:
+        seed_small(make_app())
+
+    print(f"concurrencia={args.concurrency} duración={args.duration}s")
+    for spec in args.configs:
+        run_config(spec, args)
+
+
+if __name__ == '__main__':
+    main()
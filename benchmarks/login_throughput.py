@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Logins concurrentes: rendimiento, latencia p99 y rechazos rápidos (503).
+
+Levanta gunicorn y lanza clientes que inician sesión en bucle contra
+auth.login. Se repite para cada tamaño de cola del pool de hash indicado,
+para ver cómo el tope protege la latencia a costa de rechazar el exceso.
+
+Uso:
+    python benchmarks/login_throughput.py --concurrency 32 --queue 4 --queue 16 --queue 64
+"""
+
+import argparse
+import http.cookiejar
+import re
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from common import make_app, seed_small, gunicorn_server, hammer, report
+
+CSRF_RE = re.compile(r'name="csrf_token" type="hidden" value="([^"]+)"')
+
+
+def login_client(base_url, guests, rejected):
+    counter = iter(range(10 ** 9))
+
+    def make_client():
+        opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+        page = opener.open(base_url + '/auth/login', timeout=30).read().decode()
+        token = CSRF_RE.search(page).group(1)
+        data = urllib.parse.urlencode({
+            'csrf_token': token, 'email': f'huesped{next(counter) % guests}@hotel.com', 'password': 'secreto123'
+        }).encode()
+
+        def request_once():
+            try:
+                opener.open(urllib.request.Request(base_url + '/auth/login', data=data), timeout=30).read()
+            except urllib.error.HTTPError as error:
+                if error.code != 503:
+                    raise
+                rejected[0] += 1
+            opener.open(base_url + '/auth/logout', timeout=30).read()
+        return request_once
+    return make_client
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--queue', type=int, action='append', dest='queues', help="PASSWORD_HASH_QUEUE a probar")
+    parser.add_argument('--hash-workers', type=int, default=2)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--port', type=int, default=8099)
+    args = parser.parse_args()
+
+    guests = 20
+    seed_small(make_app(), guests=guests, reservations_per_guest=0)
+
+    print(f"concurrencia={args.concurrency} duración={args.duration}s hilos de hash por worker={args.hash_workers}")
+    for queue_limit in args.queues or [2, 8, 64]:
+        rejected = [0]
+        with gunicorn_server(args.port, WEB_WORKER_CLASS='gthread', WEB_WORKERS=args.workers,
+                             WEB_THREADS=args.threads, PASSWORD_HASH_WORKERS=args.hash_workers,
+                             PASSWORD_HASH_QUEUE=queue_limit) as base_url:
+            latencies, errors = hammer(login_client(base_url, guests, rejected), args.duration, args.concurrency)
+        report(f"cola={queue_limit}", latencies, errors, args.duration)
+        print(f"{'':<22} rechazados (503)={rejected[0]}")
+
+
+if __name__ == '__main__':
+    main()
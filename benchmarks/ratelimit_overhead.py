@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Costo del limitador de peticiones.
+
+1. Microbenchmark de `hit()` para cada almacén (memoria y SQLite) con
+   muchas llaves distintas, en un hilo y en varios a la vez.
+2. Costo por petición: POST a auth.login con el limitador activo y sin él,
+   a través del cliente de pruebas de Flask. Cada caso corre en su propio
+   proceso: Settings se lee al importar la app y el limitador se instala en
+   create_app, así que cambiar el entorno o app.config después no tiene efecto.
+
+Uso:
+    python benchmarks/ratelimit_overhead.py [--calls 200000] [--keys 10000]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from common import make_app
+
+
+def bench_store(store, calls, keys, threads):
+    per_thread = calls // threads
+
+    def worker(offset):
+        for i in range(per_thread):
+            store.hit(f"auth.login|ip:10.0.{(offset + i) % keys}", 10, 60)
+
+    pool = [threading.Thread(target=worker, args=(n * 7919,)) for n in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return per_thread * threads / elapsed, elapsed / (per_thread * threads) * 1e6
+
+
+def bench_requests(requests_count, enabled):
+    """Corre el caso en un proceso nuevo con el entorno ya fijado y devuelve µs/petición."""
+    env = {**os.environ, 'RATE_LIMIT_ENABLED': 'true' if enabled else 'false',
+           # Límite alto para medir solo el costo, no los rechazos
+           'RATE_LIMITS': json.dumps({'auth': '1000000/minute'})}
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--requests', str(requests_count), '--case'],
+        env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return float(output.split()[-1])
+
+
+def run_case(requests_count):
+    from app import rate_limiter
+
+    app = make_app()
+    assert ('rate_limiter' in app.extensions) == app.config['RATE_LIMIT_ENABLED']
+    assert not app.config['RATE_LIMIT_ENABLED'] or rate_limiter.limit_for('auth.login') == (1000000, 60)
+    client = app.test_client()
+    start = time.perf_counter()
+    for _ in range(requests_count):
+        client.post('/auth/login', data={})
+    return (time.perf_counter() - start) / requests_count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--calls', type=int, default=200000)
+    parser.add_argument('--keys', type=int, default=10000)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--case', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(run_case(args.requests))
+        return
+
+    from app.utils.ratelimit import MemoryBucketStore, SQLiteBucketStore
+    sqlite_path = os.path.join(tempfile.mkdtemp(prefix='ratelimit_'), 'buckets.sqlite3')
+
+    for label, store, calls in (
+        ('memoria', MemoryBucketStore(), args.calls),
+        ('sqlite', SQLiteBucketStore(sqlite_path), args.calls // 20),
+    ):
+        for threads in (1, 8):
+            rate, per_call = bench_store(store, calls, args.keys, threads)
+            print(f"hit() {label:<8} hilos={threads}  {rate:12,.0f} llamadas/s  {per_call:7.2f} µs/llamada")
+
+    with_limiter = bench_requests(args.requests, True)
+    without_limiter = bench_requests(args.requests, False)
+    print(f"POST /auth/login sin limitador  {without_limiter:8.1f} µs/petición")
+    print(f"POST /auth/login con limitador  {with_limiter:8.1f} µs/petición  "
+          f"(+{with_limiter - without_limiter:.1f} µs)")
+
+
+if __name__ == '__main__':
+    main()
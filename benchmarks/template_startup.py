@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Arranque de un worker con la caché de bytecode de Jinja fría y caliente.
+
+Cada medición corre en un proceso nuevo (como un worker recién creado) y
+registra el tiempo de create_app, el de cargar todas las plantillas y la
+latencia de la primera petición a la página principal.
+
+Uso:
+    python benchmarks/template_startup.py [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+WORKER = r"""
+import json, sys, time
+sys.path.insert(0, %(here)r)
+import common
+t0 = time.perf_counter()
+from app import create_app
+app = create_app()
+t1 = time.perf_counter()
+env = app.jinja_env
+for name in env.list_templates():
+    if name.endswith('.html'):
+        env.get_template(name)
+t2 = time.perf_counter()
+# Worker nuevo: entorno de Jinja vacío, solo la caché en disco
+client = create_app().test_client()
+t3 = time.perf_counter()
+client.get('/about')
+t4 = time.perf_counter()
+print(json.dumps({'create_app': t1 - t0, 'templates': t2 - t1, 'first_request': t4 - t3}))
+"""
+
+
+def run_worker(env):
+    out = subprocess.run(
+        [sys.executable, '-c', WORKER % {'here': HERE}],
+        env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def summarize(label, samples):
+    print(f"{label:<28}" + "  ".join(
+        f"{key}={statistics.median(s[key] for s in samples) * 1000:7.1f} ms"
+        for key in ('create_app', 'templates', 'first_request')
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp(prefix='jinja_cache_')
+    base_env = {**os.environ, 'TEMPLATE_CACHE_DIR': cache_dir}
+    try:
+        no_cache = [run_worker({**base_env, 'TEMPLATE_BYTECODE_CACHE': 'false'}) for _ in range(args.runs)]
+
+        cold = []
+        for _ in range(args.runs):
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            cold.append(run_worker(base_env))
+
+        warm = [run_worker(base_env) for _ in range(args.runs)]
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    summarize("sin caché de bytecode", no_cache)
+    summarize("caché fría (primer worker)", cold)
+    summarize("caché caliente", warm)
+
+
+if __name__ == '__main__':
+    main()
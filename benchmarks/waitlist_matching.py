@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Lista de espera: costo de ofrecer una cancelación con listas de espera grandes.
+
+Llena el hotel (reservas seguidas en todas las habitaciones durante el
+horizonte) y carga una lista de espera grande con bulk_insert. Después
+cancela reservas al azar y mide offer_released() de punta a punta: vencer
+ofertas atrasadas, bloquear la habitación, calcular el hueco, buscar
+candidatas por ix_waitlist_match y crear las ofertas.
+
+Como referencia mide también la alternativa ingenua de recorrer toda la
+lista en espera del tipo de habitación y filtrar en Python, y muestra el
+plan de la consulta de candidatas (SQLite: EXPLAIN QUERY PLAN, PostgreSQL:
+EXPLAIN) para comprobar que usa el índice.
+
+Uso:
+    python benchmarks/waitlist_matching.py [--entries 200000] [--rooms 200] [--cancellations 200]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from common import make_app
+
+ROOM_TYPES = ('individual', 'doble', 'suite', 'familiar')
+
+
+def seed(app, rooms, guests, entries, horizon, seed_value):
+    from app import db
+    from app.models.reservation import Reservation
+    from app.models.room import Room
+    from app.models.user import User
+    from app.models.waitlist import WaitlistEntry
+    from app.services.seeding import bulk_insert
+
+    rng = random.Random(seed_value)
+    today = date.today()
+    with app.app_context():
+        bulk_insert(User, ({'username': f'espera{i}', 'email': f'espera{i}@hotel.com', 'role': 'huesped',
+                            'password_hash': '-', 'is_active': True} for i in range(guests)))
+        bulk_insert(Room, ({'number': str(1000 + i), 'type': ROOM_TYPES[i % len(ROOM_TYPES)], 'price': 250000.0,
+                            'status': 'disponible', 'max_occupancy': 4} for i in range(rooms)))
+        guest_ids = db.session.execute(db.select(User.id)).scalars().all()
+        room_ids = db.session.execute(db.select(Room.id)).scalars().all()
+
+        def reservations():
+            for room_id in room_ids:
+                day = today + timedelta(days=rng.randint(0, 2))
+                while day < today + timedelta(days=horizon):
+                    nights = rng.randint(1, 5)
+                    yield {'guest_id': rng.choice(guest_ids), 'room_id': room_id, 'check_in_date': day,
+                           'check_out_date': day + timedelta(days=nights), 'guests_count': 2,
+                           'total_price': 250000.0 * nights, 'status': 'confirmada'}
+                    day += timedelta(days=nights)
+
+        booked = bulk_insert(Reservation, reservations())
+        created = datetime.utcnow() - timedelta(days=30)
+
+        def waitlist():
+            for i in range(entries):
+                check_in = today + timedelta(days=rng.randint(0, horizon - 1))
+                yield {'guest_id': rng.choice(guest_ids), 'room_type': rng.choice(ROOM_TYPES),
+                       'check_in_date': check_in, 'check_out_date': check_in + timedelta(days=rng.randint(1, 5)),
+                       'guests_count': rng.randint(1, 4), 'status': WaitlistEntry.WAITING,
+                       'created_at': created + timedelta(seconds=i)}
+
+        waiting = bulk_insert(WaitlistEntry, waitlist())
+        db.session.commit()
+    return booked, waiting
+
+
+def naive_candidates(room, check_in, check_out, gap_start, gap_end):
+    """Toda la lista en espera del tipo, filtrada en Python (lo que evita el índice)."""
+    from app import db
+    from app.models.waitlist import WaitlistEntry
+
+    rows = db.session.execute(
+        db.select(WaitlistEntry.id, WaitlistEntry.check_in_date, WaitlistEntry.check_out_date,
+                  WaitlistEntry.guests_count, WaitlistEntry.created_at)
+        .where(WaitlistEntry.room_type == room.type, WaitlistEntry.status == WaitlistEntry.WAITING)
+    ).all()
+    fits = [r for r in rows
+            if gap_start <= r.check_in_date < check_out and r.check_out_date > check_in
+            and (gap_end is None or r.check_out_date <= gap_end) and r.guests_count <= (room.max_occupancy or 2)]
+    return sorted(fits, key=lambda r: (r.created_at, r.id))
+
+
+def explain(room):
+    from app import db
+    from app.services.waitlist import candidates_query
+
+    today = date.today()
+    statement = candidates_query(room, today + timedelta(days=10), today + timedelta(days=13),
+                                 today + timedelta(days=9), today + timedelta(days=15))
+    compiled = statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+    prefix = 'EXPLAIN QUERY PLAN' if db.engine.dialect.name == 'sqlite' else 'EXPLAIN'
+    return [' '.join(str(value) for value in row)
+            for row in db.session.execute(db.text(f'{prefix} {compiled}')).all()]
+
+
+def run(app, cancellations, seed_value):
+    from app import db
+    from app.models.reservation import Reservation
+    from app.services.waitlist import offer_released
+    from sqlalchemy import func, select
+
+    rng = random.Random(seed_value)
+    timings, naive, offered = [], [], 0
+    with app.app_context():
+        ids = db.session.execute(
+            select(Reservation.id).where(Reservation.status == 'confirmada',
+                                         Reservation.check_in_date >= date.today())
+        ).scalars().all()
+        for reservation_id in rng.sample(ids, min(cancellations, len(ids))):
+            reservation = db.session.get(Reservation, reservation_id)
+            room, check_in, check_out = reservation.room, reservation.check_in_date, reservation.check_out_date
+            reservation.status = 'cancelada'
+            db.session.commit()
+
+            # La referencia ingenua, con el mismo hueco que calcula el servicio
+            start = time.perf_counter()
+            active = (Reservation.room_id == room.id, Reservation.status.in_(Reservation.ACTIVE_STATUSES))
+            gap_start = db.session.execute(
+                select(func.max(Reservation.check_out_date)).where(*active, Reservation.check_in_date < check_in)
+            ).scalar() or date.today()
+            gap_end = db.session.execute(
+                select(func.min(Reservation.check_in_date)).where(*active, Reservation.check_in_date >= check_out)
+            ).scalar()
+            naive_candidates(room, check_in, check_out, max(gap_start, date.today()), gap_end)
+            naive.append(time.perf_counter() - start)
+            db.session.rollback()
+
+            start = time.perf_counter()
+            offered += len(offer_released(reservation))
+            timings.append(time.perf_counter() - start)
+    return timings, naive, offered
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[max(int(len(values) * fraction) - 1, 0)] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--entries', type=int, default=200000, help="Solicitudes en la lista de espera")
+    parser.add_argument('--rooms', type=int, default=200)
+    parser.add_argument('--guests', type=int, default=5000)
+    parser.add_argument('--horizon', type=int, default=180, help="Días reservados hacia adelante")
+    parser.add_argument('--cancellations', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    app = make_app()
+    start = time.perf_counter()
+    booked, waiting = seed(app, args.rooms, args.guests, args.entries, args.horizon, args.seed)
+    print(f"{booked} reservas y {waiting} solicitudes en espera cargadas en {time.perf_counter() - start:.1f} s")
+
+    with app.app_context():
+        from app.models.room import Room
+        print("Plan de la consulta de candidatas:")
+        for line in explain(Room.query.first()):
+            print(f"  {line}")
+
+    timings, naive, offered = run(app, args.cancellations, args.seed)
+    print(f"{len(timings)} cancelaciones, {offered} ofertas creadas")
+    print(f"  offer_released():         p50={statistics.median(timings) * 1000:7.2f} ms   "
+          f"p95={percentile(timings, 0.95):7.2f} ms")
+    print(f"  recorrido completo (ref): p50={statistics.median(naive) * 1000:7.2f} ms   "
+          f"p95={percentile(naive, 0.95):7.2f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -15,6 +15,127 @@ class Settings(BaseSettings):
     EMAIL_PASS: str | None = None
     DATABASE_URL: str | None = None
 
+    # Caché de páginas públicas ("sqlite" compartido entre procesos; "memory"
+    # solo sirve con un único proceso: ver WEB_WORKERS)
+    PAGE_CACHE_ENABLED: bool = True
+    PAGE_CACHE_BACKEND: str = "sqlite"
+    PAGE_CACHE_PATH: str | None = None
+    PAGE_CACHE_TTL: int = 300
+    PAGE_CACHE_MAX_ENTRIES: int = 256
+    PAGE_CACHE_MAX_VALUES: int = 1024       # datos calculados (búsquedas de disponibilidad, reportes)
+    PAGE_CACHE_STALE_TTL: int = 86400       # segundos que sqlite guarda una copia (respaldo si la BD falla)
+    PAGE_CACHE_SHARED_MAX_ENTRIES: int = 10000   # tope de filas en sqlite: se borran las que vencen antes
+
+    # Caché de bytecode de Jinja (plantillas compiladas compartidas entre workers)
+    TEMPLATE_BYTECODE_CACHE: bool = True
+    TEMPLATE_CACHE_DIR: str | None = None
+
+    # Compresión de respuestas (gzip; brotli si está instalado)
+    COMPRESS_ENABLED: bool = True
+    COMPRESS_MIN_SIZE: int = 500
+    COMPRESS_LEVEL: int = 6
+    COMPRESS_MIMETYPES: list[str] | None = None
+
+    # Gunicorn (ver gunicorn.conf.py)
+    WEB_WORKERS: int | None = None          # por defecto: 2 * CPUs + 1 (1 si algún backend es "memory")
+    WEB_WORKER_CLASS: str = "gthread"       # sync, gthread o gevent
+    WEB_THREADS: int = 4
+    WEB_WORKER_CONNECTIONS: int = 100       # solo gevent
+    WEB_PRELOAD: bool = True
+    WEB_MAX_REQUESTS: int = 1000
+    WEB_MAX_REQUESTS_JITTER: int = 100
+    WEB_TIMEOUT: int = 30
+    WEB_GRACEFUL_TIMEOUT: int = 30
+    WEB_KEEPALIVE: int = 5
+
+    # Eventos en vivo para recepción (SSE). Cada pantalla conectada ocupa un
+    # hilo del worker: con muchas pantallas usar WEB_WORKER_CLASS=gevent.
+    EVENTS_BACKEND: str = "sqlite"          # sqlite (compartido entre procesos) o memory (un solo proceso)
+    EVENTS_PATH: str | None = None
+    EVENTS_POLL_INTERVAL: float = 1.0
+    EVENTS_MAX_QUEUE: int = 100
+    EVENTS_HEARTBEAT: int = 15
+    EVENTS_STREAM_TIMEOUT: int = 300
+
+    # Hash de contraseñas (formato de werkzeug: "scrypt:N:r:p" o "pbkdf2:sha256:iteraciones")
+    PASSWORD_HASH_METHOD: str = "scrypt:32768:8:1"
+    PASSWORD_HASH_WORKERS: int | None = None   # por defecto: número de CPUs
+    PASSWORD_HASH_QUEUE: int | None = None     # por defecto: 4 por hilo
+    PASSWORD_HASH_TIMEOUT: float = 10
+
+    # Límite de peticiones (token bucket) por blueprint o endpoint: "N/second|minute|hour|day"
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "sqlite"      # sqlite (compartido entre procesos) o memory (un solo proceso)
+    RATE_LIMIT_PATH: str | None = None
+    RATE_LIMIT_METHODS: list[str] = ["POST"]
+    # Proxies de confianza delante de la app (nginx, balanceador): la IP del cliente
+    # es la que agregó el último de ellos en X-Forwarded-For. 0 = sin proxy.
+    TRUSTED_PROXY_HOPS: int = 0
+    RATE_LIMITS: dict[str, str] = {
+        "auth": "10/minute",
+        "guest.reserve": "20/minute",
+        "main.reserve": "30/minute",
+    }
+
+    # Instrumentación SQL por petición (cabeceras en debug, log JSON en producción)
+    SQL_STATS_ENABLED: bool = True
+    SQL_STATS_HEADERS: bool = False         # forzar cabeceras X-SQL-* fuera de debug
+    SQL_STATS_QUERY_THRESHOLD: int = 30     # registrar peticiones con más consultas
+    SQL_NPLUSONE_THRESHOLD: int = 5         # misma sentencia repetida -> posible N+1
+    SQL_STATS_LOG_ALL: bool = False
+
+    # Registro de consultas lentas (/admin/slow-queries)
+    SLOW_QUERY_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: int = 200
+    SLOW_QUERY_EXPLAIN: bool = False        # guardar el plan (EXPLAIN) de cada SELECT lento
+    SLOW_QUERY_PATH: str | None = None
+    SLOW_QUERY_MAX_ROWS: int = 5000         # rotación: se borran las más antiguas
+
+    # Perfilado de peticiones (/admin/profiler)
+    PROFILER_ENABLED: bool = True
+    PROFILER_MODE: str = "sample"           # sample (pilas colapsadas), cprofile o both
+    PROFILER_SAMPLE_RATE: float = 0.0       # fracción de peticiones perfiladas siempre
+    PROFILER_ENDPOINTS: list[str] = []      # limitar PROFILER_SAMPLE_RATE a estos endpoints
+    PROFILER_INTERVAL_MS: int = 5
+    PROFILER_DIR: str | None = None
+    PROFILER_MAX_FILES: int = 200
+
+    # Métricas Prometheus (/metrics)
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: str | None = None        # exigir "Authorization: Bearer <token>" al scraper
+    METRICS_PUBLIC: bool = False            # sin token: True abre /metrics a todos; False solo localhost o admin
+    METRICS_BUSINESS_TTL: int = 30          # segundos entre recálculos de habitaciones/reservas
+    METRICS_MULTIPROC_DIR: str | None = None  # directorio compartido por los workers de gunicorn
+
+    # Tarifas dinámicas: Room.price × temporada × día de la semana, con
+    # descuento por duración sobre el total (ver app/services/pricing.py)
+    PRICING_ENABLED: bool = True            # False: precio plano por noche
+    PRICING_WEEKDAY_FACTORS: dict[str, float] = {"vie": 1.15, "sab": 1.2}   # noche de lun..dom
+    PRICING_SEASONS: list[dict] = [         # MM-DD inclusivo; "types" limita a esos tipos de habitación
+        {"name": "Fin de año", "start": "12-15", "end": "01-15", "factor": 1.3},
+        {"name": "Vacaciones de mitad de año", "start": "06-15", "end": "07-31", "factor": 1.15},
+        {"name": "Temporada baja", "start": "02-01", "end": "03-15", "factor": 0.9},
+    ]
+    PRICING_LOS_DISCOUNTS: dict[int, float] = {7: 0.05, 14: 0.1}   # desde N noches
+    PRICING_DEMAND_FACTORS: dict[float, float] = {}   # ocupación prevista mínima -> factor, p. ej. {"0.85": 1.1}
+
+    # Pronóstico de ocupación (flask forecast, cada noche)
+    FORECAST_HORIZON: int = 90              # días hacia adelante
+    FORECAST_ALPHA: float = 0.1             # peso de cada fecha nueva en las curvas de reserva
+    FORECAST_HISTORY_DAYS: int = 365        # historia usada en la primera corrida
+
+    # Auditoría nocturna (flask night-audit, cada noche)
+    NIGHT_AUDIT_PENDING_DAYS: int = 7       # días sin confirmar antes de expirar una reserva pendiente
+
+    # Lista de espera: al liberarse una habitación se ofrece con una reserva retenida
+    WAITLIST_HOLD_HOURS: int = 24           # horas para aceptar la oferta antes de pasar al siguiente
+    WAITLIST_MAX_ENTRIES: int = 5           # solicitudes abiertas por huésped
+
+    def memory_backends(self):
+        """Backends configurados por proceso: lo que guardan no lo ven los demás workers ni los comandos flask."""
+        return [name for name in ('PAGE_CACHE_BACKEND', 'EVENTS_BACKEND', 'RATE_LIMIT_BACKEND')
+                if getattr(self, name) == 'memory']
+
     @property
     def constructed_database_url(self):
         if self.DATABASE_URL:
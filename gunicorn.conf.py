@@ -0,0 +1,108 @@
+"""
+Configuración de Gunicorn para producción, tomada de Settings (config.py).
+
+    gunicorn -c gunicorn.conf.py run:app
+
+Con WEB_PRELOAD la app se importa una sola vez en el proceso maestro y los
+workers comparten esos módulos (copy-on-write). Cada worker abre después sus
+propias conexiones: las del maestro se descartan en post_fork.
+
+Las métricas de Prometheus se escriben en PROMETHEUS_MULTIPROC_DIR (uno por
+worker) para que /metrics sume todos los procesos; se define aquí, antes de
+cargar la app, porque prometheus_client lo lee al importarse.
+"""
+
+import glob
+import multiprocessing
+import os
+import sys
+import tempfile
+
+from config import settings
+
+bind = f"0.0.0.0:{settings.APP_PORT or 8086}"
+
+# Un backend "memory" vive dentro de cada worker: con varios, la caché y los
+# ETags de uno no ven los cambios hechos en otro, las pantallas SSE pierden los
+# eventos de los demás y el límite de peticiones se multiplica por el número
+# de workers. Sin WEB_WORKERS explícito se usa un solo worker hasta que se
+# configuren los backends compartidos (sqlite, el valor por defecto).
+memory_backends = settings.memory_backends()
+if settings.WEB_WORKERS:
+    workers = settings.WEB_WORKERS
+elif memory_backends:
+    workers = 1
+else:
+    workers = multiprocessing.cpu_count() * 2 + 1
+# create_app lo lee para no responder 304 ni cachear con versiones por proceso
+settings.WEB_WORKERS = workers
+worker_class = settings.WEB_WORKER_CLASS
+threads = settings.WEB_THREADS if worker_class == "gthread" else 1
+worker_connections = settings.WEB_WORKER_CONNECTIONS
+
+preload_app = settings.WEB_PRELOAD
+
+# Reciclar workers de forma escalonada para contener fugas de memoria
+max_requests = settings.WEB_MAX_REQUESTS
+max_requests_jitter = settings.WEB_MAX_REQUESTS_JITTER
+
+timeout = settings.WEB_TIMEOUT
+graceful_timeout = settings.WEB_GRACEFUL_TIMEOUT
+keepalive = settings.WEB_KEEPALIVE
+
+accesslog = "-"
+errorlog = "-"
+
+if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+    # Solo en el primer arranque (no en un reload con HUP): los archivos de una
+    # ejecución anterior dejarían contadores inflados
+    metrics_dir = settings.METRICS_MULTIPROC_DIR or os.path.join(tempfile.gettempdir(), "hotel-metrics")
+    os.makedirs(metrics_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(metrics_dir, "*.db")):
+        os.remove(path)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = metrics_dir
+
+
+def on_starting(server):
+    if not memory_backends:
+        return
+    names = ", ".join(f"{name}=memory" for name in memory_backends)
+    if workers > 1:
+        server.log.warning(
+            "%s con %d workers: cada worker tiene su propia copia; cachés y ETags pueden quedar "
+            "desactualizados, SSE pierde eventos y el límite de peticiones se multiplica. "
+            "Use los backends sqlite.", names, workers
+        )
+    else:
+        server.log.warning("%s: se usa un solo worker; configure los backends sqlite para usar más.", names)
+
+
+def child_exit(server, worker):
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def post_fork(server, worker):
+    if worker_class == "gevent":
+        # psycopg2 bloquea el hilo; psycogreen lo vuelve cooperativo con gevent
+        try:
+            from psycogreen.gevent import patch_psycopg
+            patch_psycopg()
+        except ImportError:
+            server.log.warning("gevent sin psycogreen: las consultas bloquearán el worker")
+
+    if "run" not in sys.modules:
+        return
+    # La app se cargó en el maestro (preload): no compartir sockets ni archivos
+    from run import app
+    from app import db, page_cache, events, password_hasher, rate_limiter, sql_stats
+    with app.app_context():
+        db.engine.dispose(close=False)
+    page_cache.after_fork()
+    events.after_fork()
+    password_hasher.after_fork()
+    rate_limiter.after_fork()
+    sql_stats.after_fork()
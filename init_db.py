@@ -8,9 +8,10 @@ Script seguro para inicializar la base de datos y sincronizar Alembic.
 """
 
 from app import create_app, db
-from flask_migrate import stamp
+from flask_migrate import Migrate, stamp
 
 app = create_app()
+Migrate(app, db)
 
 with app.app_context():
     # 1️⃣ Crea todas las tablas que aún no existan
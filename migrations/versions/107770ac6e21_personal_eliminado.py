@@ -0,0 +1,44 @@
+"""personal eliminado
+
+Revision ID: 107770ac6e21
+Revises: b7ed074fec24
+Create Date: 2026-10-19 15:54:36.918909
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '107770ac6e21'
+down_revision = 'b7ed074fec24'
+branch_labels = None
+depends_on = None
+
+
+# Las llaves originales no tienen nombre: PostgreSQL las llama
+# <tabla>_<columna>_fkey y en SQLite (modo batch) se les da ese mismo nombre
+# al reflejar la tabla, así el mismo drop_constraint sirve en las dos bases.
+NAMING = {'fk': '%(table_name)s_%(column_0_name)s_fkey'}
+STAFF_COLUMNS = (
+    ('housekeeping_task', 'claimed_by_id'),
+    ('reservation', 'confirmed_by_id'),
+)
+
+
+def _replace_user_fk(table, column, ondelete=None):
+    name = f'{table}_{column}_fkey'
+    with op.batch_alter_table(table, schema=None, naming_convention=NAMING) as batch_op:
+        batch_op.drop_constraint(name, type_='foreignkey')
+        batch_op.create_foreign_key(name, 'user', [column], ['id'], ondelete=ondelete)
+
+
+def upgrade():
+    # Eliminar a alguien del personal deja sus tareas y confirmaciones sin autor
+    for table, column in STAFF_COLUMNS:
+        _replace_user_fk(table, column, ondelete='SET NULL')
+
+
+def downgrade():
+    for table, column in reversed(STAFF_COLUMNS):
+        _replace_user_fk(table, column)
@@ -0,0 +1,37 @@
+"""autor de grupo eliminado
+
+Revision ID: aa3743530e2b
+Revises: 107770ac6e21
+Create Date: 2026-10-19 16:03:45.389820
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'aa3743530e2b'
+down_revision = '107770ac6e21'
+branch_labels = None
+depends_on = None
+
+
+# Como en 107770ac6e21: la llave original no tiene nombre y se usa el que le
+# pone PostgreSQL, el mismo que recibe en SQLite al reflejar la tabla.
+NAMING = {'fk': '%(table_name)s_%(column_0_name)s_fkey'}
+NAME = 'reservation_group_created_by_id_fkey'
+
+
+def _replace_created_by_fk(ondelete=None):
+    with op.batch_alter_table('reservation_group', schema=None, naming_convention=NAMING) as batch_op:
+        batch_op.drop_constraint(NAME, type_='foreignkey')
+        batch_op.create_foreign_key(NAME, 'user', ['created_by_id'], ['id'], ondelete=ondelete)
+
+
+def upgrade():
+    # Eliminar a quien registró el grupo no debe fallar: el grupo queda sin autor
+    _replace_created_by_fk(ondelete='SET NULL')
+
+
+def downgrade():
+    _replace_created_by_fk()
@@ -1,3 +1,4 @@
+import time
 import click
 from app import create_app, db
 from app.models.user import User
@@ -6,7 +7,16 @@ from app.models.room import Room
 app = create_app()
 
 @app.cli.command("seed")
-def seed():
+@click.option("--scale", type=int, default=0,
+              help="Genera datos sintéticos: N x (100 habitaciones, 2000 huéspedes, 20000 reservas)")
+@click.option("--rooms", type=int, help="Sobrescribe el número de habitaciones de --scale")
+@click.option("--guests", type=int, help="Sobrescribe el número de huéspedes de --scale")
+@click.option("--reservations", type=int, help="Sobrescribe el número de reservas de --scale")
+@click.option("--random-seed", type=int, default=42, show_default=True, help="Semilla (mismo valor = mismos datos)")
+@click.option("--today", type=click.DateTime(formats=["%Y-%m-%d"]), help="Fecha de referencia (por defecto hoy)")
+@click.option("--password", default="secreto123", show_default=True, help="Contraseña de los usuarios generados")
+@click.option("--batch-size", type=int, default=10000, show_default=True)
+def seed(scale, rooms, guests, reservations, random_seed, today, password, batch_size):
     """Carga datos iniciales (admin y habitaciones de ejemplo)"""
     with app.app_context():
         # -------------------------------
@@ -25,6 +35,25 @@ def seed():
         else:
             click.echo("ℹ️ Usuario admin ya existe")
 
+        # -------------------------------
+        # Datos sintéticos a escala
+        # -------------------------------
+        if scale or rooms or guests or reservations:
+            from app.services.seeding import generate_hotel, scaled_counts
+            counts = scaled_counts(max(scale, 1))
+            counts.update({name: value for name, value in
+                           (('rooms', rooms), ('guests', guests), ('reservations', reservations)) if value})
+            db.session.commit()
+            click.echo(f"⏳ Generando datos (semilla {random_seed})...")
+            start = time.perf_counter()
+            try:
+                generate_hotel(**counts, seed=random_seed, today=today.date() if today else None,
+                               password=password, batch_size=batch_size, echo=click.echo)
+            except ValueError as e:
+                raise click.ClickException(str(e))
+            click.echo(f"🎉 Datos generados en {time.perf_counter() - start:.1f} s")
+            return
+
         # -------------------------------
         # Habitaciones de ejemplo
         # -------------------------------